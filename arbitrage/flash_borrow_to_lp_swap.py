@@ -34,7 +34,7 @@ The helper has a few useful methods:
         it will set an internal variable `recalculate` to `True`, 
         which will execute a call to the next function.
     - `_calculate_arbitrage()` = an internal function which will 
-        perform a SciPy optimization and determine the best possible 
+        perform a numeric optimization and determine the best possible 
         arbitrage at the current pool states.
     - `calculate_multipool_tokens_out_from_tokens_in()` = returns 
         the output of a multi-LP token swap through any pool path 
@@ -46,8 +46,8 @@ from fractions import Fraction
 from typing import List, Optional
 
 from brownie import Contract  # type: ignore
-from scipy import optimize  # type: ignore
 
+from alex_bot.arbitrage.optimizer import minimize_integer_scalar
 from alex_bot.token import Erc20Token
 from alex_bot.uniswap.v2.liquidity_pool import LiquidityPool
 
@@ -139,6 +139,7 @@ class FlashBorrowToLpSwap:
             self.repay_token = self.borrow_pool.token0
 
         self.best = {
+            "converged": True,
             "init": True,
             "strategy": "flash borrow swap",
             "borrow_amount": 0,
@@ -159,10 +160,13 @@ class FlashBorrowToLpSwap:
         silent: bool = False,
         print_reserves: bool = True,
         print_ratios: bool = True,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
     ) -> bool:
         """
         Checks each liquidity pool for updates by passing a call to .update_reserves(), which returns False if there are no updates.
         Will calculate arbitrage amounts only after checking all pools and finding an update, or on startup (via the 'init' dictionary key)
+        The optimization can be limited to a `deadline` (a `time.monotonic()` value) or a `time_budget` in seconds.
         """
         recalculate = False
 
@@ -189,34 +193,43 @@ class FlashBorrowToLpSwap:
                 recalculate = True
 
         if recalculate:
-            self._calculate_arbitrage()
+            self._calculate_arbitrage(
+                deadline=deadline,
+                time_budget=time_budget,
+            )
             return True
         else:
             return False
 
-    def _calculate_arbitrage(self):
-        # set up the boundaries for the Brent optimizer based on which token is being borrowed
+    def _calculate_arbitrage(
+        self,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
+    ):
+        # set up the boundaries for the optimizer based on which token is being borrowed.
+        # The pool can lend at most its reserves - 1
         if self.borrow_token.address == self.borrow_pool.token0.address:
-            bounds = (
-                1,
-                float(self.borrow_pool.reserves_token0),
-            )
-            bracket = (
-                0.01 * self.borrow_pool.reserves_token0,
-                0.05 * self.borrow_pool.reserves_token0,
-            )
+            bounds = (1, self.borrow_pool.reserves_token0 - 1)
         else:
-            bounds = (
-                1,
-                float(self.borrow_pool.reserves_token1),
-            )
-            bracket = (
-                0.01 * self.borrow_pool.reserves_token1,
-                0.05 * self.borrow_pool.reserves_token1,
+            bounds = (1, self.borrow_pool.reserves_token1 - 1)
+
+        if bounds[0] > bounds[1]:
+            # the pool holds at most 1 unit of the borrowed token, so it
+            # cannot lend any and there is nothing to optimize
+            self.best.update(
+                {
+                    "converged": True,
+                    "borrow_amount": 0,
+                    "borrow_pool_amounts": [],
+                    "repay_amount": 0,
+                    "profit_amount": 0,
+                    "swap_pool_amounts": [],
+                }
             )
+            return
 
-        opt = optimize.minimize_scalar(
-            lambda x: -float(
+        opt = minimize_integer_scalar(
+            lambda x: -(
                 self.calculate_multipool_tokens_out_from_tokens_in(
                     token_in=self.borrow_token,
                     token_in_quantity=x,
@@ -226,12 +239,14 @@ class FlashBorrowToLpSwap:
                     token_out_quantity=x,
                 )
             ),
-            method="bounded",
             bounds=bounds,
-            bracket=bracket,
+            # start the search from the previous optimum, if there is one
+            guess=self.best["borrow_amount"] or None,
+            deadline=deadline,
+            time_budget=time_budget,
         )
 
-        best_borrow = int(opt.x)
+        best_borrow = opt.x
 
         if self.borrow_token.address == self.borrow_pool.token0.address:
             borrow_amounts = [best_borrow, 0]
@@ -245,12 +260,13 @@ class FlashBorrowToLpSwap:
             token_in=self.repay_token,
             token_out_quantity=best_borrow,
         )
-        best_profit = -int(opt.fun)
+        best_profit = -opt.fun
 
         # only save opportunities with rational, positive values
         if best_borrow > 0 and best_profit > 0:
             self.best.update(
                 {
+                    "converged": opt.converged,
                     "borrow_amount": best_borrow,
                     "borrow_pool_amounts": borrow_amounts,
                     "repay_amount": best_repay,
@@ -264,6 +280,7 @@ class FlashBorrowToLpSwap:
         else:
             self.best.update(
                 {
+                    "converged": opt.converged,
                     "borrow_amount": 0,
                     "borrow_pool_amounts": [],
                     "repay_amount": 0,
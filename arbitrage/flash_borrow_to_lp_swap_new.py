@@ -2,8 +2,8 @@ from fractions import Fraction
 from typing import List, Optional, Tuple
 
 from brownie import Contract  # type: ignore
-from scipy.optimize import minimize_scalar  # type: ignore
 
+from alex_bot.arbitrage.optimizer import minimize_integer_scalar
 from alex_bot.uniswap.v2.liquidity_pool import LiquidityPool
 from alex_bot.token import Erc20Token
 
@@ -141,6 +141,7 @@ class FlashBorrowToLpSwapNew:
                 )
 
         self.best = {
+            "converged": True,
             "init": True,
             "strategy": "flash borrow swap",
             "borrow_amount": 0,
@@ -157,6 +158,7 @@ class FlashBorrowToLpSwapNew:
         }
 
         self.best_future = {
+            "converged": True,
             "strategy": "flash borrow swap",
             "borrow_amount": 0,
             "borrow_token": self.borrow_token,
@@ -219,6 +221,8 @@ class FlashBorrowToLpSwapNew:
         override_future: bool = False,
         override_future_borrow_pool_reserves_token0: int = 0,
         override_future_borrow_pool_reserves_token1: int = 0,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
     ):
         if override_future:
             if not (
@@ -249,33 +253,42 @@ class FlashBorrowToLpSwapNew:
             reserves_token0 = self.borrow_pool.reserves_token0
             reserves_token1 = self.borrow_pool.reserves_token1
 
-        # set up the boundaries for the Brent optimizer based on which token is being borrowed
+        # set up the boundaries for the optimizer based on which token is being borrowed.
+        # The pool can lend at most its reserves - 1
         if self.borrow_token.address == self.borrow_pool.token0.address:
-            bounds = (
-                1,
-                float(reserves_token0),
-            )
-            bracket = (
-                0.001 * reserves_token0,
-                0.01 * reserves_token0,
-            )
+            bounds = (1, reserves_token0 - 1)
         elif self.borrow_token.address == self.borrow_pool.token1.address:
-            bounds = (
-                1,
-                float(reserves_token1),
-            )
-            bracket = (
-                0.001 * reserves_token1,
-                0.01 * reserves_token1,
-            )
+            bounds = (1, reserves_token1 - 1)
         else:
             print("WTF? Could not identify borrow token")
             raise Exception
 
+        if bounds[0] > bounds[1]:
+            # the pool holds at most 1 unit of the borrowed token, so it
+            # cannot lend any and there is nothing to optimize
+            (self.best_future if override_future else self.best).update(
+                {
+                    "converged": True,
+                    "borrow_amount": 0,
+                    "borrow_pool_amounts": [],
+                    "repay_amount": 0,
+                    "profit_amount": 0,
+                    "swap_pool_amounts": [],
+                }
+            )
+            return
+
+        # start the search from the previous optimum, if there is one
+        last_borrow = (
+            self.best_future["borrow_amount"]
+            if override_future
+            else self.best["borrow_amount"]
+        )
+
         # TODO: extend calculate_multipool_tokens_out_from_tokens_in() to support overriding token reserves for an arbitrary pool,
         # currently only supports overriding the borrow pool reserves
-        opt = minimize_scalar(
-            lambda x: -float(
+        opt = minimize_integer_scalar(
+            lambda x: -(
                 self.calculate_multipool_tokens_out_from_tokens_in(
                     token_in=self.borrow_token,
                     token_in_quantity=x,
@@ -287,12 +300,13 @@ class FlashBorrowToLpSwapNew:
                     override_reserves_token1=override_future_borrow_pool_reserves_token1,
                 )
             ),
-            method="bounded",
             bounds=bounds,
-            bracket=bracket,
+            guess=last_borrow or None,
+            deadline=deadline,
+            time_budget=time_budget,
         )
 
-        best_borrow = int(opt.x)
+        best_borrow = opt.x
 
         if self.borrow_token.address == self.borrow_pool.token0.address:
             borrow_amounts = [best_borrow, 0]
@@ -308,12 +322,13 @@ class FlashBorrowToLpSwapNew:
             override_reserves_token0=override_future_borrow_pool_reserves_token0,
             override_reserves_token1=override_future_borrow_pool_reserves_token1,
         )
-        best_profit = -int(opt.fun)
+        best_profit = -opt.fun
 
         if override_future:
             if best_borrow > 0 and best_profit > 0:
                 self.best_future.update(
                     {
+                        "converged": opt.converged,
                         "borrow_amount": best_borrow,
                         "borrow_pool_amounts": borrow_amounts,
                         "repay_amount": best_repay,
@@ -327,6 +342,7 @@ class FlashBorrowToLpSwapNew:
             else:
                 self.best_future.update(
                     {
+                        "converged": opt.converged,
                         "borrow_amount": 0,
                         "borrow_pool_amounts": [],
                         "repay_amount": 0,
@@ -339,6 +355,7 @@ class FlashBorrowToLpSwapNew:
             if best_borrow > 0 and best_profit > 0:
                 self.best.update(
                     {
+                        "converged": opt.converged,
                         "borrow_amount": best_borrow,
                         "borrow_pool_amounts": borrow_amounts,
                         "repay_amount": best_repay,
@@ -352,6 +369,7 @@ class FlashBorrowToLpSwapNew:
             else:
                 self.best.update(
                     {
+                        "converged": opt.converged,
                         "borrow_amount": 0,
                         "borrow_pool_amounts": [],
                         "repay_amount": 0,
@@ -409,10 +427,13 @@ class FlashBorrowToLpSwapNew:
         override_future: bool = False,
         override_future_borrow_pool_reserves_token0: int = 0,
         override_future_borrow_pool_reserves_token1: int = 0,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
     ) -> bool:
         """
         Checks each liquidity pool for updates by passing a call to .update_reserves(), which returns False if there are no updates.
         Will calculate arbitrage amounts only after checking all pools and finding a reason to update, or on startup (via the 'init' dictionary key)
+        The optimization can be limited to a `deadline` (a `time.monotonic()` value) or a `time_budget` in seconds.
         """
         recalculate = False
 
@@ -478,6 +499,8 @@ class FlashBorrowToLpSwapNew:
                 override_future=override_future,
                 override_future_borrow_pool_reserves_token0=override_future_borrow_pool_reserves_token0,
                 override_future_borrow_pool_reserves_token1=override_future_borrow_pool_reserves_token1,
+                deadline=deadline,
+                time_budget=time_budget,
             )
             return True
         else:
@@ -14,8 +14,8 @@ from typing import List, Optional, Tuple
 
 from brownie import Contract  # type: ignore
 from brownie.convert.datatypes import Wei  # type: ignore
-from scipy import optimize  # type: ignore
 
+from alex_bot.arbitrage.optimizer import minimize_integer_scalar
 from alex_bot.token import Erc20Token
 from alex_bot.uniswap.v2.liquidity_pool import LiquidityPool
 
@@ -154,6 +154,7 @@ class FlashBorrowToLpSwapWithFuture:
                 )
 
         self.best = {
+            "converged": True,
             "init": True,
             "strategy": "flash borrow swap",
             "borrow_amount": 0,
@@ -170,6 +171,7 @@ class FlashBorrowToLpSwapWithFuture:
         }
 
         self.best_future = {
+            "converged": True,
             "strategy": "flash borrow swap",
             "borrow_amount": 0,
             "borrow_token": self.borrow_token,
@@ -184,8 +186,8 @@ class FlashBorrowToLpSwapWithFuture:
             "swap_pool_tokens": self.swap_pool_tokens,
         }
 
-        # bugfix: maintain a record of the reserve state for associated LPs, used to avoid arb recalculation
-        self.reserves: dict = {}
+        # bugfix: maintain a record of the state version for associated LPs, used to avoid arb recalculation
+        self.pool_state_versions: dict = {}
         if self._update_method != "external":
             self.update_reserves()
 
@@ -259,6 +261,8 @@ class FlashBorrowToLpSwapWithFuture:
         pool_overrides: Optional[
             List[Tuple[LiquidityPool, Tuple[int, int]]]
         ] = None,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
     ):
         if pool_overrides is None:
             pool_overrides = []
@@ -275,33 +279,41 @@ class FlashBorrowToLpSwapWithFuture:
                     borrow_pool_reserves_token1 = override[1][1]
                     break
 
-        # set up the boundaries for the Brent optimizer based on which token
-        # is being borrowed
+        # set up the boundaries for the optimizer based on which token
+        # is being borrowed. The pool can lend at most its reserves - 1
         if self.borrow_token.address == self.borrow_pool.token0.address:
-            bounds = (
-                0,
-                float(borrow_pool_reserves_token0),
-            )
-            bracket = (
-                0.001 * borrow_pool_reserves_token0,
-                0.01 * borrow_pool_reserves_token0,
-            )
+            bounds = (1, borrow_pool_reserves_token0 - 1)
         elif self.borrow_token.address == self.borrow_pool.token1.address:
-            bounds = (
-                0,
-                float(borrow_pool_reserves_token1),
-            )
-            bracket = (
-                0.001 * borrow_pool_reserves_token1,
-                0.01 * borrow_pool_reserves_token1,
-            )
+            bounds = (1, borrow_pool_reserves_token1 - 1)
         else:
             print("_calculate_arbitrage: WTF? Could not identify borrow token")
             raise Exception
 
+        if bounds[0] > bounds[1]:
+            # the pool holds at most 1 unit of the borrowed token, so it
+            # cannot lend any and there is nothing to optimize
+            (self.best_future if override_future else self.best).update(
+                {
+                    "converged": True,
+                    "borrow_amount": 0,
+                    "borrow_pool_amounts": [],
+                    "repay_amount": 0,
+                    "profit_amount": 0,
+                    "swap_pool_amounts": [],
+                }
+            )
+            return
+
+        # start the search from the previous optimum, if there is one
+        last_borrow = (
+            self.best_future["borrow_amount"]
+            if override_future
+            else self.best["borrow_amount"]
+        )
+
         try:
-            opt = optimize.minimize_scalar(
-                lambda x: -float(
+            opt = minimize_integer_scalar(
+                lambda x: -(
                     self.calculate_multipool_tokens_out_from_tokens_in(
                         token_in=self.borrow_token,
                         token_in_quantity=x,
@@ -314,21 +326,17 @@ class FlashBorrowToLpSwapWithFuture:
                         override_reserves_token1=borrow_pool_reserves_token1,
                     )
                 ),
-                method="bounded",
                 bounds=bounds,
-                bracket=bracket,
-                options={
-                    "xatol": 1.0,
-                    # "disp": 3,
-                },
+                guess=last_borrow or None,
+                deadline=deadline,
+                time_budget=time_budget,
             )
         except Exception as e:
             print(e)
             print(f"bounds: {bounds}")
-            print(f"bracket: {bracket}")
             raise
         else:
-            best_borrow = int(opt.x)
+            best_borrow = opt.x
 
         if self.borrow_token.address == self.borrow_pool.token0.address:
             borrow_amounts = [best_borrow, 0]
@@ -344,12 +352,13 @@ class FlashBorrowToLpSwapWithFuture:
             override_reserves_token0=borrow_pool_reserves_token0,
             override_reserves_token1=borrow_pool_reserves_token1,
         )
-        best_profit = -int(opt.fun)
+        best_profit = -opt.fun
 
         if override_future:
             if best_borrow > 0 and best_profit > 0:
                 self.best_future.update(
                     {
+                        "converged": opt.converged,
                         "borrow_amount": best_borrow,
                         "borrow_pool_amounts": borrow_amounts,
                         "repay_amount": best_repay,
@@ -364,6 +373,7 @@ class FlashBorrowToLpSwapWithFuture:
             else:
                 self.best_future.update(
                     {
+                        "converged": opt.converged,
                         "borrow_amount": 0,
                         "borrow_pool_amounts": [],
                         "repay_amount": 0,
@@ -376,6 +386,7 @@ class FlashBorrowToLpSwapWithFuture:
             if best_borrow > 0 and best_profit > 0:
                 self.best.update(
                     {
+                        "converged": opt.converged,
                         "borrow_amount": best_borrow,
                         "borrow_pool_amounts": borrow_amounts,
                         "repay_amount": best_repay,
@@ -389,6 +400,7 @@ class FlashBorrowToLpSwapWithFuture:
             else:
                 self.best.update(
                     {
+                        "converged": opt.converged,
                         "borrow_amount": 0,
                         "borrow_pool_amounts": [],
                         "repay_amount": 0,
@@ -491,10 +503,13 @@ class FlashBorrowToLpSwapWithFuture:
         pool_overrides: Optional[
             List[Tuple[LiquidityPool, Tuple[int, int]]]
         ] = None,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
     ) -> bool:
         """
         Updates reserve values for one or more liquidity pools by calling update_reserves(), which returns False if the reserves have not changed.
         Will calculate arbitrage amounts only after checking all pools and finding a reason to update, or on startup (via the 'init' dictionary key)
+        The optimization can be limited to a `deadline` (a `time.monotonic()` value) or a `time_budget` in seconds.
         """
 
         if pool_overrides is None:
@@ -575,17 +590,21 @@ class FlashBorrowToLpSwapWithFuture:
                 #     Wei,
                 # ), f"override for token1 must be int/Wei, is {type(override_reserves[1])}"
 
-        # update the reserves tracked in self.reserves and flag the arb for recalculation if they did not match
+        # update the versions tracked in self.pool_state_versions and flag the arb for recalculation if they did not match
         for pool in [self.borrow_pool] + self.swap_pools:
-            current_lp_reserves = (pool.reserves_token0, pool.reserves_token1)
-            if self.reserves.get(pool.address) != current_lp_reserves:
-                self.reserves[pool.address] = current_lp_reserves
+            if (
+                self.pool_state_versions.get(pool.address)
+                != pool.state_version
+            ):
+                self.pool_state_versions[pool.address] = pool.state_version
                 recalculate = True
 
         if recalculate:
             self._calculate_arbitrage(
                 override_future=override_future,
                 pool_overrides=pool_overrides,
+                deadline=deadline,
+                time_budget=time_budget,
             )
             return True
         else:
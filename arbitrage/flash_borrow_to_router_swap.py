@@ -1,9 +1,9 @@
 from fractions import Fraction
-from typing import List
+from typing import List, Optional
 
 from brownie import Contract  # type: ignore
-from scipy import optimize  # type: ignore
 
+from alex_bot.arbitrage.optimizer import minimize_integer_scalar
 from alex_bot.uniswap.v2.liquidity_pool import LiquidityPool
 from alex_bot.token import Erc20Token
 
@@ -99,6 +99,7 @@ class FlashBorrowToRouterSwap:
             self.repay_token = self.borrow_pool.token0
 
         self.best = {
+            "converged": True,
             "init": True,
             "borrow": 0,
             "borrow_token": self.borrow_token,
@@ -114,10 +115,13 @@ class FlashBorrowToRouterSwap:
         silent: bool = False,
         print_reserves: bool = True,
         print_ratios: bool = True,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
     ) -> bool:
         """
         Checks each liquidity pool for updates by passing a call to .update_reserves(), which returns False if there are no updates.
         Will calculate arbitrage amounts only after checking all pools and finding an update, or on startup (via the 'init' dictionary key)
+        The optimization can be limited to a `deadline` (a `time.monotonic()` value) or a `time_budget` in seconds.
         """
         recalculate = False
 
@@ -144,34 +148,41 @@ class FlashBorrowToRouterSwap:
                 recalculate = True
 
         if recalculate:
-            self._calculate_arbitrage()
+            self._calculate_arbitrage(
+                deadline=deadline,
+                time_budget=time_budget,
+            )
             return True
         else:
             return False
 
-    def _calculate_arbitrage(self):
-        # set up the boundaries for the Brent optimizer based on which token is being borrowed
+    def _calculate_arbitrage(
+        self,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
+    ):
+        # set up the boundaries for the optimizer based on which token is being borrowed.
+        # The pool can lend at most its reserves - 1
         if self.borrow_token.address == self.borrow_pool.token0.address:
-            bounds = (
-                1,
-                float(self.borrow_pool.reserves_token0),
-            )
-            bracket = (
-                0.01 * self.borrow_pool.reserves_token0,
-                0.05 * self.borrow_pool.reserves_token0,
-            )
+            bounds = (1, self.borrow_pool.reserves_token0 - 1)
         else:
-            bounds = (
-                1,
-                float(self.borrow_pool.reserves_token1),
-            )
-            bracket = (
-                0.01 * self.borrow_pool.reserves_token1,
-                0.05 * self.borrow_pool.reserves_token1,
+            bounds = (1, self.borrow_pool.reserves_token1 - 1)
+
+        if bounds[0] > bounds[1]:
+            # the pool holds at most 1 unit of the borrowed token, so it
+            # cannot lend any and there is nothing to optimize
+            self.best.update(
+                {
+                    "converged": True,
+                    "borrow": 0,
+                    "profit": 0,
+                    "swap_out": 0,
+                }
             )
+            return
 
-        opt = optimize.minimize_scalar(
-            lambda x: -float(
+        opt = minimize_integer_scalar(
+            lambda x: -(
                 self.calculate_multipool_tokens_out_from_tokens_in(
                     token_in=self.borrow_token,
                     token_in_quantity=x,
@@ -181,9 +192,11 @@ class FlashBorrowToRouterSwap:
                     token_out_quantity=x,
                 )
             ),
-            method="bounded",
             bounds=bounds,
-            bracket=bracket,
+            # start the search from the previous optimum, if there is one
+            guess=self.best["borrow"] or None,
+            deadline=deadline,
+            time_budget=time_budget,
         )
 
         best_borrow = opt.x
@@ -197,6 +210,7 @@ class FlashBorrowToRouterSwap:
         if best_borrow > 0 and best_profit > 0:
             self.best.update(
                 {
+                    "converged": opt.converged,
                     "borrow": best_borrow,
                     "profit": best_profit,
                     "swap_out": swap_out,
@@ -205,6 +219,7 @@ class FlashBorrowToRouterSwap:
         else:
             self.best.update(
                 {
+                    "converged": opt.converged,
                     "borrow": 0,
                     "profit": 0,
                     "swap_out": 0,
@@ -15,8 +15,8 @@ from typing import List, Optional, Tuple
 from warnings import warn
 
 from brownie.convert.datatypes import Wei  # type: ignore
-from scipy import optimize  # type: ignore
 
+from alex_bot.arbitrage.optimizer import minimize_integer_scalar
 from alex_bot.exceptions import ArbCalculationError, InvalidSwapPathError
 from alex_bot.token import Erc20Token
 from alex_bot.uniswap.v2.liquidity_pool import LiquidityPool
@@ -135,6 +135,7 @@ class LpSwapWithFuture:
             input_token = forward_token
 
         self.best = {
+            "converged": True,
             "init": True,
             "strategy": "cycle",
             "swap_amount": 0,
@@ -148,6 +149,7 @@ class LpSwapWithFuture:
         }
 
         self.best_future = {
+            "converged": True,
             "strategy": "cycle",
             "swap_amount": 0,
             "input_token": self.input_token,
@@ -167,8 +169,8 @@ class LpSwapWithFuture:
         # track the gas estimate to execute this arb
         self.gas_estimate = 0
 
-        # bugfix: maintain a record of the reserve state for associated LPs, used to avoid arb recalculation
-        self.reserves: dict = {}
+        # bugfix: maintain a record of the state version for associated LPs, used to avoid arb recalculation
+        self.pool_state_versions: dict = {}
         if self._update_method != "external":
             self.update_reserves()
 
@@ -241,34 +243,32 @@ class LpSwapWithFuture:
         pool_overrides: Optional[
             List[Tuple[LiquidityPool, Tuple[int, int]]]
         ] = None,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
     ):
         if pool_overrides is None:
             pool_overrides = []
 
-        # set up the boundaries for the Brent optimizer based on which token
-        # is being borrowed
-        bounds = (
-            1.0,
-            float(self.max_input),
-        )
-
-        if self.input_token.address == self.swap_pools[0].token0.address:
-            bracket = (
-                0.001 * self.swap_pools[0].reserves_token0,
-                0.01 * self.swap_pools[0].reserves_token0,
-            )
-        elif self.input_token.address == self.swap_pools[0].token1.address:
-            bracket = (
-                0.001 * self.swap_pools[0].reserves_token1,
-                0.01 * self.swap_pools[0].reserves_token1,
-            )
-        else:
+        if self.input_token.address not in (
+            self.swap_pools[0].token0.address,
+            self.swap_pools[0].token1.address,
+        ):
             print("_calculate_arbitrage: WTF? Could not identify input token")
             raise ArbCalculationError
 
+        # bound the amount to be swapped
+        bounds = (1, self.max_input)
+
+        # start the search from the previous optimum, if there is one
+        last_swap_amount = (
+            self.best_future["swap_amount"]
+            if override_future
+            else self.best["swap_amount"]
+        )
+
         try:
-            opt = optimize.minimize_scalar(
-                lambda x: -float(
+            opt = minimize_integer_scalar(
+                lambda x: -(
                     self.calculate_multipool_tokens_out_from_tokens_in(
                         token_in=self.input_token,
                         token_in_quantity=x,
@@ -276,28 +276,25 @@ class LpSwapWithFuture:
                     )
                     - x
                 ),
-                method="bounded",
                 bounds=bounds,
-                bracket=bracket,
-                options={
-                    "xatol": 1.0,
-                    # "disp": 3,
-                },
+                guess=last_swap_amount or None,
+                deadline=deadline,
+                time_budget=time_budget,
             )
         except Exception as e:
             print(e)
             print(f"bounds: {bounds}")
-            print(f"bracket: {bracket}")
             raise ArbCalculationError
         else:
-            swap_amount = int(opt.x)
-            best_profit = -int(opt.fun)
+            swap_amount = opt.x
+            best_profit = -opt.fun
 
         if override_future:
             self.clear_best_future()
             if swap_amount > 0 and best_profit > 0:
                 self.best_future.update(
                     {
+                        "converged": opt.converged,
                         "swap_amount": swap_amount,
                         "profit_amount": best_profit,
                         "swap_pool_amounts": self._build_multipool_amounts_out(
@@ -314,6 +311,7 @@ class LpSwapWithFuture:
             if swap_amount > 0 and best_profit > 0:
                 self.best.update(
                     {
+                        "converged": opt.converged,
                         "swap_amount": swap_amount,
                         "profit_amount": best_profit,
                         "swap_pool_amounts": self._build_multipool_amounts_out(
@@ -413,10 +411,13 @@ class LpSwapWithFuture:
         pool_overrides: Optional[
             List[Tuple[LiquidityPool, Tuple[int, int]]]
         ] = None,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
     ) -> bool:
         """
         Updates reserve values for one or more liquidity pools by calling update_reserves(), which returns False if the reserves have not changed.
         Will calculate arbitrage amounts only after checking all pools and finding a reason to update, or on startup (via the 'init' dictionary key)
+        The optimization can be limited to a `deadline` (a `time.monotonic()` value) or a `time_budget` in seconds.
         """
 
         if pool_overrides is None:
@@ -485,17 +486,21 @@ class LpSwapWithFuture:
                 #     Wei,
                 # ), f"override for token1 must be int/Wei, is {type(override_reserves[1])}"
 
-        # update the reserves tracked in self.reserves and flag the arb for recalculation if they did not match
+        # update the versions tracked in self.pool_state_versions and flag the arb for recalculation if they did not match
         for pool in self.swap_pools:
-            current_lp_reserves = (pool.reserves_token0, pool.reserves_token1)
-            if self.reserves.get(pool.address) != current_lp_reserves:
-                self.reserves[pool.address] = current_lp_reserves
+            if (
+                self.pool_state_versions.get(pool.address)
+                != pool.state_version
+            ):
+                self.pool_state_versions[pool.address] = pool.state_version
                 recalculate = True
 
         if recalculate:
             self._calculate_arbitrage(
                 override_future=override_future,
                 pool_overrides=pool_overrides,
+                deadline=deadline,
+                time_budget=time_budget,
             )
             return True
         else:
@@ -0,0 +1,194 @@
+from time import monotonic
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+# 2 - golden ratio, the fraction of an interval taken by a golden-section step
+_GOLDEN_STEP = 0.3819660112501051
+# growth factor for the bracket search around a warm start
+_GOLDEN_GROWTH = 1.618033988749895
+
+
+class IntegerOptimizeResult(NamedTuple):
+    """
+    The result of `minimize_integer_scalar`. `evaluations` counts the distinct
+    inputs sent to the objective. `converged` is False when the evaluation
+    budget or the time ran out first, in which case `x` is the best input found
+    so far.
+    """
+
+    x: int
+    fun: float
+    evaluations: int
+    converged: bool
+
+
+class _BudgetExhausted(Exception):
+    pass
+
+
+def minimize_integer_scalar(
+    fun: Callable[[int], float],
+    bounds: Tuple[int, int],
+    guess: Optional[int] = None,
+    max_evaluations: int = 100,
+    rtol: float = 1e-8,
+    deadline: Optional[float] = None,
+    time_budget: Optional[float] = None,
+) -> IntegerOptimizeResult:
+    """
+    Minimize a unimodal function of an integer input within `bounds` (inclusive),
+    using Brent's method (golden-section steps with parabolic interpolation)
+    on integer trial points.
+
+    Each input is evaluated at most once, and trial points are never closer
+    than 1 apart. If `guess` is provided (e.g. the previous optimum), the
+    search starts from a bracket grown around it instead of the full bounds.
+    The search stops when the minimum is located to within `rtol` of its value
+    or of the width of `bounds`, whichever is larger (or to the nearest
+    integer), or when `max_evaluations` is reached. The width term keeps a
+    minimum at or near a bound (e.g. an unprofitable input at 1) from needing a
+    search down to integer precision.
+
+    The search also stops at the `deadline` (a `time.monotonic()` value) or after
+    `time_budget` seconds, whichever comes first. The time is checked before each
+    evaluation after the first, so a single slow evaluation can overrun it.
+    """
+
+    lower, upper = int(bounds[0]), int(bounds[1])
+    if lower > upper:
+        raise ValueError(f"Invalid bounds: {bounds}")
+
+    if time_budget is not None:
+        budget_deadline = monotonic() + time_budget
+        if deadline is None or budget_deadline < deadline:
+            deadline = budget_deadline
+
+    width = upper - lower
+    values: Dict[int, float] = {}
+
+    def f(x: int) -> float:
+        try:
+            return values[x]
+        except KeyError:
+            pass
+        if len(values) >= max_evaluations or (
+            deadline is not None and values and monotonic() >= deadline
+        ):
+            raise _BudgetExhausted
+        value = values[x] = fun(x)
+        return value
+
+    def result(converged: bool) -> IntegerOptimizeResult:
+        x = min(values, key=values.__getitem__)
+        return IntegerOptimizeResult(
+            x=x,
+            fun=values[x],
+            evaluations=len(values),
+            converged=converged,
+        )
+
+    try:
+        if guess is not None and lower < guess < upper:
+            # grow a bracket (a, x, b) with f(x) <= f(a), f(b) from the guess
+            x = int(guess)
+            step = max(1, x // 20)
+            a, b = max(lower, x - step), min(upper, x + step)
+            if f(b) < f(x):
+                direction = 1
+            elif f(a) < f(x):
+                direction = -1
+            else:
+                direction = 0
+            while direction:
+                step = int(step * _GOLDEN_GROWTH) + 1
+                if direction == 1:
+                    a, x = x, b
+                    b = min(upper, x + step)
+                    if b == x or f(b) >= f(x):
+                        break
+                else:
+                    b, x = x, a
+                    a = max(lower, x - step)
+                    if a == x or f(a) >= f(x):
+                        break
+
+            if f(a) == f(x) or f(b) == f(x):
+                # a flat region around the guess gives no direction, so
+                # search the full bounds starting from the guess
+                a, b = lower, upper
+                w = v = x
+                e = 0.0
+            else:
+                # seed the interpolation with the bracket ends
+                w, v = (a, b) if f(a) <= f(b) else (b, a)
+                e = float(b - a)
+        else:
+            a, b = lower, upper
+            x = w = v = a + int(_GOLDEN_STEP * (b - a))
+            e = 0.0
+
+        fx, fw, fv = f(x), f(w), f(v)
+        d = 0.0
+
+        while True:
+            xm = (a + b) / 2
+            tol1 = rtol * max(abs(x), width) + 0.5
+            tol2 = 2 * tol1
+            if abs(x - xm) <= tol2 - (b - a) / 2:
+                break
+
+            golden = True
+            if abs(e) > tol1:
+                # fit a parabola through x, w and v
+                r = (x - w) * (fx - fv)
+                q = (x - v) * (fx - fw)
+                p = (x - v) * q - (x - w) * r
+                q = 2 * (q - r)
+                if q > 0:
+                    p = -p
+                q = abs(q)
+                r, e = e, d
+                if (
+                    q
+                    and abs(p) < abs(0.5 * q * r)
+                    and q * (a - x) < p < q * (b - x)
+                ):
+                    d = p / q
+                    u = x + d
+                    # stay away from the bracket ends
+                    if u - a < tol2 or b - u < tol2:
+                        d = tol1 if xm >= x else -tol1
+                    golden = False
+            if golden:
+                e = (a - x) if x >= xm else (b - x)
+                d = _GOLDEN_STEP * e
+
+            if abs(d) < tol1:
+                d = tol1 if d > 0 else -tol1
+            u = x + round(d)
+            if u == x:
+                u = x + (1 if d > 0 else -1)
+            u = min(max(u, a), b)
+            if u == x:
+                # the bracket has closed around x
+                break
+
+            fu = f(u)
+            if fu <= fx:
+                if u >= x:
+                    a = x
+                else:
+                    b = x
+                v, fv, w, fw, x, fx = w, fw, x, fx, u, fu
+            else:
+                if u < x:
+                    a = u
+                else:
+                    b = u
+                if fu <= fw or w == x:
+                    v, fv, w, fw = w, fw, u, fu
+                elif fu <= fv or v == x or v == w:
+                    v, fv = u, fu
+    except _BudgetExhausted:
+        return result(converged=False)
+
+    return result(converged=True)
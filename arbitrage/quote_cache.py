@@ -0,0 +1,128 @@
+from threading import Lock
+from typing import Dict, Optional, Tuple, Union
+
+from alex_bot.uniswap.v2.liquidity_pool import LiquidityPool
+from alex_bot.uniswap.v3.v3_liquidity_pool import V3LiquidityPool
+
+
+class PoolQuoteCache:
+    """
+    A cache of exact-input swap quotes, keyed by pool, swap direction and input
+    amount. Quotes for a pool are discarded when its `state_version` changes, so
+    arbitrage helpers that share a pool can reuse each other's quotes until the
+    next update. Quotes are also discarded when a different object is used for
+    the same pool address (e.g. a pool rebuilt from a tick cache), since its
+    `state_version` count starts again from zero.
+
+    Callers read the pool's `state_version` before calculating a quote and pass
+    it to `get_quote` and `set_quote`, so a quote calculated while the pool was
+    being updated is never stored as a result for the new state.
+
+    The state dictionary is held using the "Borg" singleton pattern, which
+    ensures that all instances of the class have access to the same state data
+    """
+
+    _state: dict = {}
+    # guards the shared state, since helpers quote from several threads
+    _lock = Lock()
+
+    # quotes held for a single pool state before the oldest are discarded
+    max_quotes_per_pool = 10_000
+
+    def __init__(self):
+        self.__dict__ = self._state
+        with self._lock:
+            if not self._state:
+                self._clear()
+
+    def clear(self) -> None:
+        """
+        Discard all quotes and reset the hit counters
+        """
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        # pool address -> (pool, state version, {(zeroForOne, amount_in): amount_out})
+        self._pools: Dict[
+            str,
+            Tuple[
+                Union[LiquidityPool, V3LiquidityPool],
+                int,
+                Dict[Tuple[bool, int], int],
+            ],
+        ] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _get_pool_quotes(
+        self,
+        pool: Union[LiquidityPool, V3LiquidityPool],
+        state_version: int,
+    ) -> Optional[Dict[Tuple[bool, int], int]]:
+        """
+        Return the quotes for the pool at `state_version`, replacing those held for
+        an earlier version or another pool object. Returns None if the version is
+        out of date. The caller must hold the lock.
+        """
+
+        if state_version != pool.state_version:
+            return None
+        try:
+            stored_pool, stored_version, quotes = self._pools[pool.address]
+        except KeyError:
+            pass
+        else:
+            # compare identity, since `__eq__` only compares addresses
+            if stored_pool is pool and stored_version == state_version:
+                return quotes
+        quotes = {}
+        self._pools[pool.address] = (pool, state_version, quotes)
+        return quotes
+
+    def get_quote(
+        self,
+        pool: Union[LiquidityPool, V3LiquidityPool],
+        zeroForOne: bool,
+        amount_in: int,
+        state_version: int,
+    ) -> Optional[int]:
+        """
+        Return the cached output for the swap at pool state `state_version`, or None
+        """
+        with self._lock:
+            quotes = self._get_pool_quotes(pool, state_version)
+            amount_out = (
+                None if quotes is None else quotes.get((zeroForOne, amount_in))
+            )
+            if amount_out is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return amount_out
+
+    def set_quote(
+        self,
+        pool: Union[LiquidityPool, V3LiquidityPool],
+        zeroForOne: bool,
+        amount_in: int,
+        amount_out: int,
+        state_version: int,
+    ) -> None:
+        """
+        Store the output for the swap, calculated at pool state `state_version`. The
+        quote is dropped if the pool has been updated since.
+        """
+        with self._lock:
+            quotes = self._get_pool_quotes(pool, state_version)
+            if quotes is None:
+                return
+            if len(quotes) >= self.max_quotes_per_pool:
+                # dictionaries keep insertion order, so drop the oldest quote
+                del quotes[next(iter(quotes))]
+            quotes[(zeroForOne, amount_in)] = amount_out
@@ -16,15 +16,17 @@ generic address/calldata payloads. New method called generate_payloads
 
 '''
 
+from math import isqrt
 from typing import List, Optional, Tuple, Union, Dict
 from warnings import warn
 
 from eth_abi import encode as abi_encode
 from eth_typing import ChecksumAddress
-from scipy import optimize  # type: ignore
 from web3 import Web3
 
 from alex_bot.arbitrage.base import Arbitrage
+from alex_bot.arbitrage.optimizer import minimize_integer_scalar
+from alex_bot.arbitrage.quote_cache import PoolQuoteCache
 from alex_bot.exceptions import (
     ArbitrageError,
     EVMRevertError,
@@ -112,9 +114,12 @@ class UniswapLpCycle(Arbitrage):
 
         self.name = " -> ".join([pool.name for pool in self.swap_pools])
 
-        self.pool_states = {pool.address: None for pool in self.swap_pools}
+        self.pool_state_versions: Dict[str, Optional[int]] = {
+            pool.address: None for pool in self.swap_pools
+        }
 
         self.best: dict = {
+            "converged": True,
             "input_token": self.input_token,
             "last_swap_amount": 0,
             "profit_amount": 0,
@@ -235,12 +240,12 @@ class UniswapLpCycle(Arbitrage):
 
         return pools_amounts_out
 
-    def _update_pool_states(self):
+    def _update_pool_state_versions(self):
         """
-        Internal method to update the `self.pool_states` state tracking dict
+        Internal method to record the current `state_version` of each pool
         """
-        self.pool_states = {
-            pool.address: pool.state for pool in self.swap_pools
+        self.pool_state_versions = {
+            pool.address: pool.state_version for pool in self.swap_pools
         }
 
     def auto_update(
@@ -285,7 +290,10 @@ class UniswapLpCycle(Arbitrage):
                 else:
                     print("could not determine Uniswap pool version!")
             elif pool._update_method == "external":
-                if pool.state != self.pool_states[pool.address]:
+                if (
+                    pool.state_version
+                    != self.pool_state_versions[pool.address]
+                ):
                     found_updates = True
                     break
             else:
@@ -295,7 +303,7 @@ class UniswapLpCycle(Arbitrage):
 
         if found_updates:
             # print(f"found updates: {self}")
-            self._update_pool_states()
+            self._update_pool_state_versions()
             self.clear_best()
 
         return found_updates
@@ -304,12 +312,132 @@ class UniswapLpCycle(Arbitrage):
         self.calculate_arbitrage()
         return self.id, self.best
 
+    def _calculate_v2_optimum(self, _overrides: dict) -> Tuple[int, int]:
+        """
+        Find the optimal input for a path of V2 pools without a numeric search.
+
+        Each constant-product swap maps the input to `a*x / (b + c*x)`, and a
+        chain of these maps composes to the same form, so the profit
+        `f(x) - x` has a single maximum at `x = (sqrt(a*b) - b) / c`. The
+        per-pool integer rounding is then corrected by walking the exact
+        output amounts around that point, taking the smallest input that
+        produces each one.
+        """
+
+        # (reserves_in, reserves_out, fee numerator, fee denominator) for
+        # each pool, where the fee numerator is the share kept by the swap
+        legs: List[Tuple[int, int, int, int]] = []
+        for i, pool in enumerate(self.swap_pools):
+            state = _overrides.get(pool.address)
+            if state is not None:
+                reserves_token0 = state["reserves_token0"]
+                reserves_token1 = state["reserves_token1"]
+            else:
+                reserves_token0 = pool.reserves_token0
+                reserves_token1 = pool.reserves_token1
+
+            if self.swap_vectors[i]["zeroForOne"]:
+                fee = pool.fee_token0
+                reserves_in, reserves_out = reserves_token0, reserves_token1
+            else:
+                fee = pool.fee_token1
+                reserves_in, reserves_out = reserves_token1, reserves_token0
+
+            legs.append(
+                (
+                    reserves_in,
+                    reserves_out,
+                    fee.denominator - fee.numerator,
+                    fee.denominator,
+                )
+            )
+
+        def amount_out(x: int) -> int:
+            for reserves_in, reserves_out, fee_kept, fee_total in legs:
+                amount_in_with_fee = x * fee_kept
+                x = (amount_in_with_fee * reserves_out) // (
+                    reserves_in * fee_total + amount_in_with_fee
+                )
+            return x
+
+        def amount_in(y: int) -> Optional[int]:
+            # the smallest input with amount_out(x) >= y, or None if the
+            # output cannot be reached
+            for reserves_in, reserves_out, fee_kept, fee_total in reversed(
+                legs
+            ):
+                if y >= reserves_out:
+                    return None
+                y = -(
+                    -(y * reserves_in * fee_total)
+                    // ((reserves_out - y) * fee_kept)
+                )
+            return y
+
+        # compose the swaps into a single transform a*x / (b + c*x)
+        a, b, c = 1, 1, 0
+        for reserves_in, reserves_out, fee_kept, fee_total in legs:
+            a, b, c = (
+                a * fee_kept * reserves_out,
+                b * reserves_in * fee_total,
+                c * reserves_in * fee_total + a * fee_kept,
+            )
+
+        if a <= b:
+            # the marginal rate at zero input is unprofitable, so every input
+            # loses money. Report the smallest trade
+            swap_amount = 1
+            return swap_amount, amount_out(swap_amount) - swap_amount
+
+        swap_amount = max(1, min((isqrt(a * b) - b) // c, self.max_input))
+        best_output = amount_out(swap_amount)
+        if best_output > 0:
+            # the same output may be available from a smaller input
+            swap_amount = amount_in(best_output)
+        best_profit = best_output - swap_amount
+
+        # the integer path output is a step function below the continuous
+        # transform, so the profit is uneven near the optimum. Walk the
+        # neighbouring output amounts in each direction, at their smallest
+        # inputs, until ten in a row fail to improve on the best
+        for step in (1, -1):
+            output = best_output
+            misses = 0
+            while misses < 10:
+                output += step
+                if output <= 0:
+                    break
+                x = amount_in(output)
+                if x is None or x > self.max_input:
+                    break
+                if output - x > best_profit or (
+                    output - x == best_profit and x < swap_amount
+                ):
+                    swap_amount = x
+                    best_output = output
+                    best_profit = output - x
+                    misses = 0
+                else:
+                    misses += 1
+
+        return swap_amount, best_profit
+
     def calculate_arbitrage(
         self,
         override_state: Optional[
             List[Tuple[Union[LiquidityPool, V3LiquidityPool], dict]]
         ] = None,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
     ) -> Tuple[bool, Tuple[int, int]]:
+        """
+        Find the most profitable input for the cycle and record it in `self.best`.
+
+        The search can be limited to a `deadline` (a `time.monotonic()` value) or
+        a `time_budget` in seconds. When time runs out the best input found so
+        far is used, and `self.best["converged"]` is set to False.
+        """
+
         # sort the override_state values into a dictionary for fast lookup
         # inside the calculation loop
         _overrides = {}
@@ -356,72 +484,102 @@ class UniswapLpCycle(Arbitrage):
                         f"V3 pool {pool.address} has no liquidity for a 1 -> 0 swap"
                     )
 
-        # bound the amount to be swapped
-        bounds: Tuple[float, float] = (
-            1.0,
-            float(self.max_input),
-        )
-
-        # bracket the initial guess for the algo
-        bracket_amount: int = (
-            self.best["last_swap_amount"]
-            if self.best["last_swap_amount"]
-            else self.max_input
-        )
-        bracket: Tuple[float, float, float] = (
-            0.90 * bracket_amount,
-            0.95 * bracket_amount,
-            bracket_amount,
-        )
+        if all(isinstance(pool, LiquidityPool) for pool in self.swap_pools):
+            # a path of V2 pools has a closed-form optimum
+            swap_amount, best_profit = self._calculate_v2_optimum(_overrides)
+            converged = True
+        else:
+            # V3 quotes at the current pool states are shared with other helpers
+            quote_cache = PoolQuoteCache()
+
+            # quote each V3 pool through a single reader view, so the state
+            # version passed to the cache always matches the state quoted
+            readers = [
+                (
+                    pool.get_reader()
+                    if isinstance(pool, V3LiquidityPool)
+                    else pool
+                )
+                for pool in self.swap_pools
+            ]
 
-        def arb_profit(x):
-            token_in_quantity = int(x)  # round the input down
+            def arb_profit(token_in_quantity: int) -> int:
+                token_out_quantity = token_in_quantity
+                for i, pool in enumerate(self.swap_pools):
+                    reader = readers[i]
+                    amount_in = token_out_quantity
+                    zeroForOne = self.swap_vectors[i]["zeroForOne"]
+                    pool_override = _overrides.get(pool.address)
+                    # a V2 quote is cheaper to calculate than to look up
+                    cached = pool_override is None and isinstance(
+                        pool, V3LiquidityPool
+                    )
 
-            for i, pool in enumerate(self.swap_pools):
-                try:
-                    token_in = self.swap_vectors[i]["token_in"]
-                    token_out_quantity = (
-                        pool.calculate_tokens_out_from_tokens_in(
-                            token_in=token_in,
-                            token_in_quantity=token_in_quantity
-                            if i == 0
-                            else token_out_quantity,
-                            override_state=_overrides.get(pool.address),
+                    if cached:
+                        # read once, so a quote calculated during an update is
+                        # not stored for the new state
+                        state_version = reader.state_version
+                        quote = quote_cache.get_quote(
+                            pool, zeroForOne, amount_in, state_version
+                        )
+                        if quote is not None:
+                            token_out_quantity = quote
+                            continue
+
+                    try:
+                        token_in = self.swap_vectors[i]["token_in"]
+                        if isinstance(pool, V3LiquidityPool):
+                            # the probe starts from a valid pool state, so skip
+                            # the range checks inside the swap loop
+                            token_out_quantity = (
+                                reader.calculate_tokens_out_from_tokens_in(
+                                    token_in=token_in,
+                                    token_in_quantity=amount_in,
+                                    override_state=pool_override,
+                                    unchecked=True,
+                                )
+                            )
+                        else:
+                            token_out_quantity = (
+                                pool.calculate_tokens_out_from_tokens_in(
+                                    token_in=token_in,
+                                    token_in_quantity=amount_in,
+                                    override_state=pool_override,
+                                )
+                            )
+                    except (EVMRevertError, LiquidityPoolError) as e:
+                        # The optimizer might send invalid amounts into the swap calculation during
+                        # iteration. We don't want it to stop, so catch the exception and pretend
+                        # the swap results in token_out_quantity = 0.
+                        token_out_quantity = 0
+                        break
+
+                    if cached:
+                        quote_cache.set_quote(
+                            pool,
+                            zeroForOne,
+                            amount_in,
+                            token_out_quantity,
+                            state_version,
                         )
-                    )
-                except (EVMRevertError, LiquidityPoolError) as e:
-                    # The optimizer might send invalid amounts into the swap calculation during
-                    # iteration. We don't want it to stop, so catch the exception and pretend
-                    # the swap results in token_out_quantity = 0.
-                    token_out_quantity = 0
-                    break
 
-            return -float(token_out_quantity - token_in_quantity)
-
-        opt = optimize.minimize_scalar(
-            fun=arb_profit,
-            method="bounded",
-            bounds=bounds,
-            bracket=bracket,
-            # Optimizer will run until the consecutive input values
-            # are within `xatol`. ERC-20 tokens can have different decimal precision,
-            # so set the tolerance to 1/3 of the 'nominal' decimal digits
-            #
-            # Examples:
-            #   WETH (18 decimal places) calculated within 1*10**6 Wei,
-            #   USDC (6 decimal places) calculated within 1*10**2 Wei
-            options={
-                "xatol": 1.0,
-                # "xatol": 10 ** int(1 / 3 * self.input_token.decimals),
-                # "disp": 3,
-            },
-        )
+                return -(token_out_quantity - token_in_quantity)
+
+            # start the search from the previous optimum, if there is one
+            opt = minimize_integer_scalar(
+                fun=arb_profit,
+                bounds=(1, self.max_input),
+                guess=self.best["last_swap_amount"] or None,
+                deadline=deadline,
+                time_budget=time_budget,
+            )
+            converged = opt.converged
 
-        # The arb_profit function converts the value to a negative number so the minimize_scalar
-        # correctly finds the optimum input. However we need a practical positive profit,
-        # so we negate the result afterwards
-        swap_amount = int(opt.x)
-        best_profit = -int(opt.fun)
+            # The arb_profit function converts the value to a negative number so the optimizer
+            # correctly finds the optimum input. However we need a practical positive profit,
+            # so we negate the result afterwards
+            swap_amount = opt.x
+            best_profit = -opt.fun
 
         try:
             best_amounts = self._build_amounts_out(
@@ -440,6 +598,7 @@ class UniswapLpCycle(Arbitrage):
         else:
             self.best.update(
                 {
+                    "converged": converged,
                     "last_swap_amount": swap_amount,
                     "profit_amount": best_profit,
                     "swap_amount": swap_amount,
@@ -0,0 +1,190 @@
+"""
+Benchmark `minimize_integer_scalar` against scipy's bounded `minimize_scalar`
+(`xatol=1.0`), the optimizer the arbitrage helpers used before.
+
+The objectives are the negated profit of two-pool cycles, exact integers for
+the integer optimizer and floats for scipy as the helpers computed them:
+
+- V3 -> V2: a V3 pool built in memory and a V2 pool priced above it. Quotes are
+  warmed up first, so the swap segment cache serves both optimizers alike. The
+  warm start uses the previous optimum after a 0.1% change of the V2 reserves.
+- V2 -> V2: constant product pools only, so the objective is cheap and the
+  optimizer overhead dominates.
+
+Reports the average evaluations and time per optimization, and the largest
+relative profit shortfall of each method against the best result of any method.
+
+    python -m alex_bot.benchmarks.optimizer --cases 40
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from alex_bot.arbitrage.optimizer import minimize_integer_scalar
+from alex_bot.tests.uniswap.v3.pool_helpers import TOKEN0, make_pool
+
+
+def _v2_out(amount_in: int, reserves_in: int, reserves_out: int) -> int:
+    amount_in_with_fee = amount_in * 997
+    return (
+        amount_in_with_fee
+        * reserves_out
+        // (reserves_in * 1000 + amount_in_with_fee)
+    )
+
+
+def _v3_v2_cycle(rng: random.Random) -> Tuple[Callable, Callable, int]:
+    """
+    Return a V3 -> V2 objective, the same objective after a 0.1% change of
+    the V2 reserves, and the upper bound of the input
+    """
+
+    pool = make_pool(random.Random(rng.getrandbits(64)), positions=200)
+    # token1 per token0 at the V3 price, with the V2 pool paying more for
+    # token1
+    price = (pool.sqrt_price_x96 / 2**96) ** 2
+    reserves1 = 10**24
+    reserves0 = int(reserves1 / price * rng.uniform(1.005, 1.05))
+
+    def cycle(reserves_in: int, reserves_out: int) -> Callable[[int], int]:
+        def objective(amount_in: int) -> int:
+            try:
+                amount_out = pool.calculate_tokens_out_from_tokens_in(
+                    TOKEN0, amount_in
+                )
+            except Exception:
+                amount_out = 0
+            return amount_in - _v2_out(amount_out, reserves_in, reserves_out)
+
+        return objective
+
+    upper = reserves0 // 10
+    objective = cycle(reserves1, reserves0)
+    changed = cycle(reserves1, reserves0 * 1001 // 1000)
+    # warm up the swap segment cache over the search range
+    for amount_in in range(1, upper, upper // 200):
+        objective(amount_in)
+    return objective, changed, upper
+
+
+def _v2_v2_cycle(rng: random.Random) -> Tuple[Callable, Callable, int]:
+    """
+    Return a profitable V2 -> V2 objective, the same objective after a 0.1%
+    change of the second pool's reserves, and the upper bound of the input
+    """
+
+    reserves0 = rng.randint(10**20, 10**26)
+    price = rng.uniform(0.5, 2)
+    reserves1 = int(reserves0 * price)
+    reserves2 = int(reserves1 * rng.uniform(0.1, 10))
+    reserves3 = int(reserves2 / price * rng.uniform(1.007, 1.1))
+
+    def cycle(reserves3: int) -> Callable[[int], int]:
+        def objective(amount_in: int) -> int:
+            return -(
+                _v2_out(
+                    _v2_out(amount_in, reserves0, reserves1),
+                    reserves2,
+                    reserves3,
+                )
+                - amount_in
+            )
+
+        return objective
+
+    return cycle(reserves3), cycle(reserves3 * 1001 // 1000), reserves0
+
+
+def _scipy(
+    objective: Callable[[int], int], upper: int, guess: Optional[int]
+) -> Tuple[int, int, int]:
+    from scipy import optimize
+
+    result = optimize.minimize_scalar(
+        lambda x: float(objective(int(x))),
+        method="bounded",
+        bounds=(1.0, float(upper)),
+        options={"xatol": 1.0},
+    )
+    x = int(result.x)
+    return x, -objective(x), result.nfev
+
+
+def _integer(
+    objective: Callable[[int], int], upper: int, guess: Optional[int]
+) -> Tuple[int, int, int]:
+    result = minimize_integer_scalar(objective, (1, upper), guess=guess)
+    return result.x, -result.fun, result.evaluations
+
+
+def _run(
+    name: str,
+    make_case: Callable,
+    cases: int,
+    seed: int,
+    include_scipy: bool,
+) -> None:
+    rng = random.Random(seed)
+    methods: Dict[str, Callable] = {"integer, cold": _integer}
+    if include_scipy:
+        methods["scipy bounded"] = _scipy
+    methods["integer, warm"] = _integer
+
+    evaluations: Dict[str, int] = dict.fromkeys(methods, 0)
+    elapsed: Dict[str, float] = dict.fromkeys(methods, 0.0)
+    profits: Dict[str, List[int]] = {method: [] for method in methods}
+
+    for _ in range(cases):
+        objective, changed, upper = make_case(rng)
+        previous, _, _ = _integer(objective, upper, None)
+        for method, optimize in methods.items():
+            guess = previous if method == "integer, warm" else None
+            start = time.perf_counter()
+            _, profit, count = optimize(changed, upper, guess)
+            elapsed[method] += time.perf_counter() - start
+            evaluations[method] += count
+            profits[method].append(profit)
+
+    best = [max(case) for case in zip(*profits.values())]
+    print(f"{name}, {cases} cases")
+    for method in methods:
+        shortfall = max(
+            (best_profit - profit) / best_profit
+            for profit, best_profit in zip(profits[method], best)
+            if best_profit > 0
+        )
+        print(
+            f"  {method:<14} {evaluations[method] / cases:6.1f} evaluations "
+            f"{elapsed[method] / cases * 1000:8.3f} ms "
+            f"max profit shortfall {shortfall:.1e}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cases", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        import scipy.optimize  # noqa: F401
+    except ImportError:
+        include_scipy = False
+        print("scipy is not installed, skipping the comparison")
+    else:
+        include_scipy = True
+        print(
+            f"import scipy.optimize: {time.perf_counter() - start:.2f} s"
+        )
+
+    _run("V3 -> V2", _v3_v2_cycle, args.cases, args.seed, include_scipy)
+    _run(
+        "V2 -> V2", _v2_v2_cycle, args.cases * 10, args.seed, include_scipy
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Benchmark `UniswapV3LiquidityPoolManager.prefetch_tick_words` against each pool
+fetching its own words through `_update_tick_data_at_word`.
+
+The RPC node is replaced by an in-process stand-in, which answers the
+`tickBitmap` and `getPopulatedTicksInWord` calls from pools built in memory and
+sleeps for a fixed latency on each round trip (a `multicall` block, or a call
+made outside one). Reports the round trips and wall time of both paths, and
+checks that the pools end up holding the same tick data.
+
+    python -m alex_bot.benchmarks.prefetch_tick_words --pools 200 --latency 0.005
+"""
+
+import argparse
+import random
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, List, Tuple
+from unittest import mock
+
+from brownie import network  # type: ignore
+
+from alex_bot.tests.uniswap.v3.pool_helpers import make_pool
+from alex_bot.uniswap.manager import uniswap_managers
+from alex_bot.uniswap.manager.uniswap_managers import (
+    UniswapV3LiquidityPoolManager,
+)
+from alex_bot.uniswap.v3 import v3_liquidity_pool
+from alex_bot.uniswap.v3.libraries import TickBitmap
+from alex_bot.uniswap.v3.v3_liquidity_pool import V3LiquidityPool
+
+BLOCK_NUMBER = 100
+
+
+class _RPCStandIn:
+    """
+    Count round trips and add `latency` seconds to each one. Calls made
+    inside a `multicall` block share the round trip of the block.
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.round_trips = 0
+        self._depth = 0
+
+    def call(self) -> None:
+        if not self._depth:
+            self._round_trip()
+
+    @contextmanager
+    def multicall(self, *args, **kwargs):
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self._round_trip()
+
+    def _round_trip(self) -> None:
+        self.round_trips += 1
+        time.sleep(self.latency)
+
+
+class _PoolContract:
+    def __init__(self, rpc: _RPCStandIn, chain_pool: V3LiquidityPool):
+        self._rpc = rpc
+        self._chain_pool = chain_pool
+
+    def tickBitmap(self, word_position, block_identifier=None) -> int:
+        self._rpc.call()
+        word = self._chain_pool.tick_bitmap.get(word_position)
+        return word["bitmap"] if word else 0
+
+
+class _LensContract:
+    def __init__(
+        self, rpc: _RPCStandIn, chain_pools: Dict[str, V3LiquidityPool]
+    ):
+        self._rpc = rpc
+        self._chain_pools = chain_pools
+
+    def getPopulatedTicksInWord(
+        self, address, word_position, block_identifier=None
+    ) -> List[Tuple[int, int, int]]:
+        self._rpc.call()
+        chain_pool = self._chain_pools[address]
+        return [
+            (tick, values["liquidityNet"], values["liquidityGross"])
+            for tick, values in chain_pool.tick_data.items()
+            if TickBitmap.position(tick // chain_pool.tick_spacing)[0]
+            == word_position
+        ]
+
+
+class _Lens:
+    def __init__(self, contract: _LensContract):
+        self._brownie_contract = contract
+
+
+def _make_pools(
+    rpc: _RPCStandIn, count: int, seed: int
+) -> Tuple[List[V3LiquidityPool], _Lens]:
+    """
+    Build `count` pools with empty sparse bitmaps, and the pools holding the
+    chain state that the stand-in serves them from
+    """
+
+    rng = random.Random(seed)
+    chain_pools: Dict[str, V3LiquidityPool] = {}
+    lens = _Lens(_LensContract(rpc, chain_pools))
+    pools = []
+
+    for i in range(count):
+        pool_seed = rng.getrandbits(64)
+        tick_spacing = rng.choice((1, 10, 60, 200))
+        chain_pool = make_pool(
+            random.Random(pool_seed), positions=40, tick_spacing=tick_spacing
+        )
+        pool = make_pool(
+            random.Random(pool_seed), positions=40, tick_spacing=tick_spacing
+        )
+        pool.address = chain_pool.address = f"0x{i:040x}"
+        pool.tick_bitmap = {"sparse": True}
+        pool.tick_data = {}
+        pool._rebuild_initialized_ticks()
+        pool._rebuild_liquidity_net()
+        pool._brownie_contract = _PoolContract(rpc, chain_pool)
+        pool.lens = lens
+        chain_pools[pool.address] = chain_pool
+        pools.append(pool)
+
+    return pools, lens
+
+
+def _tick_state(pools: List[V3LiquidityPool]) -> list:
+    return [
+        (
+            {
+                word: value if word == "sparse" else value["bitmap"]
+                for word, value in pool.tick_bitmap.items()
+            },
+            {tick: dict(values) for tick, values in pool.tick_data.items()},
+        )
+        for pool in pools
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pools", type=int, default=200)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.005,
+        help="seconds added to each round trip",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rpc = _RPCStandIn(args.latency)
+
+    with mock.patch.object(
+        v3_liquidity_pool, "multicall", rpc.multicall
+    ), mock.patch.object(
+        uniswap_managers, "multicall", rpc.multicall
+    ), mock.patch.dict(
+        network.main.CONFIG.active_network, {"multicall2": "stand-in"}
+    ):
+        pools, _ = _make_pools(rpc, args.pools, args.seed)
+        rpc.round_trips = 0
+        start = time.perf_counter()
+        for pool in pools:
+            word_position, _ = pool._get_tick_bitmap_position(pool.tick)
+            pool._update_tick_data_at_word(
+                word_position, block_number=BLOCK_NUMBER
+            )
+        per_pool = (rpc.round_trips, time.perf_counter() - start)
+        expected = _tick_state(pools)
+
+        pools, lens = _make_pools(rpc, args.pools, args.seed)
+        manager = object.__new__(UniswapV3LiquidityPoolManager)
+        manager._lock = Lock()
+        manager._lens = lens
+        rpc.round_trips = 0
+        start = time.perf_counter()
+        result = manager.prefetch_tick_words(
+            pools=pools,
+            block_number=BLOCK_NUMBER,
+            batch_size=args.batch_size,
+        )
+        prefetch = (rpc.round_trips, time.perf_counter() - start)
+
+    if _tick_state(pools) != expected:
+        raise AssertionError("The prefetched tick data differs")
+
+    print(
+        f"{args.pools} pools, {result['words']} words, "
+        f"{args.latency * 1000:g} ms per round trip"
+    )
+    for label, (round_trips, elapsed) in (
+        ("per-pool fetch", per_pool),
+        ("prefetch", prefetch),
+    ):
+        print(f"  {label:<15} {round_trips:>6} round trips {elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark the process-wide `getSqrtRatioAtTick` cache (`set_tick_cache`) with
+each math backend.
+
+The workload probes every pool with 24 amounts in both directions, once per
+block, from a slightly perturbed `override_state`, as the arbitrage helpers do
+when chaining pools. The override bypasses the swap segment cache, so every
+quote runs the swap loop. Each configuration is run once to warm up, then the
+tick cache is emptied and the run is timed. Reports the time and the cache hit
+rate, and checks that every configuration returns the same quotes.
+
+    python -m alex_bot.benchmarks.sqrt_ratio_cache --pools 200 --blocks 3
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from alex_bot.tests.uniswap.v3.pool_helpers import make_pool
+from alex_bot.uniswap.v3.libraries import (
+    clear_tick_cache,
+    get_backend,
+    get_tick_cache_info,
+    set_backend,
+    set_tick_cache,
+)
+from alex_bot.uniswap.v3.v3_liquidity_pool import V3LiquidityPool
+
+AMOUNTS = [int(10**16 * 1.5**k) for k in range(24)]
+
+
+def _workload(
+    pools: List[V3LiquidityPool], blocks: int, seed: int
+) -> List[int]:
+    rng = random.Random(seed)
+    results = []
+    for _ in range(blocks):
+        for pool in pools:
+            override_state = {
+                "liquidity": pool.liquidity,
+                "sqrt_price_x96": pool.sqrt_price_x96
+                + rng.randint(0, 10**10),
+                "tick": pool.tick,
+            }
+            for token in (pool.token0, pool.token1):
+                for amount in AMOUNTS:
+                    results.append(
+                        pool.calculate_tokens_out_from_tokens_in(
+                            token, amount, override_state=override_state
+                        )
+                    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pools", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=3)
+    parser.add_argument("--cache-size", type=int, default=65_536)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pools = [
+        make_pool(
+            random.Random(rng.getrandbits(64)),
+            positions=150,
+            tick_spacing=(1, 10, 60, 200)[i % 4],
+        )
+        for i in range(args.pools)
+    ]
+
+    print(
+        f"{args.pools} pools, {args.blocks} blocks, "
+        f"{args.pools * args.blocks * 2 * len(AMOUNTS)} quotes"
+    )
+    backend = get_backend()
+    cache_size = get_tick_cache_info()["maxsize"]
+    expected = None
+    try:
+        for backend_name in ("reference", "fast"):
+            set_backend(backend_name)
+            for maxsize in (None, args.cache_size):
+                set_tick_cache(maxsize)
+                _workload(pools, args.blocks, args.seed)
+                clear_tick_cache()
+                start = time.perf_counter()
+                results = _workload(pools, args.blocks, args.seed)
+                elapsed = time.perf_counter() - start
+                if expected is None:
+                    expected = results
+                elif results != expected:
+                    raise AssertionError(
+                        f"The {backend_name} backend with cache size "
+                        f"{maxsize} returned different quotes"
+                    )
+                info = get_tick_cache_info()
+                label = "no cache" if maxsize is None else f"cache {maxsize}"
+                print(
+                    f"  {backend_name:<9} {label:<12} {elapsed:7.2f} s "
+                    f"hit rate {info['hit_rate']:6.1%} "
+                    f"size {info['size']}"
+                )
+    finally:
+        set_backend(backend)
+        set_tick_cache(cache_size)
+
+
+if __name__ == "__main__":
+    main()
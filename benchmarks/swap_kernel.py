@@ -0,0 +1,76 @@
+"""
+Benchmark the per-call time of the V3 swap kernel (`__UniswapV3Pool_swap`) on
+swaps of 1, 10 and 100 steps, with each math backend.
+
+Quotes are made with an `override_state`, which bypasses the swap segment
+cache, so every call runs the full swap loop. The number of steps is checked
+with the `telemetry` argument.
+
+    python -m alex_bot.benchmarks.swap_kernel
+"""
+
+import argparse
+import random
+import timeit
+
+from alex_bot.tests.uniswap.v3.pool_helpers import TOKEN0, TOKEN1, make_pool
+from alex_bot.uniswap.v3.libraries import get_backend, set_backend
+
+STEPS = (1, 10, 100)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pool = make_pool(random.Random(args.seed), positions=3000, tick_spacing=1)
+    # swap away from the closer end of the positions, which span ticks -200
+    # to 300
+    zeroForOne = pool.tick > 50
+    token_in = TOKEN0 if zeroForOne else TOKEN1
+
+    # the cumulative input needed to reach each step boundary
+    segments = pool._get_swap_segments(zeroForOne)
+    while len(segments["boundaries"]) <= max(STEPS):
+        pool._extend_swap_segments(zeroForOne, segments)
+    amounts_in = segments["amounts_in"]
+
+    override_state = {"liquidity": pool.liquidity}
+    backend = get_backend()
+    try:
+        for backend_name in ("reference", "fast"):
+            set_backend(backend_name)
+            print(f"{backend_name} backend")
+            for steps in STEPS:
+                amount = (amounts_in[steps - 1] + amounts_in[steps]) // 2
+                telemetry: dict = {}
+                pool.calculate_tokens_out_from_tokens_in(
+                    token_in,
+                    amount,
+                    override_state=override_state,
+                    telemetry=telemetry,
+                )
+                if telemetry["steps"] != steps:
+                    raise AssertionError(
+                        f"Expected {steps} steps, the swap made "
+                        f"{telemetry['steps']}"
+                    )
+                number = max(1, 2000 // steps)
+                elapsed = min(
+                    timeit.repeat(
+                        lambda: pool.calculate_tokens_out_from_tokens_in(
+                            token_in, amount, override_state=override_state
+                        ),
+                        number=number,
+                        repeat=args.repeat,
+                    )
+                )
+                print(f"  {steps:>3} steps {elapsed / number * 1e6:9.1f} us")
+    finally:
+        set_backend(backend)
+
+
+if __name__ == "__main__":
+    main()
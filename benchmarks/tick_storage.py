@@ -0,0 +1,93 @@
+"""
+Report the memory held by the tick data of many V3 pools, with the dict layout
+and with the compact layout (`compact_tick_storage`).
+
+The pools are built in memory with sparse bitmaps, so only the words holding
+initialized ticks are stored, as for pools loaded from a snapshot. Each layout
+is built from the same seed and measured with tracemalloc, which counts the
+whole pools (tick data, bitmap, the derived indexes and the pool objects), and
+with `get_tick_storage_size`.
+
+    python -m alex_bot.benchmarks.tick_storage --pools 5000
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from typing import List, Tuple
+
+from alex_bot.tests.uniswap.v3.pool_helpers import make_pool
+from alex_bot.uniswap.v3.v3_liquidity_pool import V3LiquidityPool
+
+
+def _make_pools(
+    count: int, positions: int, seed: int, compact: bool
+) -> List[V3LiquidityPool]:
+    rng = random.Random(seed)
+    return [
+        make_pool(
+            random.Random(rng.getrandbits(64)),
+            positions=positions,
+            tick_spacing=rng.choice((1, 10, 60, 200)),
+            sparse=True,
+            compact_tick_storage=compact,
+        )
+        for _ in range(count)
+    ]
+
+
+def _measure(
+    count: int, positions: int, seed: int, compact: bool
+) -> Tuple[int, int, int, int]:
+    """
+    Return the traced memory of the pools, the sum of their tick storage
+    sizes, and the number of ticks and bitmap words they hold
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        pools = _make_pools(count, positions, seed, compact)
+        gc.collect()
+        traced, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return (
+        traced,
+        sum(pool.get_tick_storage_size() for pool in pools),
+        sum(len(pool.tick_data) for pool in pools),
+        sum(len(pool.tick_bitmap) - 1 for pool in pools),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pools", type=int, default=5000)
+    parser.add_argument(
+        "--positions", type=int, default=60, help="positions per pool"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = {
+        label: _measure(args.pools, args.positions, args.seed, compact)
+        for label, compact in (
+            ("dict layout", False),
+            ("compact layout", True),
+        )
+    }
+
+    _, _, ticks, words = results["dict layout"]
+    print(f"{args.pools} pools, {ticks} ticks, {words} bitmap words")
+    print(f"  {'':<15} {'tracemalloc':>12} {'storage size':>13}")
+    for label, (traced, storage_size, _, _) in results.items():
+        print(
+            f"  {label:<15} {traced / 1e6:9.1f} MB "
+            f"{storage_size / 1e6:10.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
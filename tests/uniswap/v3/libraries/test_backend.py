@@ -0,0 +1,299 @@
+"""
+Fuzz the "fast" math backend against the reference port. A match requires both
+the return value and any raised exception (type and arguments) to be identical.
+"""
+
+import random
+from typing import Callable, Iterator
+
+import pytest
+
+from alex_bot.uniswap.v3.libraries import Backend, FastMath, TickMath
+from alex_bot.uniswap.v3.libraries.Helpers import (
+    MAX_INT128,
+    MAX_UINT128,
+    MAX_UINT256,
+    MIN_INT128,
+)
+
+ITERATIONS = 10_000
+
+
+def _random_uint(rng: random.Random, max_bits: int) -> int:
+    return rng.getrandbits(rng.randint(0, max_bits))
+
+
+def _random_int(rng: random.Random, max_bits: int) -> int:
+    value = _random_uint(rng, max_bits)
+    return -value if rng.getrandbits(1) else value
+
+
+def _random_sqrt_price(rng: random.Random) -> int:
+    # sample across the full exponent range instead of uniformly, which would
+    # almost always produce a price near MAX_SQRT_RATIO
+    while True:
+        price = _random_uint(rng, 160)
+        if TickMath.MIN_SQRT_RATIO <= price < TickMath.MAX_SQRT_RATIO:
+            return price
+
+
+def _random_bitmap(rng: random.Random, words: range) -> dict:
+    tick_bitmap: dict = {"sparse": False}
+    for word in words:
+        if rng.random() < 0.8:
+            tick_bitmap[word] = {
+                "bitmap": rng.choice(
+                    [
+                        0,
+                        1 << rng.randrange(256),
+                        rng.getrandbits(256),
+                        rng.getrandbits(256) & rng.getrandbits(256),
+                    ]
+                ),
+                "block": None,
+            }
+    return tick_bitmap
+
+
+def _copy_bitmap(tick_bitmap: dict) -> dict:
+    return {
+        key: value.copy() if isinstance(value, dict) else value
+        for key, value in tick_bitmap.items()
+    }
+
+
+def _samples(name: str, rng: random.Random) -> Iterator[tuple]:
+    """
+    Yield an endless stream of argument tuples for the named library function.
+    """
+
+    min_tick, max_tick = TickMath.MIN_TICK, TickMath.MAX_TICK
+    min_price, max_price = TickMath.MIN_SQRT_RATIO, TickMath.MAX_SQRT_RATIO
+
+    if name in ("mostSignificantBit", "leastSignificantBit"):
+        yield from ((x,) for x in (0, -1, 1, 2, 3, MAX_UINT256))
+        yield from ((1 << i,) for i in range(256))
+        while True:
+            yield (_random_uint(rng, 256),)
+
+    elif name in ("mulDiv", "mulDivRoundingUp"):
+        yield from (
+            (MAX_UINT256, MAX_UINT256, MAX_UINT256),
+            (MAX_UINT256, 2, 1),
+            (MAX_UINT256, 1, 1),
+            (MAX_UINT256 + 1, 1, 1),
+            (1, 1, 0),
+            (-1, 1, 1),
+        )
+        while True:
+            yield (
+                _random_uint(rng, 257),
+                _random_uint(rng, 257),
+                _random_uint(rng, 257),
+            )
+
+    elif name == "divRoundingUp":
+        yield from ((0, 0), (1, 0), (0, 1))
+        while True:
+            yield (_random_uint(rng, 256), _random_uint(rng, 256))
+
+    elif name == "addDelta":
+        yield from (
+            (MAX_UINT128, 1),
+            (0, -1),
+            (MAX_UINT128 + 1, 0),
+            (0, MAX_INT128 + 1),
+            (0, MIN_INT128 - 1),
+        )
+        while True:
+            yield (_random_uint(rng, 129), _random_int(rng, 128))
+
+    elif name == "getSqrtRatioAtTick":
+        yield from (
+            (tick,)
+            for tick in (
+                min_tick - 1,
+                min_tick,
+                0,
+                max_tick,
+                max_tick + 1,
+            )
+        )
+        while True:
+            yield (rng.randint(min_tick, max_tick),)
+
+    elif name == "getTickAtSqrtRatio":
+        yield from (
+            (price,)
+            for price in (
+                -1,
+                0,
+                min_price - 1,
+                min_price,
+                max_price - 1,
+                max_price,
+                2**160,
+            )
+        )
+        while True:
+            if rng.getrandbits(1):
+                yield (_random_sqrt_price(rng),)
+            else:
+                # exercise prices on and around exact tick boundaries
+                tick = rng.randint(min_tick, max_tick - 1)
+                yield (
+                    FastMath.getSqrtRatioAtTick(tick)
+                    + rng.choice((-1, 0, 1)),
+                )
+
+    elif name in ("getAmount0Delta", "getAmount1Delta"):
+        while True:
+            yield (
+                _random_sqrt_price(rng),
+                _random_sqrt_price(rng),
+                rng.choice(
+                    [
+                        _random_uint(rng, 128),
+                        _random_int(rng, 129),
+                        0,
+                        MAX_UINT128,
+                    ]
+                ),
+                rng.choice([None, True, False]),
+            )
+
+    elif name in (
+        "getNextSqrtPriceFromAmount0RoundingUp",
+        "getNextSqrtPriceFromAmount1RoundingDown",
+    ):
+        while True:
+            yield (
+                _random_sqrt_price(rng),
+                _random_uint(rng, 128) or 1,
+                _random_uint(rng, 256),
+                rng.choice([True, False]),
+            )
+
+    elif name in ("getNextSqrtPriceFromInput", "getNextSqrtPriceFromOutput"):
+        while True:
+            yield (
+                rng.choice([_random_sqrt_price(rng), 0]),
+                rng.choice([_random_uint(rng, 128), 0]),
+                _random_uint(rng, 256),
+                rng.choice([True, False]),
+            )
+
+    elif name == "computeSwapStep":
+        while True:
+            yield (
+                _random_sqrt_price(rng),
+                _random_sqrt_price(rng),
+                _random_uint(rng, 128),
+                _random_int(rng, 200),
+                rng.choice(
+                    [100, 500, 3000, 10000, rng.randrange(10**6)]
+                ),
+            )
+
+    elif name == "position":
+        while True:
+            yield (rng.randint(min_tick, max_tick),)
+
+    elif name in ("flipTick", "nextInitializedTickWithinOneWord"):
+        while True:
+            tick_spacing = rng.choice([1, 10, 60, 200])
+            tick = rng.randint(min_tick, max_tick)
+            if name == "flipTick" and rng.random() < 0.9:
+                tick -= tick % tick_spacing
+            word, _ = FastMath.position(tick // tick_spacing)
+            tick_bitmap = _random_bitmap(rng, range(word - 1, word + 2))
+            if name == "flipTick":
+                yield (tick_bitmap, tick, tick_spacing, None)
+            else:
+                yield (
+                    tick_bitmap,
+                    tick,
+                    tick_spacing,
+                    bool(rng.getrandbits(1)),
+                )
+
+    else:
+        raise ValueError(f"No sample generator for {name}")
+
+
+def _outcome(function: Callable, args: tuple) -> tuple:
+    try:
+        result = function(*args)
+    except Exception as e:
+        return ("raised", type(e), e.args)
+    else:
+        return ("returned", result)
+
+
+@pytest.mark.parametrize(
+    "module, name",
+    list(Backend._BACKENDS["reference"]),
+    ids=lambda value: getattr(value, "__name__", value),
+)
+def test_fast_backend_matches_reference(module, name):
+    rng = random.Random(name)
+    reference_function = Backend._BACKENDS["reference"][module, name]
+    candidate_function = Backend._BACKENDS["fast"][module, name]
+    samples = _samples(name, rng)
+
+    for _ in range(ITERATIONS):
+        args = next(samples)
+        if name == "flipTick":
+            # flipTick mutates the bitmap, so give each backend a copy
+            reference_args = (_copy_bitmap(args[0]), *args[1:])
+            candidate_args = (_copy_bitmap(args[0]), *args[1:])
+            expected = _outcome(reference_function, reference_args)
+            result = _outcome(candidate_function, candidate_args)
+            if expected == result:
+                expected, result = reference_args[0], candidate_args[0]
+        else:
+            expected = _outcome(reference_function, args)
+            result = _outcome(candidate_function, args)
+
+        assert result == expected, f"{module.__name__}.{name}{args}"
+
+
+@pytest.mark.slow
+def test_fast_backend_matches_reference_at_every_tick():
+    """
+    Exhaustively compare `getSqrtRatioAtTick` over the full tick range, and
+    `getTickAtSqrtRatio` at every tick boundary and the price immediately
+    below it. Slow (over a minute).
+    """
+
+    reference = Backend._BACKENDS["reference"]
+    fast = Backend._BACKENDS["fast"]
+    reference_ratio = reference[TickMath, "getSqrtRatioAtTick"]
+    reference_tick = reference[TickMath, "getTickAtSqrtRatio"]
+    candidate_ratio = fast[TickMath, "getSqrtRatioAtTick"]
+    candidate_tick = fast[TickMath, "getTickAtSqrtRatio"]
+
+    for tick in range(TickMath.MIN_TICK, TickMath.MAX_TICK + 1):
+        ratio = reference_ratio(tick)
+        assert candidate_ratio(tick) == ratio, tick
+        for price in (ratio - 1, ratio):
+            if not TickMath.MIN_SQRT_RATIO <= price < TickMath.MAX_SQRT_RATIO:
+                continue
+            assert candidate_tick(price) == reference_tick(price), price
+
+
+def test_tick_cache():
+    backend = Backend.get_backend()
+    Backend.set_tick_cache(16)
+    try:
+        for tick in (0, 1, 0, 1):
+            assert TickMath.getSqrtRatioAtTick(tick) == Backend._BACKENDS[
+                backend
+            ][TickMath, "getSqrtRatioAtTick"](tick)
+        info = Backend.get_tick_cache_info()
+        assert (info["hits"], info["misses"], info["size"]) == (2, 2, 2)
+        Backend.clear_tick_cache()
+        assert Backend.get_tick_cache_info()["size"] == 0
+    finally:
+        Backend.set_tick_cache(None)
+    assert Backend.get_tick_cache_info()["maxsize"] is None
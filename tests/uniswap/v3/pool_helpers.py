@@ -0,0 +1,308 @@
+"""
+Helpers for the V3 pool tests and benchmarks: pools holding random positions
+built in memory (no chain connection is needed), random updates and swap quote
+requests, and comparisons of pool states and quotes.
+"""
+
+import random
+from threading import Lock
+from time import sleep
+from typing import Callable, Dict, List, Optional, Tuple
+
+from alex_bot.token import Erc20Token
+from alex_bot.uniswap.v3.libraries import TickBitmap, TickMath
+from alex_bot.uniswap.v3.tick_storage import (
+    compact_tick_bitmap,
+    compact_tick_data,
+)
+from alex_bot.uniswap.v3.v3_liquidity_pool import V3LiquidityPool
+
+
+def _make_token(address: str, symbol: str) -> Erc20Token:
+    # a placeholder token, since Erc20Token reads its details from the chain
+    token = object.__new__(Erc20Token)
+    token.address = address
+    token.symbol = symbol
+    token.name = symbol
+    token.decimals = 18
+    return token
+
+
+TOKEN0 = _make_token("0x" + "00" * 19 + "01", "TKN0")
+TOKEN1 = _make_token("0x" + "00" * 19 + "02", "TKN1")
+
+
+def make_pool(
+    rng: random.Random,
+    positions: int = 100,
+    tick_spacing: int = 10,
+    fee: int = 3000,
+    sparse: bool = False,
+    **kwargs,
+) -> V3LiquidityPool:
+    """
+    Build a pool holding random positions around the current price, through the
+    unpickling path so that no chain connection is needed. The tick bitmap is
+    complete, so swaps never fetch words, unless `sparse` is set, in which case
+    only the words holding initialized ticks are present (and the pool must not
+    be used for swaps). Extra keyword arguments are set as pool attributes
+    (e.g. `compact_tick_storage`, `concurrent_readers`).
+    """
+
+    tick_data: Dict[int, dict] = {}
+    ranges = []
+    for _ in range(positions):
+        lower = rng.randint(-200, 200) * tick_spacing
+        upper = lower + rng.randint(1, 100) * tick_spacing
+        liquidity = rng.randint(10**15, 10**20)
+        ranges.append((lower, upper, liquidity))
+        for tick, liquidity_net in ((lower, liquidity), (upper, -liquidity)):
+            record = tick_data.setdefault(
+                tick, {"liquidityNet": 0, "liquidityGross": 0, "block": 1}
+            )
+            record["liquidityNet"] += liquidity_net
+            record["liquidityGross"] += liquidity
+
+    max_word = (TickMath.MAX_TICK // tick_spacing >> 8) + 1
+    tick_bitmap: dict = {
+        word: {"bitmap": 0, "block": 1}
+        for word in range(-max_word, max_word + 1)
+    }
+    for tick in tick_data:
+        word, bit = TickBitmap.position(tick // tick_spacing)
+        tick_bitmap[word]["bitmap"] |= 1 << bit
+    if sparse:
+        tick_bitmap = {
+            word: value
+            for word, value in tick_bitmap.items()
+            if value["bitmap"]
+        }
+    tick_bitmap["sparse"] = sparse
+
+    tick = rng.randint(-150, 150) * tick_spacing + rng.randrange(tick_spacing)
+    sqrt_price_x96 = TickMath.getSqrtRatioAtTick(tick) + rng.randrange(
+        TickMath.getSqrtRatioAtTick(tick + 1)
+        - TickMath.getSqrtRatioAtTick(tick)
+    )
+
+    pool = object.__new__(V3LiquidityPool)
+    pool.__setstate__(
+        {
+            "address": "0x" + "00" * 19 + "03",
+            "name": "TKN0-TKN1 (V3, test)",
+            "token0": TOKEN0,
+            "token1": TOKEN1,
+            "fee": fee,
+            "tick_spacing": tick_spacing,
+            "liquidity": sum(
+                liquidity
+                for lower, upper, liquidity in ranges
+                if lower <= tick < upper
+            ),
+            "sqrt_price_x96": sqrt_price_x96,
+            "tick": tick,
+            "tick_data": tick_data,
+            "tick_bitmap": tick_bitmap,
+            "update_block": 1,
+            "liquidity_update_block": 1,
+            "extra_words": 10,
+            "uniswap_version": 3,
+            "_update_method": "external",
+            "_brownie_contract": None,
+            "abi": None,
+            "lens": None,
+        }
+    )
+    pool.tick_lock = Lock()
+    pool.update_lock = Lock()
+    pool.__dict__.update(kwargs)
+    if pool.compact_tick_storage:
+        pool.tick_data = compact_tick_data(pool.tick_data)
+        pool.tick_bitmap = compact_tick_bitmap(pool.tick_bitmap)
+    pool._update_pool_state()
+    if pool.concurrent_readers:
+        with pool.update_lock:
+            pool._publish_reader_view()
+    return pool
+
+
+def outcome(function: Callable, *args) -> tuple:
+    try:
+        result = function(*args)
+    except Exception as e:
+        return ("raised", type(e), str(e))
+    else:
+        return ("returned", result)
+
+
+def pool_state(pool: V3LiquidityPool) -> dict:
+    """
+    Return a copy of the pool state compared by the tests, including the
+    derived tick indexes. Bitmap words are compared by their bits only, since
+    the block recorded for a word depends on how many times it was flipped.
+    """
+
+    return {
+        "liquidity": pool.liquidity,
+        "sqrt_price_x96": pool.sqrt_price_x96,
+        "tick": pool.tick,
+        "update_block": pool.update_block,
+        "liquidity_update_block": pool.liquidity_update_block,
+        "state": dict(pool.state),
+        "tick_data": {
+            tick: dict(record.items())
+            for tick, record in pool.tick_data.items()
+        },
+        "tick_bitmap": {
+            word: value if word == "sparse" else value["bitmap"]
+            for word, value in pool.tick_bitmap.items()
+        },
+        "initialized_ticks": list(pool._initialized_ticks),
+        "liquidity_net": dict(pool._liquidity_net),
+    }
+
+
+def check_pool_state(
+    pool: V3LiquidityPool, expected: dict, description: str
+) -> None:
+    state = pool_state(pool)
+    for key in expected:
+        assert state[key] == expected[key], f"{description}: {key} differs"
+
+
+def random_updates(
+    rng: random.Random,
+    pool: V3LiquidityPool,
+    count: int,
+    positions: List[list],
+) -> List[Tuple[int, dict]]:
+    """
+    Generate `(block_number, updates)` pairs in the format accepted by
+    `external_update`, starting at the pool's last update block. Mints are
+    recorded in `positions` as `[lower, upper, liquidity]`, so later burns
+    never remove more liquidity than was added. A few slot0 updates are given
+    an earlier block, so the block checks are exercised.
+    """
+
+    spacing = pool.tick_spacing
+    max_spacings = TickMath.MAX_TICK // spacing
+    block = pool.update_block
+    tick = pool.tick
+    updates: List[Tuple[int, dict]] = []
+
+    for _ in range(count):
+        block += rng.choice((0, 0, 1, 2))
+        update: dict = {}
+
+        if rng.random() < 0.5:
+            if positions and rng.random() < 0.4:
+                position = rng.choice(positions)
+                lower, upper, liquidity = position
+                burned = rng.randint(1, liquidity)
+                position[2] -= burned
+                if not position[2]:
+                    positions.remove(position)
+                update["liquidity_change"] = (-burned, lower, upper)
+            else:
+                if positions and rng.random() < 0.2:
+                    # add to an existing position
+                    lower, upper, _ = rng.choice(positions)
+                else:
+                    if rng.random() < 0.2:
+                        # far from the price, often in a word with no ticks
+                        lower = rng.randint(-max_spacings, max_spacings - 1)
+                    else:
+                        lower = rng.randint(-250, 250)
+                    upper = lower + rng.randint(
+                        1, min(100, max_spacings - lower)
+                    )
+                    lower, upper = lower * spacing, upper * spacing
+                liquidity = rng.randint(1, 10**20)
+                positions.append([lower, upper, liquidity])
+                update["liquidity_change"] = (liquidity, lower, upper)
+
+        if not update or rng.random() < 0.3:
+            tick = min(
+                max(tick + rng.randint(-300, 300), TickMath.MIN_TICK),
+                TickMath.MAX_TICK - 1,
+            )
+            update["tick"] = tick
+            if rng.random() < 0.8:
+                update["sqrt_price_x96"] = TickMath.getSqrtRatioAtTick(tick)
+            if rng.random() < 0.5:
+                update["liquidity"] = rng.randint(0, 10**21)
+
+        if "liquidity_change" not in update and rng.random() < 0.1:
+            updates.append((block - rng.randint(1, 3), update))
+        else:
+            updates.append((block, update))
+
+    return updates
+
+
+def random_requests(rng: random.Random, count: int) -> List[tuple]:
+    """
+    Generate `(token, exact_input, amount)` swap quote requests
+    """
+
+    requests = []
+    for _ in range(count):
+        token = rng.choice([TOKEN0, TOKEN1])
+        exact_input = rng.choice([True, False])
+        amount = rng.getrandbits(rng.randint(1, 80)) or 1
+        requests.append((token, exact_input, amount))
+    return requests
+
+
+def quote(
+    pool: V3LiquidityPool,
+    request: tuple,
+    override_state: Optional[dict] = None,
+    telemetry: Optional[dict] = None,
+) -> tuple:
+    token, exact_input, amount = request
+    if exact_input:
+        return outcome(
+            pool.calculate_tokens_out_from_tokens_in,
+            token,
+            amount,
+            override_state,
+            False,
+            False,
+            telemetry,
+        )
+    return outcome(
+        pool.calculate_tokens_in_from_tokens_out,
+        token,
+        amount,
+        override_state,
+        False,
+        telemetry,
+    )
+
+
+def check_quotes(
+    pool: V3LiquidityPool,
+    requests: List[tuple],
+    expected: List[tuple],
+    description: str,
+    override_state: Optional[dict] = None,
+) -> None:
+    for request, expected_result in zip(requests, expected):
+        token, exact_input, amount = request
+        assert quote(pool, request, override_state) == expected_result, (
+            f"{description}: {'input' if exact_input else 'output'} "
+            f"{amount} {token}"
+        )
+
+
+class YieldingList(list):
+    """
+    A list that lets other threads run before and after each append, to widen
+    the race windows around changes to the swap segment cache
+    """
+
+    def append(self, value) -> None:
+        sleep(0)
+        super().append(value)
+        sleep(0)
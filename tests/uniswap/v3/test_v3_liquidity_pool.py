@@ -0,0 +1,400 @@
+"""
+Randomized checks of the V3 pool helper. Each test compares an optimized code
+path against a plain calculation of the same result.
+"""
+
+import random
+import sys
+from threading import Thread
+from typing import List
+
+import pytest
+
+from alex_bot.uniswap.v3 import v3_liquidity_pool
+from alex_bot.uniswap.v3.libraries import TickBitmap
+
+from .pool_helpers import (
+    YieldingList,
+    check_pool_state,
+    check_quotes,
+    make_pool,
+    pool_state,
+    quote,
+    random_requests,
+    random_updates,
+)
+
+SEEDS = range(3)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_swap_segments_with_concurrent_quotes(seed):
+    """
+    Quote exact input and exact output swaps from many threads at once through a
+    concurrent-reader pool, so every thread extends the same swap segment cache,
+    and compare each result with the full swap calculation.
+
+    The interpreter switch interval is lowered while the threads run, and the
+    cache lists yield to other threads on each append, to make thread switches
+    inside the cache extension likely.
+    """
+
+    rng = random.Random(seed)
+    threads = 8
+    quotes = 200
+
+    for _ in range(5):
+        pool = make_pool(rng, concurrent_readers=True)
+        view = pool.get_reader()
+        for zeroForOne in (True, False):
+            segments = view._get_swap_segments(zeroForOne)
+            for key in ("boundaries", "amounts_in", "amounts_out"):
+                segments[key] = YieldingList(segments[key])
+
+        requests = random_requests(rng, quotes)
+        # the telemetry dictionary bypasses the swap segment cache
+        expected = [quote(pool, request, telemetry={}) for request in requests]
+        results: List[List[tuple]] = [[] for _ in range(threads)]
+
+        def worker(i: int) -> None:
+            # each thread quotes every request, starting at a different offset
+            offset = i * quotes // threads
+            for j in range(quotes):
+                k = (offset + j) % quotes
+                results[i].append((k, quote(pool, requests[k])))
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            workers = [
+                Thread(target=worker, args=(i,)) for i in range(threads)
+            ]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        for thread_results in results:
+            assert len(thread_results) == quotes
+            for k, result in thread_results:
+                assert result == expected[k], requests[k]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_bulk_updates_match_single_updates(seed):
+    """
+    Apply the same random Mint, Burn and slot0 updates to two identical pools,
+    in batches through `external_update_bulk` on one and one at a time through
+    `external_update` on the other, and compare the return values, the pool
+    states and (for pools with a complete bitmap) swap quotes after each batch.
+
+    Half of the pools use compact tick storage, and half have a sparse bitmap
+    updated without fetching, so missing words get placeholders.
+    """
+
+    rng = random.Random(seed)
+
+    for _ in range(15):
+        pool_seed = rng.getrandbits(64)
+        options = {
+            "sparse": rng.random() < 0.5,
+            "compact_tick_storage": rng.random() < 0.5,
+        }
+        bulk_pool = make_pool(random.Random(pool_seed), **options)
+        pool = make_pool(random.Random(pool_seed), **options)
+
+        positions: List[list] = []
+        remaining = 100
+        while remaining:
+            batch = random_updates(
+                rng, pool, min(remaining, rng.randint(1, 20)), positions
+            )
+            remaining -= len(batch)
+
+            bulk_result = bulk_pool.external_update_bulk(
+                batch, fetch_missing=False
+            )
+            results = [
+                pool.external_update(
+                    update, block_number=block_number, fetch_missing=False
+                )
+                for block_number, update in batch
+            ]
+            assert bulk_result == any(results), batch
+            check_pool_state(
+                bulk_pool, pool_state(pool), f"bulk update {batch}"
+            )
+            if not options["sparse"]:
+                requests = random_requests(rng, 20)
+                check_quotes(
+                    bulk_pool,
+                    requests,
+                    [quote(pool, request) for request in requests],
+                    f"bulk update {batch}",
+                )
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_snapshot_restore(seed):
+    """
+    Take nested snapshots of a pool between random updates (single and bulk),
+    restore them in a random order, and check that each restore returns the
+    pool state to the one recorded at its snapshot, including removing any
+    placeholder words added to a sparse bitmap. For pools with a complete
+    bitmap, quotes from the restored swap segment cache are compared with the
+    full swap calculation, and for concurrent-reader pools the published view
+    is compared with the pool.
+    """
+
+    rng = random.Random(seed)
+    steps = 50
+
+    for _ in range(15):
+        sparse = rng.random() < 0.5
+        pool = make_pool(
+            rng,
+            sparse=sparse,
+            compact_tick_storage=rng.random() < 0.5,
+            concurrent_readers=rng.random() < 0.5,
+        )
+        positions: List[list] = []
+        # (snapshot token, pool state, positions) for each snapshot held
+        snapshots: List[tuple] = []
+
+        for step in range(steps + 1):
+            action = rng.random()
+            if step == steps and snapshots:
+                # release everything at the end
+                action, i = 1.0, 0
+            elif snapshots:
+                i = rng.randrange(len(snapshots))
+
+            if action < 0.25:
+                snapshots.append(
+                    (
+                        pool.snapshot(),
+                        pool_state(pool),
+                        [list(position) for position in positions],
+                    )
+                )
+            elif action > 0.75 and snapshots:
+                token, expected, positions = snapshots[i]
+                del snapshots[i:]
+                pool.restore(token)
+                description = f"restore of snapshot {token}"
+                check_pool_state(pool, expected, description)
+                if pool.concurrent_readers:
+                    check_pool_state(pool.get_reader(), expected, description)
+                if not sparse:
+                    requests = random_requests(rng, 20)
+                    check_quotes(
+                        pool,
+                        requests,
+                        [
+                            quote(pool, request, telemetry={})
+                            for request in requests
+                        ],
+                        description,
+                    )
+                if not snapshots:
+                    assert pool._journal is None
+            else:
+                batch = random_updates(rng, pool, rng.randint(1, 5), positions)
+                if rng.random() < 0.5:
+                    pool.external_update_bulk(batch, fetch_missing=False)
+                else:
+                    for block_number, update in batch:
+                        pool.external_update(
+                            update,
+                            block_number=block_number,
+                            fetch_missing=False,
+                        )
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_liquidity_change_override_state(seed):
+    """
+    Layer random Mint and Burn overlays with `get_liquidity_change_override_state`,
+    and compare quotes made with the overlay against quotes from a copy of the
+    pool with the same changes applied by `external_update`. The pool itself must
+    not be modified by the overlays.
+    """
+
+    rng = random.Random(seed)
+
+    for _ in range(15):
+        pool_seed = rng.getrandbits(64)
+        pool = make_pool(
+            random.Random(pool_seed),
+            compact_tick_storage=rng.random() < 0.5,
+            concurrent_readers=rng.random() < 0.5,
+        )
+        pool_copy = make_pool(random.Random(pool_seed))
+        expected_state = pool_state(pool)
+
+        override_state = None
+        positions: List[list] = []
+        for _ in range(rng.randint(1, 5)):
+            while True:
+                ((_, update),) = random_updates(rng, pool, 1, positions)
+                if "liquidity_change" in update:
+                    break
+            override_state = pool.get_liquidity_change_override_state(
+                *update["liquidity_change"], override_state
+            )
+            pool_copy.external_update(
+                {"liquidity_change": update["liquidity_change"]},
+                block_number=pool_copy.update_block,
+                fetch_missing=False,
+            )
+
+        check_pool_state(pool, expected_state, "liquidity change overlay")
+        requests = random_requests(rng, 50)
+        check_quotes(
+            pool,
+            requests,
+            [quote(pool_copy, request) for request in requests],
+            "liquidity change overlay",
+            override_state,
+        )
+
+
+def test_liquidity_change_override_state_fetches_missing_word(monkeypatch):
+    """
+    A word missing from a sparse bitmap is fetched into the overlays, and not
+    stored in the pool
+    """
+
+    chain_pool = make_pool(random.Random(1))
+    pool = make_pool(random.Random(1))
+    word = TickBitmap.position(pool.tick // pool.tick_spacing)[0]
+
+    class PoolContract:
+        def tickBitmap(self, word_position, block_identifier=None):
+            return chain_pool.tick_bitmap[word_position]["bitmap"]
+
+    class LensContract:
+        def getPopulatedTicksInWord(
+            self, address, word_position, block_identifier=None
+        ):
+            return [
+                (tick, values["liquidityNet"], values["liquidityGross"])
+                for tick, values in chain_pool.tick_data.items()
+                if TickBitmap.position(tick // pool.tick_spacing)[0]
+                == word_position
+            ]
+
+    class Lens:
+        _brownie_contract = LensContract()
+
+    class Chain:
+        height = 1
+
+    monkeypatch.setattr(v3_liquidity_pool, "chain", Chain())
+    pool._brownie_contract = PoolContract()
+    pool.lens = Lens()
+
+    # drop the word holding the current tick, as if it were never fetched
+    pool.tick_bitmap["sparse"] = True
+    del pool.tick_bitmap[word]
+    for tick in list(pool.tick_data):
+        if TickBitmap.position(tick // pool.tick_spacing)[0] == word:
+            del pool.tick_data[tick]
+    pool._rebuild_initialized_ticks()
+    pool._rebuild_liquidity_net()
+    expected_state = pool_state(pool)
+
+    lower = (pool.tick // pool.tick_spacing - 2) * pool.tick_spacing
+    upper = lower + 5 * pool.tick_spacing
+    override_state = pool.get_liquidity_change_override_state(
+        10**20, lower, upper
+    )
+    assert word in override_state["tick_bitmap"]
+    check_pool_state(pool, expected_state, "liquidity change overlay")
+
+    chain_pool.external_update(
+        {"liquidity_change": (10**20, lower, upper)},
+        block_number=1,
+        fetch_missing=False,
+    )
+    # quotes small enough to stay inside the fetched word
+    requests = [
+        (token, exact_input, 10**12)
+        for token in (chain_pool.token0, chain_pool.token1)
+        for exact_input in (True, False)
+    ]
+    check_quotes(
+        pool,
+        requests,
+        [quote(chain_pool, request) for request in requests],
+        "liquidity change overlay",
+        override_state,
+    )
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_reader_views(seed):
+    """
+    Apply the same random updates, snapshots and restores to a concurrent-reader
+    pool and to a plain copy, and compare the published reader view with the copy
+    after each step. The state of each view and quotes through it are recorded,
+    and checked again at the end to confirm that later updates never changed a
+    view.
+    """
+
+    rng = random.Random(seed)
+
+    for _ in range(5):
+        pool_seed = rng.getrandbits(64)
+        compact_tick_storage = rng.random() < 0.5
+        pool = make_pool(
+            random.Random(pool_seed),
+            compact_tick_storage=compact_tick_storage,
+            concurrent_readers=True,
+        )
+        pool_copy = make_pool(
+            random.Random(pool_seed),
+            compact_tick_storage=compact_tick_storage,
+        )
+        positions: List[list] = []
+        snapshots: List[tuple] = []
+        views: List[tuple] = []
+
+        for step in range(30):
+            action = rng.random()
+            if action < 0.15:
+                snapshots.append(
+                    (
+                        pool.snapshot(),
+                        pool_copy.snapshot(),
+                        [list(position) for position in positions],
+                    )
+                )
+            elif action < 0.3 and snapshots:
+                i = rng.randrange(len(snapshots))
+                token, copy_token, positions = snapshots[i]
+                del snapshots[i:]
+                pool.restore(token)
+                pool_copy.restore(copy_token)
+            else:
+                batch = random_updates(rng, pool, rng.randint(1, 5), positions)
+                pool.external_update_bulk(batch, fetch_missing=False)
+                pool_copy.external_update_bulk(batch, fetch_missing=False)
+
+            view = pool.get_reader()
+            description = f"reader view at step {step}"
+            state = pool_state(pool_copy)
+            check_pool_state(view, state, description)
+            requests = random_requests(rng, 20)
+            expected = [quote(pool_copy, request) for request in requests]
+            # the pool delegates its quotes to the current view
+            check_quotes(view, requests, expected, description)
+            check_quotes(pool, requests, expected, description)
+            views.append((view, state, requests, expected, description))
+
+        for view, state, requests, expected, description in views:
+            description = f"earlier {description}"
+            check_pool_state(view, state, description)
+            check_quotes(view, requests, expected, description)
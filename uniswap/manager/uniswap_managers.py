@@ -1,7 +1,7 @@
 from threading import Lock
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from brownie import Contract, chain  # type: ignore
+from brownie import Contract, chain, multicall  # type: ignore
 from web3 import Web3
 
 from alex_bot.constants import ZERO_ADDRESS
@@ -13,6 +13,17 @@ from alex_bot.uniswap.v2.abi import UNISWAPV2_FACTORY_ABI
 from alex_bot.uniswap.v2.liquidity_pool import LiquidityPool
 from alex_bot.uniswap.v3.abi import UNISWAP_V3_FACTORY_ABI
 from alex_bot.uniswap.v3.functions import generate_v3_pool_address
+from alex_bot.uniswap.v3.liquidity_events import (
+    LiquidityEvent,
+    build_tick_bitmap,
+    build_tick_data,
+    get_liquidity_events,
+)
+from alex_bot.uniswap.v3.tick_cache import (
+    V3TickCache,
+    get_tick_data_block,
+    replay_liquidity_events,
+)
 from alex_bot.uniswap.v3.tick_lens import TickLens
 from alex_bot.uniswap.v3.v3_liquidity_pool import V3LiquidityPool
 
@@ -357,3 +368,453 @@ class UniswapV3LiquidityPoolManager(UniswapLiquidityPoolManager):
                 self._pools_by_tokens_and_fee[dict_key] = pool_helper
 
         return pool_helper
+
+    def prefetch_tick_words(
+        self,
+        pools: Optional[Iterable[V3LiquidityPool]] = None,
+        block_number: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> Dict[str, int]:
+        """
+        Fetch the missing tick bitmap words (and the populated ticks inside them) around
+        the current tick of many pools at once, pinned to a single block.
+
+        Each pool would otherwise fetch its own words through `_update_tick_data_at_word`,
+        with two `multicall` round trips per pool. Here the bitmaps for all pools are
+        retrieved in multicall batches of up to `batch_size` calls, followed by the
+        populated ticks for all non-empty words, and the results are then distributed
+        to the pools.
+
+        Pools default to all pools tracked by the manager. Pools built from a complete
+        snapshot (non-sparse bitmap) are skipped.
+
+        Returns a dictionary with the number of pools and words fetched, and the number of
+        batched calls (round trips) made.
+        """
+
+        if pools is None:
+            with self._lock:
+                pools = list(self._pools_by_address.values())
+
+        if block_number is None:
+            block_number = chain.height
+
+        requests: List[Tuple[V3LiquidityPool, int]] = [
+            (pool, word)
+            for pool in pools
+            if pool.tick_bitmap["sparse"]
+            for word in sorted(pool._get_missing_tick_words())
+        ]
+
+        round_trips = 0
+
+        # fetch the tick bitmaps for all words
+        tick_bitmaps: Dict[Tuple[V3LiquidityPool, int], int] = {}
+        for i in range(0, len(requests), batch_size):
+            batch = requests[i : i + batch_size]
+            with multicall(block_identifier=block_number):
+                results = [
+                    pool._brownie_contract.tickBitmap(word)
+                    for pool, word in batch
+                ]
+            round_trips += 1
+            tick_bitmaps.update(zip(batch, results))
+
+        # fetch the populated ticks for the non-empty words
+        populated_words = [
+            request for request, bitmap in tick_bitmaps.items() if bitmap
+        ]
+        populated_ticks: Dict[Tuple[V3LiquidityPool, int], list] = {}
+        for i in range(0, len(populated_words), batch_size):
+            batch = populated_words[i : i + batch_size]
+            with multicall(block_identifier=block_number):
+                results = [
+                    self._lens._brownie_contract.getPopulatedTicksInWord(
+                        pool.address,
+                        word,
+                    )
+                    for pool, word in batch
+                ]
+            round_trips += 1
+            populated_ticks.update(zip(batch, results))
+
+        # distribute the results to the pools
+        words_by_pool: Dict[V3LiquidityPool, List[int]] = {}
+        for pool, word in requests:
+            words_by_pool.setdefault(pool, []).append(word)
+
+        for pool, words in words_by_pool.items():
+            with pool.tick_lock:
+                # skip any word retrieved by the pool in the meantime
+                words = [
+                    word for word in words if word not in pool.tick_bitmap
+                ]
+                if not words:
+                    continue
+                pool._store_tick_words(
+                    {
+                        word: {
+                            "bitmap": tick_bitmaps[pool, word],
+                            "block": block_number,
+                        }
+                        for word in words
+                    },
+                    {
+                        tick: {
+                            "liquidityNet": liquidity_net,
+                            "liquidityGross": liquidity_gross,
+                            "block": block_number,
+                        }
+                        for word in words
+                        for (
+                            tick,
+                            liquidity_net,
+                            liquidity_gross,
+                        ) in populated_ticks.get((pool, word), [])
+                    },
+                    block_number,
+                )
+
+        return {
+            "pools": len(words_by_pool),
+            "words": len(requests),
+            "round_trips": round_trips,
+        }
+
+    def save_pools_to_tick_cache(
+        self,
+        cache: V3TickCache,
+        pools: Optional[Iterable[V3LiquidityPool]] = None,
+    ) -> int:
+        """
+        Append the state of the given pools (default: all pools tracked by the manager)
+        to the tick cache. Returns the number of pools saved.
+        """
+
+        if pools is None:
+            with self._lock:
+                pools = list(self._pools_by_address.values())
+        else:
+            pools = list(pools)
+
+        cache.save_pools(pools)
+        return len(pools)
+
+    def load_pools_from_tick_cache(
+        self,
+        cache: V3TickCache,
+        pool_addresses: Optional[Iterable[str]] = None,
+        block_number: Optional[int] = None,
+        silent: bool = True,
+        batch_size: int = 500,
+        **kwargs,
+    ) -> Dict[str, int]:
+        """
+        Build pools from the tick cache instead of fetching their state from the chain,
+        catching up by replaying the Mint and Burn events emitted by each pool up to
+        `block_number` (default: the current block) that its tick data is missing.
+
+        Each tick is caught up from its own block tag (or its bitmap word's), so the
+        data of a pool updated by polling, which is only current at the blocks its
+        words were fetched, is brought up to date too. The events are applied to the
+        records before the pools are built.
+
+        Each pool is built from the recorded tokens, tick spacing, liquidity, price and
+        tick, so no calls are made to the pool contracts. Token helpers are shared by
+        all pools and built once per token. The liquidity, price and tick of all pools
+        are then refreshed at `block_number` by `refresh_pools`, in multicall batches of
+        up to `batch_size` calls.
+
+        Pools default to all pools held in the cache. Pools already tracked by the
+        manager are left unchanged.
+
+        Returns a dictionary with the number of pools loaded, liquidity events replayed,
+        and batched calls (round trips) made by the refresh.
+        """
+
+        if pool_addresses is None:
+            pool_addresses = cache.addresses()
+
+        if block_number is None:
+            block_number = chain.height
+
+        records: Dict[str, dict] = {}
+        for pool_address in pool_addresses:
+            pool_address = Web3.toChecksumAddress(pool_address)
+            if pool_address in self._pools_by_address:
+                continue
+            record = cache.load(pool_address)
+            if record is not None:
+                records[pool_address] = record
+
+        if not records:
+            return {"pools": 0, "events": 0, "round_trips": 0}
+
+        events: Dict[str, List[LiquidityEvent]] = {}
+        for event in get_liquidity_events(
+            pool_addresses=records,
+            from_block=min(
+                get_tick_data_block(record) for record in records.values()
+            )
+            + 1,
+            to_block=block_number,
+        ):
+            events.setdefault(event.address, []).append(event)
+
+        replayed = sum(
+            replay_liquidity_events(records[pool_address], pool_events)
+            for pool_address, pool_events in events.items()
+        )
+
+        pools: List[V3LiquidityPool] = []
+        for pool_address, record in records.items():
+            try:
+                tokens = [
+                    self._token_manager.get_erc20token(
+                        address=token_address,
+                        min_abi=True,
+                        silent=silent,
+                        unload_brownie_contract_after_init=True,
+                    )
+                    for token_address in (record["token0"], record["token1"])
+                ]
+            except Erc20TokenError:
+                raise ManagerError("Could not build Erc20Token helpers")
+            pool = self.get_pool(
+                pool_address=pool_address,
+                silent=silent,
+                fee=record["fee"],
+                tokens=tokens,
+                tick_spacing=record["tick_spacing"],
+                tick_bitmap=record["tick_bitmap"],
+                tick_data=record["tick_data"],
+                state={
+                    "block": record["block"],
+                    "liquidity": record["liquidity"],
+                    "sqrt_price_x96": record["sqrt_price_x96"],
+                    "tick": record["tick"],
+                },
+                **kwargs,
+            )
+            # the constructor marks a supplied bitmap as complete, so restore
+            # the flag to allow missing words to be fetched for sparse pools
+            pool.tick_bitmap["sparse"] = record["sparse"]
+            pools.append(pool)
+
+        # the price and tick of a pool built from a record are only valid at
+        # the record block
+        refresh = self.refresh_pools(
+            pools=pools,
+            block_number=block_number,
+            batch_size=batch_size,
+        )
+
+        return {
+            "pools": len(pools),
+            "events": replayed,
+            "round_trips": refresh["round_trips"],
+        }
+
+    def build_pools_from_liquidity_events(
+        self,
+        events: Iterable[LiquidityEvent],
+        block_number: int,
+        pool_addresses: Optional[Iterable[str]] = None,
+        catch_up: bool = True,
+        silent: bool = True,
+        **kwargs,
+    ) -> Dict[str, int]:
+        """
+        Build pools with complete tick maps reconstructed from their Mint and Burn
+        event history, instead of fetching bitmap words and populated ticks from the
+        chain. The resulting tick bitmaps are not sparse, so swap calculations never
+        need to fetch a word.
+
+        `events` may come from any log provider, e.g. `read_liquidity_events` for a
+        local log file or `get_liquidity_events` for an RPC node, and must cover every
+        event emitted by the pools up to `block_number`, in chain order. The events are
+        consumed in a single pass, and events for pools outside `pool_addresses`
+        (default: all pools found in the events) are ignored.
+
+        Pools already tracked by the manager are left unchanged. If `catch_up` is set,
+        events emitted after `block_number` are then retrieved from the chain and
+        replayed, and each pool is updated to the current block with `auto_update`.
+
+        Returns a dictionary with the number of pools built, initialized ticks found,
+        and liquidity events replayed by the catch-up.
+        """
+
+        if pool_addresses is not None:
+            pool_addresses = [
+                Web3.toChecksumAddress(pool_address)
+                for pool_address in pool_addresses
+            ]
+
+        tick_data_by_pool = build_tick_data(
+            events,
+            pool_addresses=pool_addresses,
+        )
+        if pool_addresses is not None:
+            for pool_address in pool_addresses:
+                tick_data_by_pool.setdefault(pool_address, {})
+
+        pools: Dict[str, V3LiquidityPool] = {}
+        for pool_address, tick_data in tick_data_by_pool.items():
+            if pool_address in self._pools_by_address:
+                continue
+            # an empty bitmap marks the tick maps as complete, and prevents
+            # the constructor from fetching the current word
+            pool = self.get_pool(
+                pool_address=pool_address,
+                silent=silent,
+                tick_bitmap={},
+                tick_data={},
+                **kwargs,
+            )
+            with pool.tick_lock:
+                pool._store_tick_words(
+                    build_tick_bitmap(
+                        tick_data, pool.tick_spacing, block_number
+                    ),
+                    tick_data,
+                    block_number,
+                )
+            pools[pool_address] = pool
+
+        catch_up_events = 0
+        if catch_up and pools:
+            catch_up_events, _ = self._catch_up_liquidity_events(
+                pools=pools,
+                from_blocks={
+                    pool_address: block_number for pool_address in pools
+                },
+            )
+
+        return {
+            "pools": len(pools),
+            "ticks": sum(
+                len(tick_data_by_pool[pool_address]) for pool_address in pools
+            ),
+            "catch_up_events": catch_up_events,
+        }
+
+    def refresh_pools(
+        self,
+        pools: Optional[Iterable[V3LiquidityPool]] = None,
+        block_number: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> Dict[str, int]:
+        """
+        Refresh the liquidity, price and tick of many pools at once, pinned to a single
+        block. This has the same effect as calling `auto_update` for each pool, which
+        would make two calls per pool, but the values are retrieved in multicall batches
+        of up to `batch_size` calls.
+
+        Pools default to all pools tracked by the manager. Pools updated beyond
+        `block_number` (default: the current block) in the meantime are skipped.
+
+        Returns a dictionary with the number of pools refreshed and changed, and the
+        number of batched calls (round trips) made.
+        """
+
+        if pools is None:
+            with self._lock:
+                pools = list(self._pools_by_address.values())
+        else:
+            pools = list(pools)
+
+        if block_number is None:
+            block_number = chain.height
+
+        round_trips = 0
+        results = []
+        # each pool needs two calls
+        pools_per_batch = max(1, batch_size // 2)
+        for i in range(0, len(pools), pools_per_batch):
+            batch = pools[i : i + pools_per_batch]
+            with multicall(block_identifier=block_number):
+                slot0_results = [
+                    pool._brownie_contract.slot0() for pool in batch
+                ]
+                liquidity_results = [
+                    pool._brownie_contract.liquidity() for pool in batch
+                ]
+            round_trips += 1
+            results.extend(zip(batch, slot0_results, liquidity_results))
+
+        refreshed = updated = 0
+        for pool, (sqrt_price_x96, tick, *_), liquidity in results:
+            with pool.update_lock:
+                if block_number < pool.update_block:
+                    continue
+                if pool._apply_slot0_and_liquidity(
+                    block_number, sqrt_price_x96, tick, liquidity
+                ):
+                    updated += 1
+                refreshed += 1
+
+        return {
+            "pools": refreshed,
+            "updated": updated,
+            "round_trips": round_trips,
+        }
+
+    def _catch_up_liquidity_events(
+        self,
+        pools: Dict[str, V3LiquidityPool],
+        from_blocks: Dict[str, int],
+        block_number: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> Tuple[int, int]:
+        """
+        Replay the Mint and Burn events emitted by each pool after its block in
+        `from_blocks`, then refresh the pools at `block_number` (default: the current
+        block) with `refresh_pools`.
+
+        Returns the number of events replayed, and the number of batched calls made by
+        the refresh.
+        """
+
+        # pools built from the chain retrieved their liquidity and slot0 values at
+        # their own construction block, so catch up all pools to a single block
+        if block_number is None:
+            block_number = chain.height
+
+        updates: Dict[str, List[Tuple[int, dict]]] = {}
+        for event in get_liquidity_events(
+            pool_addresses=pools,
+            from_block=min(from_blocks.values()) + 1,
+            to_block=block_number,
+        ):
+            if event.block_number <= from_blocks[event.address]:
+                continue
+            updates.setdefault(event.address, []).append(
+                (
+                    event.block_number,
+                    {
+                        "liquidity_change": (
+                            event.liquidity_delta,
+                            event.tick_lower,
+                            event.tick_upper,
+                        )
+                    },
+                )
+            )
+
+        for pool_address, pool_updates in updates.items():
+            # force the update, since the construction block of a pool built
+            # from the chain is later than the events
+            pools[pool_address].external_update_bulk(pool_updates, force=True)
+
+        # the liquidity retrieved at construction already includes the events
+        # replayed above, so refresh the liquidity, price and tick together
+        refresh = self.refresh_pools(
+            pools=pools.values(),
+            block_number=block_number,
+            batch_size=batch_size,
+        )
+
+        return (
+            sum(len(pool_updates) for pool_updates in updates.values()),
+            refresh["round_trips"],
+        )
@@ -1,6 +1,7 @@
 from decimal import Decimal
 from fractions import Fraction
-from typing import List, Optional, Tuple, Union
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union
 
 from brownie import Contract, Wei, chain  # type: ignore
 from eth_typing import ChecksumAddress
@@ -17,6 +18,17 @@ from alex_bot.uniswap.v2.abi import UNISWAPV2_LP_ABI
 from alex_bot.uniswap.v2.functions import generate_v2_pool_address
 from alex_bot.uniswap.v2.router import Router
 
+# mutable attributes saved by `LiquidityPool.snapshot`
+_SNAPSHOT_ATTRIBUTES = (
+    "reserves_token0",
+    "reserves_token1",
+    "new_reserves",
+    "update_block",
+    "state",
+    "token0_max_swap",
+    "token1_max_swap",
+)
+
 
 class LiquidityPool:
     def __init__(
@@ -117,6 +129,12 @@ class LiquidityPool:
         self.new_reserves = False
         self.update_block = chain.height
 
+        self.update_lock = Lock()
+
+        # (token, saved attributes) for each snapshot held, oldest first
+        self._snapshots: List[Tuple[int, Dict[str, object]]] = []
+        self._snapshot_counter = 0
+
         if abi is None:
             abi = UNISWAPV2_LP_ABI
 
@@ -216,6 +234,9 @@ class LiquidityPool:
             # memory saving if LP contract object is not used after initialization
             self._contract = None
 
+        # incremented whenever the reserves change (including a restore), so
+        # consumers can detect changes by comparing a single integer
+        self.state_version = 0
         self.state: dict = {}
         self._update_pool_state()
 
@@ -232,10 +253,18 @@ class LiquidityPool:
     def __getstate__(self):
         state = self.__dict__.copy()
         state["_contract"] = None
+        state["update_lock"] = None
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
+        self.update_lock = Lock()
+        # objects pickled before snapshots were added
+        if "_snapshots" not in state:
+            self._snapshots = []
+            self._snapshot_counter = 0
+        if "state_version" not in state:
+            self.state_version = 0
 
     def __eq__(self, other) -> bool:
         return self.address == other.address
@@ -251,6 +280,53 @@ class LiquidityPool:
             "reserves_token0": self.reserves_token0,
             "reserves_token1": self.reserves_token1,
         }
+        self.state_version += 1
+
+    def snapshot(self) -> int:
+        """
+        Save the current pool state and return a token for `restore`, so speculative
+        updates (e.g. `update_reserves` with the reserves expected after a pending
+        transaction) can be reverted. The V2 state is a handful of values, so they
+        are saved directly instead of journaling each change.
+        """
+        with self.update_lock:
+            self._snapshot_counter += 1
+            self._snapshots.append(
+                (
+                    self._snapshot_counter,
+                    {
+                        name: getattr(self, name)
+                        for name in _SNAPSHOT_ATTRIBUTES
+                        if hasattr(self, name)
+                    },
+                )
+            )
+            return self._snapshot_counter
+
+    def restore(self, token: int) -> None:
+        """
+        Revert the pool state to the snapshot identified by `token`. Snapshots
+        taken after it are released.
+        """
+        with self.update_lock:
+            for i, (snapshot_token, saved_attributes) in enumerate(
+                self._snapshots
+            ):
+                if snapshot_token == token:
+                    break
+            else:
+                raise LiquidityPoolError(f"Invalid snapshot token {token}")
+
+            del self._snapshots[i:]
+
+            for name in _SNAPSHOT_ATTRIBUTES:
+                if name in saved_attributes:
+                    setattr(self, name, saved_attributes[name])
+                elif hasattr(self, name):
+                    delattr(self, name)
+
+            # the version is not saved, so it never repeats
+            self.state_version += 1
 
     def calculate_tokens_in_from_ratio_out(self) -> None:
         """
@@ -639,109 +715,110 @@ class LiquidityPool:
         if set to "external" assumes that provided reserves are valid
         """
 
-        success = False
-
-        # get the chain height from Brownie if a specific update_block is not provided
-        if update_block is None:
-            update_block = chain.height
+        with self.update_lock:
+            success = False
 
-        # discard stale updates, but allow updating the same pool multiple times per block (necessary if sending sync events individually)
-        if update_block < self.update_block:
-            raise ExternalUpdateError(
-                f"Current state recorded at block {self.update_block}, received update for stale block {update_block}"
-            )
-        else:
-            self.update_block = update_block
+            # get the chain height from Brownie if a specific update_block is not provided
+            if update_block is None:
+                update_block = chain.height
 
-        if (
-            self._update_method == "polling"
-            or override_update_method == "polling"
-        ):
-            try:
-                reserves0, reserves1, *_ = self._contract.getReserves(
-                    block_identifier=self.update_block
-                )
-                # Compare reserves to last-known values,
-                # store and (optionally) print the reserves if they have changed
-                if (self.reserves_token0, self.reserves_token1) != (
-                    reserves0,
-                    reserves1,
-                ):
-                    self.reserves_token0, self.reserves_token1 = (
-                        reserves0,
-                        reserves1,
-                    )
-                    if not silent:
-                        print(f"[{self.name}]")
-                        if print_reserves:
-                            print(f"{self.token0}: {self.reserves_token0}")
-                            print(f"{self.token1}: {self.reserves_token1}")
-                        if print_ratios:
-                            print(
-                                f"{self.token0}/{self.token1}: {(self.reserves_token0/10**self.token0.decimals) / (self.reserves_token1/10**self.token1.decimals)}"
-                            )
-                            print(
-                                f"{self.token1}/{self.token0}: {(self.reserves_token1/10**self.token1.decimals) / (self.reserves_token0/10**self.token0.decimals)}"
-                            )
-
-                    # recalculate possible swaps using the new reserves
-                    self.calculate_tokens_in_from_ratio_out()
-                    self._update_pool_state()
-                    success = True
-                else:
-                    success = False
-            except Exception as e:
-                print(
-                    f"LiquidityPool: Exception in update_reserves (polling): {e}"
-                )
-        elif self._update_method == "external":
-            if not (
-                (
-                    external_token0_reserves is not None
-                    and external_token1_reserves is not None
-                )
-            ):
-                raise ValueError(
-                    "Called update_reserves without providing reserve values for both tokens!"
+            # discard stale updates, but allow updating the same pool multiple times per block (necessary if sending sync events individually)
+            if update_block < self.update_block:
+                raise ExternalUpdateError(
+                    f"Current state recorded at block {self.update_block}, received update for stale block {update_block}"
                 )
+            else:
+                self.update_block = update_block
 
-            # skip follow-up processing if the LP object already has the latest reserves, or if no reserves were provided
             if (
-                external_token0_reserves == self.reserves_token0
-                and external_token1_reserves == self.reserves_token1
+                self._update_method == "polling"
+                or override_update_method == "polling"
             ):
-                self.new_reserves = False
-                success = False
-            else:
-                self.reserves_token0 = external_token0_reserves
-                self.reserves_token1 = external_token1_reserves
-                self.new_reserves = True
-                self._update_pool_state()
-
-            if not silent:
-                print(f"[{self.name}]")
-                if print_reserves:
-                    print(f"{self.token0}: {self.reserves_token0}")
-                    print(f"{self.token1}: {self.reserves_token1}")
-                if print_ratios:
-                    print(
-                        f"{self.token0}/{self.token1}: {self.reserves_token0 / self.reserves_token1}"
+                try:
+                    reserves0, reserves1, *_ = self._contract.getReserves(
+                        block_identifier=self.update_block
                     )
+                    # Compare reserves to last-known values,
+                    # store and (optionally) print the reserves if they have changed
+                    if (self.reserves_token0, self.reserves_token1) != (
+                        reserves0,
+                        reserves1,
+                    ):
+                        self.reserves_token0, self.reserves_token1 = (
+                            reserves0,
+                            reserves1,
+                        )
+                        if not silent:
+                            print(f"[{self.name}]")
+                            if print_reserves:
+                                print(f"{self.token0}: {self.reserves_token0}")
+                                print(f"{self.token1}: {self.reserves_token1}")
+                            if print_ratios:
+                                print(
+                                    f"{self.token0}/{self.token1}: {(self.reserves_token0/10**self.token0.decimals) / (self.reserves_token1/10**self.token1.decimals)}"
+                                )
+                                print(
+                                    f"{self.token1}/{self.token0}: {(self.reserves_token1/10**self.token1.decimals) / (self.reserves_token0/10**self.token0.decimals)}"
+                                )
+
+                        # recalculate possible swaps using the new reserves
+                        self.calculate_tokens_in_from_ratio_out()
+                        self._update_pool_state()
+                        success = True
+                    else:
+                        success = False
+                except Exception as e:
                     print(
-                        f"{self.token1}/{self.token0}: {self.reserves_token1 / self.reserves_token0}"
+                        f"LiquidityPool: Exception in update_reserves (polling): {e}"
                     )
-            self.calculate_tokens_in_from_ratio_out()
-            success = True
-        elif self._update_method == "event":
-            raise DeprecationError(
-                "***"
-                "DEPRECATION WARNING: the 'event' update method is deprecated. Please update your bot to use the default 'polling' method"
-                "***"
-            )
-        else:
-            success = False
+            elif self._update_method == "external":
+                if not (
+                    (
+                        external_token0_reserves is not None
+                        and external_token1_reserves is not None
+                    )
+                ):
+                    raise ValueError(
+                        "Called update_reserves without providing reserve values for both tokens!"
+                    )
+
+                # skip follow-up processing if the LP object already has the latest reserves, or if no reserves were provided
+                if (
+                    external_token0_reserves == self.reserves_token0
+                    and external_token1_reserves == self.reserves_token1
+                ):
+                    self.new_reserves = False
+                    success = False
+                else:
+                    self.reserves_token0 = external_token0_reserves
+                    self.reserves_token1 = external_token1_reserves
+                    self.new_reserves = True
+                    self._update_pool_state()
+
+                if not silent:
+                    print(f"[{self.name}]")
+                    if print_reserves:
+                        print(f"{self.token0}: {self.reserves_token0}")
+                        print(f"{self.token1}: {self.reserves_token1}")
+                    if print_ratios:
+                        print(
+                            f"{self.token0}/{self.token1}: {self.reserves_token0 / self.reserves_token1}"
+                        )
+                        print(
+                            f"{self.token1}/{self.token0}: {self.reserves_token1 / self.reserves_token0}"
+                        )
+                self.calculate_tokens_in_from_ratio_out()
+                success = True
+            elif self._update_method == "event":
+                raise DeprecationError(
+                    "***"
+                    "DEPRECATION WARNING: the 'event' update method is deprecated. Please update your bot to use the default 'polling' method"
+                    "***"
+                )
+            else:
+                success = False
 
-        return success
+            return success
 
 
 class CamelotLiquidityPool(LiquidityPool):
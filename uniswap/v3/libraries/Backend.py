@@ -0,0 +1,179 @@
+"""
+Process-wide selection of the math backend used by the V3 libraries.
+
+The "reference" backend is the Solidity-faithful port. The "fast" backend
+replaces the same functions with the implementations in FastMath, which are
+built on Python int intrinsics. Switching rebinds the module attributes, so
+callers using module lookups (e.g. `TickMath.getSqrtRatioAtTick(...)`) pick
+up the active backend without any changes.
+
+Select the backend once at startup, before any pool helpers begin calculating
+swaps.
+
+`set_tick_cache` adds a process-wide LRU cache in front of
+`TickMath.getSqrtRatioAtTick` for the active backend. Every pool converts the
+same initialized ticks to prices, so the cache is shared by all of them.
+"""
+
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from . import (
+    BitMath,
+    FastMath,
+    FullMath,
+    LiquidityMath,
+    SqrtPriceMath,
+    SwapMath,
+    TickBitmap,
+    TickMath,
+    UnsafeMath,
+)
+
+_FUNCTIONS = {
+    BitMath: (
+        "mostSignificantBit",
+        "leastSignificantBit",
+    ),
+    FullMath: (
+        "mulDiv",
+        "mulDivRoundingUp",
+    ),
+    LiquidityMath: ("addDelta",),
+    SqrtPriceMath: (
+        "getAmount0Delta",
+        "getAmount1Delta",
+        "getNextSqrtPriceFromAmount0RoundingUp",
+        "getNextSqrtPriceFromAmount1RoundingDown",
+        "getNextSqrtPriceFromInput",
+        "getNextSqrtPriceFromOutput",
+    ),
+    SwapMath: ("computeSwapStep",),
+    TickBitmap: (
+        "flipTick",
+        "nextInitializedTickWithinOneWord",
+        "position",
+    ),
+    TickMath: (
+        "getSqrtRatioAtTick",
+        "getTickAtSqrtRatio",
+    ),
+    UnsafeMath: ("divRoundingUp",),
+}
+
+# capture the reference implementations before any backend is installed
+_BACKENDS: Dict[str, Dict[Tuple[object, str], Callable]] = {
+    "reference": {
+        (module, name): getattr(module, name)
+        for module, names in _FUNCTIONS.items()
+        for name in names
+    },
+    "fast": {
+        (module, name): getattr(FastMath, name)
+        for module, names in _FUNCTIONS.items()
+        for name in names
+    },
+}
+
+_active_backend = "reference"
+
+# maximum number of entries held by the getSqrtRatioAtTick cache, or None if
+# the cache is disabled
+_tick_cache_size: Optional[int] = None
+
+
+def get_backend() -> str:
+    """
+    Return the name of the active backend
+    """
+    return _active_backend
+
+
+def set_backend(backend: str) -> None:
+    """
+    Install the named backend ("reference" or "fast") into the library modules.
+    """
+    global _active_backend
+
+    if backend not in _BACKENDS:
+        raise ValueError(
+            f"Unknown backend {backend!r}, choose from {list(_BACKENDS)}"
+        )
+
+    for (module, name), function in _BACKENDS[backend].items():
+        _install(module, name, function)
+
+    _active_backend = backend
+
+    # wrap the incoming getSqrtRatioAtTick with a fresh cache
+    if _tick_cache_size is not None:
+        set_tick_cache(_tick_cache_size)
+
+
+def _install(module: object, name: str, function: Callable) -> None:
+    # the package re-exports most library functions with star imports, so
+    # rebind those names too if they still point to the outgoing function
+    package = sys.modules[__package__]
+
+    outgoing = getattr(module, name)
+    setattr(module, name, function)
+    if getattr(package, name, None) is outgoing:
+        setattr(package, name, function)
+
+
+def set_tick_cache(maxsize: Optional[int] = 65_536) -> None:
+    """
+    Cache up to `maxsize` results of `TickMath.getSqrtRatioAtTick` for the active
+    backend, discarding the least recently used entries first. Pass `None` to
+    remove the cache.
+
+    The cache is shared by every pool in the process, and is replaced by an empty
+    cache when the backend or size changes.
+    """
+    global _tick_cache_size
+
+    if maxsize is not None and maxsize <= 0:
+        raise ValueError(f"Cache size must be positive, got {maxsize}")
+
+    function = _BACKENDS[_active_backend][TickMath, "getSqrtRatioAtTick"]
+    if maxsize is not None:
+        function = lru_cache(maxsize=maxsize)(function)
+
+    _install(TickMath, "getSqrtRatioAtTick", function)
+    _tick_cache_size = maxsize
+
+
+def get_tick_cache_info() -> Dict[str, Union[int, float, None]]:
+    """
+    Return the hits, misses, current size, maximum size and hit rate of the
+    `getSqrtRatioAtTick` cache. All values are zero (`maxsize` None) if the cache
+    is disabled.
+    """
+
+    if _tick_cache_size is None:
+        return {
+            "hits": 0,
+            "misses": 0,
+            "size": 0,
+            "maxsize": None,
+            "hit_rate": 0.0,
+        }
+
+    info = TickMath.getSqrtRatioAtTick.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+    }
+
+
+def clear_tick_cache() -> None:
+    """
+    Empty the `getSqrtRatioAtTick` cache and reset its statistics
+    """
+    if _tick_cache_size is not None:
+        TickMath.getSqrtRatioAtTick.cache_clear()
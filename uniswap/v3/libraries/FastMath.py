@@ -0,0 +1,533 @@
+"""
+Alternative implementations of the V3 library functions, built on Python int
+intrinsics instead of the Solidity/Yul transliterations. Each function returns
+bit-for-bit identical results (and raises EVMRevertError on the same inputs)
+as the reference port it replaces.
+
+These are not called directly. Use `Backend.set_backend("fast")` to install
+them into the library modules.
+"""
+
+import math
+from typing import Optional, Tuple
+
+from alex_bot.exceptions import (
+    BitmapWordUnavailableError,
+    EVMRevertError,
+    MissingTickWordError,
+)
+from alex_bot.logging import logger
+
+from . import TickMath
+from .Helpers import (
+    MAX_INT128,
+    MAX_UINT128,
+    MAX_UINT160,
+    MAX_UINT256,
+    MIN_INT128,
+)
+from .TickMath import MAX_SQRT_RATIO, MAX_TICK, MIN_SQRT_RATIO, MIN_TICK
+
+_Q96 = 0x1000000000000000000000000
+_MAX_INT256_CAST = 2**255
+
+# getTickAtSqrtRatio estimates the tick as log_1.0001(price), where
+# price = (sqrtPriceX96 / 2**96)**2. The float estimate is accurate to ~1e-9
+# ticks, so it is only checked against getSqrtRatioAtTick when it lands within
+# _TICK_ESTIMATE_MARGIN of a tick boundary
+_LOG_Q96 = 96 * math.log(2)
+_TICKS_PER_LOG_SQRT_PRICE = 2 / math.log(1.0001)
+_TICK_ESTIMATE_MARGIN = 1e-6
+
+
+# BitMath
+
+
+def mostSignificantBit(x: int) -> int:
+    if x <= 0:
+        raise EVMRevertError("FAIL: x > 0")
+    return x.bit_length() - 1
+
+
+def leastSignificantBit(x: int) -> int:
+    if x <= 0:
+        raise EVMRevertError("FAIL: x > 0")
+    return (x & -x).bit_length() - 1
+
+
+# FullMath
+
+
+def mulDiv(a: int, b: int, denominator: int) -> int:
+    if not (0 <= a <= MAX_UINT256):
+        raise EVMRevertError(f"Invalid input, {a} does not fit into uint256")
+    if not (0 <= b <= MAX_UINT256):
+        raise EVMRevertError(f"Invalid input, {b} does not fit into uint256")
+    if denominator == 0:
+        raise EVMRevertError("DIVISION BY ZERO")
+
+    result = (a * b) // denominator
+    if not (0 <= result <= MAX_UINT256):
+        raise EVMRevertError("invalid result, will not fit in uint256")
+    return result
+
+
+def mulDivRoundingUp(a: int, b: int, denominator: int) -> int:
+    if not (0 <= a <= MAX_UINT256):
+        raise EVMRevertError(f"Invalid input, {a} does not fit into uint256")
+    if not (0 <= b <= MAX_UINT256):
+        raise EVMRevertError(f"Invalid input, {b} does not fit into uint256")
+    if denominator == 0:
+        raise EVMRevertError("DIVISION BY ZERO")
+
+    result, remainder = divmod(a * b, denominator)
+    if not (0 <= result <= MAX_UINT256):
+        raise EVMRevertError("invalid result, will not fit in uint256")
+    if remainder > 0:
+        # must be less than max uint256 since we're rounding up
+        if result == MAX_UINT256:
+            raise EVMRevertError("FAIL!")
+        result += 1
+    return result
+
+
+# UnsafeMath
+
+
+def divRoundingUp(x: int, y: int) -> int:
+    if y == 0:
+        return 0
+    quotient, remainder = divmod(x, y)
+    return quotient + 1 if remainder > 0 else quotient
+
+
+# LiquidityMath
+
+
+def addDelta(x: int, y: int) -> int:
+    if not (0 <= x <= MAX_UINT128):
+        raise EVMRevertError("x not a valid uint128")
+    if not (MIN_INT128 <= y <= MAX_INT128):
+        raise EVMRevertError("y not a valid int128")
+
+    z = x + y
+    if not (0 <= z <= MAX_UINT128):
+        raise EVMRevertError("LS" if y < 0 else "LA")
+    return z
+
+
+# TickMath
+
+
+def getSqrtRatioAtTick(tick: int) -> int:
+    absTick = -tick if tick < 0 else tick
+    if not (0 <= absTick <= MAX_TICK):
+        raise EVMRevertError("T")
+
+    ratio = (
+        0xFFFCB933BD6FAD37AA2D162D1A594001
+        if absTick & 0x1
+        else 0x100000000000000000000000000000000
+    )
+    if absTick & 0x2:
+        ratio = (ratio * 0xFFF97272373D413259A46990580E213A) >> 128
+    if absTick & 0x4:
+        ratio = (ratio * 0xFFF2E50F5F656932EF12357CF3C7FDCC) >> 128
+    if absTick & 0x8:
+        ratio = (ratio * 0xFFE5CACA7E10E4E61C3624EAA0941CD0) >> 128
+    if absTick & 0x10:
+        ratio = (ratio * 0xFFCB9843D60F6159C9DB58835C926644) >> 128
+    if absTick & 0x20:
+        ratio = (ratio * 0xFF973B41FA98C081472E6896DFB254C0) >> 128
+    if absTick & 0x40:
+        ratio = (ratio * 0xFF2EA16466C96A3843EC78B326B52861) >> 128
+    if absTick & 0x80:
+        ratio = (ratio * 0xFE5DEE046A99A2A811C461F1969C3053) >> 128
+    if absTick & 0x100:
+        ratio = (ratio * 0xFCBE86C7900A88AEDCFFC83B479AA3A4) >> 128
+    if absTick & 0x200:
+        ratio = (ratio * 0xF987A7253AC413176F2B074CF7815E54) >> 128
+    if absTick & 0x400:
+        ratio = (ratio * 0xF3392B0822B70005940C7A398E4B70F3) >> 128
+    if absTick & 0x800:
+        ratio = (ratio * 0xE7159475A2C29B7443B29C7FA6E889D9) >> 128
+    if absTick & 0x1000:
+        ratio = (ratio * 0xD097F3BDFD2022B8845AD8F792AA5825) >> 128
+    if absTick & 0x2000:
+        ratio = (ratio * 0xA9F746462D870FDF8A65DC1F90E061E5) >> 128
+    if absTick & 0x4000:
+        ratio = (ratio * 0x70D869A156D2A1B890BB3DF62BAF32F7) >> 128
+    if absTick & 0x8000:
+        ratio = (ratio * 0x31BE135F97D08FD981231505542FCFA6) >> 128
+    if absTick & 0x10000:
+        ratio = (ratio * 0x9AA508B5B7A84E1C677DE54F3E99BC9) >> 128
+    if absTick & 0x20000:
+        ratio = (ratio * 0x5D6AF8DEDB81196699C329225EE604) >> 128
+    if absTick & 0x40000:
+        ratio = (ratio * 0x2216E584F5FA1EA926041BEDFE98) >> 128
+    if absTick & 0x80000:
+        ratio = (ratio * 0x48A170391F7DC42444E8FA2) >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+
+    # Q128.128 -> Q128.96, rounding up
+    return (ratio >> 32) + (1 if ratio & 0xFFFFFFFF else 0)
+
+
+def getTickAtSqrtRatio(sqrtPriceX96: int) -> int:
+    if not (0 <= sqrtPriceX96 <= MAX_UINT160):
+        raise EVMRevertError("not a valid uint160")
+    if not (MIN_SQRT_RATIO <= sqrtPriceX96 < MAX_SQRT_RATIO):
+        raise EVMRevertError("R")
+
+    estimate = (
+        math.log(sqrtPriceX96) - _LOG_Q96
+    ) * _TICKS_PER_LOG_SQRT_PRICE
+    tick = math.floor(estimate)
+
+    if _TICK_ESTIMATE_MARGIN < estimate - tick < 1 - _TICK_ESTIMATE_MARGIN:
+        return tick
+
+    # close to a boundary, so find the greatest tick with a ratio at or
+    # below the price exactly. Look up the installed binding, which holds the
+    # tick cache if one is set
+    tick = min(max(tick, MIN_TICK), MAX_TICK - 1)
+    if TickMath.getSqrtRatioAtTick(tick) > sqrtPriceX96:
+        return tick - 1
+    if TickMath.getSqrtRatioAtTick(tick + 1) <= sqrtPriceX96:
+        return tick + 1
+    return tick
+
+
+# SqrtPriceMath
+
+
+def getAmount0Delta(
+    sqrtRatioAX96: int,
+    sqrtRatioBX96: int,
+    liquidity: int,
+    roundUp: Optional[bool] = None,
+) -> int:
+    if roundUp is None and not (0 <= liquidity <= MAX_UINT128):
+        # signed variant
+        if liquidity < 0:
+            return -getAmount0Delta(
+                sqrtRatioAX96, sqrtRatioBX96, -liquidity, False
+            )
+        result = getAmount0Delta(sqrtRatioAX96, sqrtRatioBX96, liquidity, True)
+        if result > _MAX_INT256_CAST:
+            raise EVMRevertError
+        return result
+
+    if sqrtRatioAX96 > sqrtRatioBX96:
+        sqrtRatioAX96, sqrtRatioBX96 = sqrtRatioBX96, sqrtRatioAX96
+
+    if not (sqrtRatioAX96 > 0):
+        raise EVMRevertError("require sqrtRatioAX96 > 0")
+
+    numerator1 = liquidity << 96
+    numerator2 = sqrtRatioBX96 - sqrtRatioAX96
+
+    if roundUp:
+        return divRoundingUp(
+            mulDivRoundingUp(numerator1, numerator2, sqrtRatioBX96),
+            sqrtRatioAX96,
+        )
+    return mulDiv(numerator1, numerator2, sqrtRatioBX96) // sqrtRatioAX96
+
+
+def getAmount1Delta(
+    sqrtRatioAX96: int,
+    sqrtRatioBX96: int,
+    liquidity: int,
+    roundUp: Optional[bool] = None,
+) -> int:
+    if roundUp is None and not (0 <= liquidity <= MAX_UINT128):
+        # signed variant
+        if liquidity < 0:
+            return -getAmount1Delta(
+                sqrtRatioAX96, sqrtRatioBX96, -liquidity, False
+            )
+        result = getAmount1Delta(sqrtRatioAX96, sqrtRatioBX96, liquidity, True)
+        if result > _MAX_INT256_CAST:
+            raise EVMRevertError
+        return result
+
+    if sqrtRatioAX96 > sqrtRatioBX96:
+        sqrtRatioAX96, sqrtRatioBX96 = sqrtRatioBX96, sqrtRatioAX96
+
+    if roundUp:
+        return mulDivRoundingUp(
+            liquidity, sqrtRatioBX96 - sqrtRatioAX96, _Q96
+        )
+    return mulDiv(liquidity, sqrtRatioBX96 - sqrtRatioAX96, _Q96)
+
+
+def getNextSqrtPriceFromAmount0RoundingUp(
+    sqrtPX96: int,
+    liquidity: int,
+    amount: int,
+    add: bool,
+) -> int:
+    # we short circuit amount == 0 because the result is otherwise not guaranteed to equal the input price
+    if amount == 0:
+        return sqrtPX96
+
+    numerator1 = liquidity << 96
+    product = amount * sqrtPX96
+
+    if add:
+        # Python integers cannot overflow, so the Solidity overflow check
+        # on `product` always passes
+        denominator = numerator1 + product
+        if denominator >= numerator1:
+            # always fits in 160 bits
+            return mulDivRoundingUp(numerator1, sqrtPX96, denominator)
+        return divRoundingUp(numerator1, numerator1 // sqrtPX96 + amount)
+
+    if not (numerator1 > product):
+        raise EVMRevertError(
+            "product / amount == sqrtPX96 && numerator1 > product"
+        )
+    result = mulDivRoundingUp(numerator1, sqrtPX96, numerator1 - product)
+    if result > MAX_UINT160:
+        raise EVMRevertError
+    return result
+
+
+def getNextSqrtPriceFromAmount1RoundingDown(
+    sqrtPX96: int,
+    liquidity: int,
+    amount: int,
+    add: bool,
+) -> int:
+    if add:
+        quotient = (
+            (amount << 96) // liquidity
+            if amount <= MAX_UINT160
+            else mulDiv(amount, _Q96, liquidity)
+        )
+        result = sqrtPX96 + quotient
+        if result > MAX_UINT160:
+            raise EVMRevertError
+        return result
+
+    quotient = (
+        divRoundingUp(amount << 96, liquidity)
+        if amount <= MAX_UINT160
+        else mulDivRoundingUp(amount, _Q96, liquidity)
+    )
+    if not (sqrtPX96 > quotient):
+        raise EVMRevertError("require sqrtPX96 > quotient")
+    # always fits 160 bits
+    return sqrtPX96 - quotient
+
+
+def getNextSqrtPriceFromInput(
+    sqrtPX96: int,
+    liquidity: int,
+    amountIn: int,
+    zeroForOne: bool,
+) -> int:
+    if not (sqrtPX96 > 0):
+        raise EVMRevertError("sqrtPX96 must be greater than 0")
+    if not (liquidity > 0):
+        raise EVMRevertError("liquidity must be greater than 0")
+
+    # round to make sure that we don't pass the target price
+    if zeroForOne:
+        return getNextSqrtPriceFromAmount0RoundingUp(
+            sqrtPX96, liquidity, amountIn, True
+        )
+    return getNextSqrtPriceFromAmount1RoundingDown(
+        sqrtPX96, liquidity, amountIn, True
+    )
+
+
+def getNextSqrtPriceFromOutput(
+    sqrtPX96: int,
+    liquidity: int,
+    amountOut: int,
+    zeroForOne: bool,
+) -> int:
+    if not (sqrtPX96 > 0):
+        raise EVMRevertError
+    if not (liquidity > 0):
+        raise EVMRevertError
+
+    # round to make sure that we pass the target price
+    if zeroForOne:
+        return getNextSqrtPriceFromAmount1RoundingDown(
+            sqrtPX96, liquidity, amountOut, False
+        )
+    return getNextSqrtPriceFromAmount0RoundingUp(
+        sqrtPX96, liquidity, amountOut, False
+    )
+
+
+# SwapMath
+
+
+def computeSwapStep(
+    sqrtRatioCurrentX96: int,
+    sqrtRatioTargetX96: int,
+    liquidity: int,
+    amountRemaining: int,
+    feePips: int,
+) -> Tuple[int, int, int, int]:
+    zeroForOne = sqrtRatioCurrentX96 >= sqrtRatioTargetX96
+    exactIn = amountRemaining >= 0
+
+    if exactIn:
+        amountRemainingLessFee = mulDiv(
+            amountRemaining, 10**6 - feePips, 10**6
+        )
+        amountIn = (
+            getAmount0Delta(
+                sqrtRatioTargetX96, sqrtRatioCurrentX96, liquidity, True
+            )
+            if zeroForOne
+            else getAmount1Delta(
+                sqrtRatioCurrentX96, sqrtRatioTargetX96, liquidity, True
+            )
+        )
+        if amountRemainingLessFee >= amountIn:
+            sqrtRatioNextX96 = sqrtRatioTargetX96
+        else:
+            sqrtRatioNextX96 = getNextSqrtPriceFromInput(
+                sqrtRatioCurrentX96,
+                liquidity,
+                amountRemainingLessFee,
+                zeroForOne,
+            )
+    else:
+        amountOut = (
+            getAmount1Delta(
+                sqrtRatioTargetX96, sqrtRatioCurrentX96, liquidity, False
+            )
+            if zeroForOne
+            else getAmount0Delta(
+                sqrtRatioCurrentX96, sqrtRatioTargetX96, liquidity, False
+            )
+        )
+        if -amountRemaining >= amountOut:
+            sqrtRatioNextX96 = sqrtRatioTargetX96
+        else:
+            sqrtRatioNextX96 = getNextSqrtPriceFromOutput(
+                sqrtRatioCurrentX96,
+                liquidity,
+                -amountRemaining,
+                zeroForOne,
+            )
+
+    max = sqrtRatioTargetX96 == sqrtRatioNextX96
+
+    # get the input/output amounts
+    if zeroForOne:
+        if not (max and exactIn):
+            amountIn = getAmount0Delta(
+                sqrtRatioNextX96, sqrtRatioCurrentX96, liquidity, True
+            )
+        if not (max and not exactIn):
+            amountOut = getAmount1Delta(
+                sqrtRatioNextX96, sqrtRatioCurrentX96, liquidity, False
+            )
+    else:
+        if not (max and exactIn):
+            amountIn = getAmount1Delta(
+                sqrtRatioCurrentX96, sqrtRatioNextX96, liquidity, True
+            )
+        if not (max and not exactIn):
+            amountOut = getAmount0Delta(
+                sqrtRatioCurrentX96, sqrtRatioNextX96, liquidity, False
+            )
+
+    # cap the output amount to not exceed the remaining output amount
+    if not exactIn and amountOut > -amountRemaining:
+        amountOut = -amountRemaining
+
+    if exactIn and sqrtRatioNextX96 != sqrtRatioTargetX96:
+        # we didn't reach the target, so take the remainder of the maximum input as fee
+        feeAmount = amountRemaining - amountIn
+    else:
+        feeAmount = mulDivRoundingUp(amountIn, feePips, 10**6 - feePips)
+
+    return (
+        sqrtRatioNextX96,
+        amountIn,
+        amountOut,
+        feeAmount,
+    )
+
+
+# TickBitmap
+
+
+def position(tick: int) -> Tuple[int, int]:
+    return (tick >> 8, tick % 256)
+
+
+def flipTick(
+    tickBitmap: dict,
+    tick: int,
+    tickSpacing: int,
+    update_block: Optional[int] = None,
+):
+    if not (tick % tickSpacing == 0):
+        raise EVMRevertError("Tick not correctly spaced!")
+
+    # the tick is evenly divisible, so floor division matches the reference
+    compressed = tick // tickSpacing
+    wordPos, bitPos = compressed >> 8, compressed % 256
+    logger.debug(f"flipping {tick=} @ {wordPos=}, {bitPos=}")
+
+    try:
+        tickBitmap[wordPos]["bitmap"] ^= 1 << bitPos
+        tickBitmap[wordPos]["block"] = update_block
+    except KeyError:
+        raise MissingTickWordError(
+            f"Called flipTick on missing word: {wordPos=}"
+        )
+
+
+def nextInitializedTickWithinOneWord(
+    tickBitmap: dict,
+    tick: int,
+    tickSpacing: int,
+    lte: bool,
+) -> Tuple[int, bool]:
+    # the reference truncates with Decimal, then corrects negative ticks
+    # towards negative infinity, which is equivalent to floor division
+    compressed = tick // tickSpacing
+
+    if lte:
+        wordPos, bitPos = compressed >> 8, compressed % 256
+        try:
+            bitmap_word = tickBitmap[wordPos]["bitmap"]
+        except Exception:
+            raise BitmapWordUnavailableError(wordPos)
+
+        # all the 1s at or to the right of the current bitPos
+        masked = bitmap_word & ((2 << bitPos) - 1)
+        if masked:
+            return (
+                compressed - bitPos + masked.bit_length() - 1
+            ) * tickSpacing, True
+        return (compressed - bitPos) * tickSpacing, False
+    else:
+        # start from the word of the next tick, since the current tick state doesn't matter
+        compressed += 1
+        wordPos, bitPos = compressed >> 8, compressed % 256
+        try:
+            bitmap_word = tickBitmap[wordPos]["bitmap"]
+        except Exception:
+            raise BitmapWordUnavailableError(wordPos)
+
+        # all the 1s at or to the left of the bitPos
+        masked = bitmap_word & ~((1 << bitPos) - 1)
+        if masked:
+            return (
+                compressed + (masked & -masked).bit_length() - 1 - bitPos
+            ) * tickSpacing, True
+        return (compressed + 255 - bitPos) * tickSpacing, False
@@ -19,6 +19,9 @@ MAX_UINT128 = 2**128 - 1
 MIN_UINT160 = 0
 MAX_UINT160 = 2**160 - 1
 
+MIN_INT256 = -(2**255)
+MAX_INT256 = 2**255 - 1
+
 MIN_UINT256 = 0
 MAX_UINT256 = 2**256 - 1
 
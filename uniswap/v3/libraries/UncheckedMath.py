@@ -0,0 +1,193 @@
+"""
+Unchecked variants of the V3 library functions used inside the swap loop.
+
+The reference and fast implementations re-validate the range of every argument
+and intermediate value (uint128 liquidity, uint160 prices, uint256 products) and
+raise EVMRevertError on each call. Within a single swap from a valid pool state
+those checks can never fail: prices stay between MIN_SQRT_RATIO and
+MAX_SQRT_RATIO, the next price is only calculated when the step does not reach
+its target, and the step amounts are bounded by the amount remaining.
+
+These functions perform the same integer arithmetic without the checks, and
+return identical results for such inputs. They are not a backend and are not
+installed into the library modules. The swap calculation binds them when called
+with `unchecked=True`, after validating the starting state once.
+"""
+
+from typing import Tuple
+
+
+# SqrtPriceMath
+
+
+def getAmount0Delta(
+    sqrtRatioAX96: int,
+    sqrtRatioBX96: int,
+    liquidity: int,
+    roundUp: bool,
+) -> int:
+    if sqrtRatioAX96 > sqrtRatioBX96:
+        sqrtRatioAX96, sqrtRatioBX96 = sqrtRatioBX96, sqrtRatioAX96
+
+    numerator = (liquidity << 96) * (sqrtRatioBX96 - sqrtRatioAX96)
+
+    if roundUp:
+        # mulDivRoundingUp, then divRoundingUp. Rounding up twice is the
+        # same as rounding up once, and -(-a // b) is a // b rounded up
+        return -((-numerator // sqrtRatioBX96) // sqrtRatioAX96)
+    return numerator // sqrtRatioBX96 // sqrtRatioAX96
+
+
+def getAmount1Delta(
+    sqrtRatioAX96: int,
+    sqrtRatioBX96: int,
+    liquidity: int,
+    roundUp: bool,
+) -> int:
+    if sqrtRatioAX96 > sqrtRatioBX96:
+        sqrtRatioAX96, sqrtRatioBX96 = sqrtRatioBX96, sqrtRatioAX96
+
+    if roundUp:
+        return -(-(liquidity * (sqrtRatioBX96 - sqrtRatioAX96)) >> 96)
+    return (liquidity * (sqrtRatioBX96 - sqrtRatioAX96)) >> 96
+
+
+def getNextSqrtPriceFromInput(
+    sqrtPX96: int,
+    liquidity: int,
+    amountIn: int,
+    zeroForOne: bool,
+) -> int:
+    if amountIn == 0:
+        return sqrtPX96
+
+    if zeroForOne:
+        # getNextSqrtPriceFromAmount0RoundingUp, adding
+        numerator1 = liquidity << 96
+        return -(
+            -(numerator1 * sqrtPX96) // (numerator1 + amountIn * sqrtPX96)
+        )
+
+    # getNextSqrtPriceFromAmount1RoundingDown, adding
+    return sqrtPX96 + (amountIn << 96) // liquidity
+
+
+def getNextSqrtPriceFromOutput(
+    sqrtPX96: int,
+    liquidity: int,
+    amountOut: int,
+    zeroForOne: bool,
+) -> int:
+    if zeroForOne:
+        # getNextSqrtPriceFromAmount1RoundingDown, removing the quotient
+        # rounded up
+        return sqrtPX96 + (-(amountOut << 96) // liquidity)
+
+    if amountOut == 0:
+        return sqrtPX96
+
+    # getNextSqrtPriceFromAmount0RoundingUp, removing
+    numerator1 = liquidity << 96
+    return -(
+        -(numerator1 * sqrtPX96) // (numerator1 - amountOut * sqrtPX96)
+    )
+
+
+# SwapMath
+
+
+def computeSwapStep(
+    sqrtRatioCurrentX96: int,
+    sqrtRatioTargetX96: int,
+    liquidity: int,
+    amountRemaining: int,
+    feePips: int,
+) -> Tuple[int, int, int, int]:
+    zeroForOne = sqrtRatioCurrentX96 >= sqrtRatioTargetX96
+    exactIn = amountRemaining >= 0
+
+    if exactIn:
+        amountRemainingLessFee = amountRemaining * (10**6 - feePips) // 10**6
+        amountIn = (
+            getAmount0Delta(
+                sqrtRatioTargetX96, sqrtRatioCurrentX96, liquidity, True
+            )
+            if zeroForOne
+            else getAmount1Delta(
+                sqrtRatioCurrentX96, sqrtRatioTargetX96, liquidity, True
+            )
+        )
+        if amountRemainingLessFee >= amountIn:
+            sqrtRatioNextX96 = sqrtRatioTargetX96
+        else:
+            sqrtRatioNextX96 = getNextSqrtPriceFromInput(
+                sqrtRatioCurrentX96,
+                liquidity,
+                amountRemainingLessFee,
+                zeroForOne,
+            )
+    else:
+        amountOut = (
+            getAmount1Delta(
+                sqrtRatioTargetX96, sqrtRatioCurrentX96, liquidity, False
+            )
+            if zeroForOne
+            else getAmount0Delta(
+                sqrtRatioCurrentX96, sqrtRatioTargetX96, liquidity, False
+            )
+        )
+        if -amountRemaining >= amountOut:
+            sqrtRatioNextX96 = sqrtRatioTargetX96
+        else:
+            sqrtRatioNextX96 = getNextSqrtPriceFromOutput(
+                sqrtRatioCurrentX96,
+                liquidity,
+                -amountRemaining,
+                zeroForOne,
+            )
+
+    max = sqrtRatioTargetX96 == sqrtRatioNextX96
+
+    # get the input/output amounts
+    if zeroForOne:
+        if not (max and exactIn):
+            amountIn = getAmount0Delta(
+                sqrtRatioNextX96, sqrtRatioCurrentX96, liquidity, True
+            )
+        if not (max and not exactIn):
+            amountOut = getAmount1Delta(
+                sqrtRatioNextX96, sqrtRatioCurrentX96, liquidity, False
+            )
+    else:
+        if not (max and exactIn):
+            amountIn = getAmount1Delta(
+                sqrtRatioCurrentX96, sqrtRatioNextX96, liquidity, True
+            )
+        if not (max and not exactIn):
+            amountOut = getAmount0Delta(
+                sqrtRatioCurrentX96, sqrtRatioNextX96, liquidity, False
+            )
+
+    # cap the output amount to not exceed the remaining output amount
+    if not exactIn and amountOut > -amountRemaining:
+        amountOut = -amountRemaining
+
+    if exactIn and sqrtRatioNextX96 != sqrtRatioTargetX96:
+        # we didn't reach the target, so take the remainder of the maximum input as fee
+        feeAmount = amountRemaining - amountIn
+    else:
+        feeAmount = -(-(amountIn * feePips) // (10**6 - feePips))
+
+    return (
+        sqrtRatioNextX96,
+        amountIn,
+        amountOut,
+        feeAmount,
+    )
+
+
+# LiquidityMath
+
+
+def addDelta(x: int, y: int) -> int:
+    return x + y
@@ -7,3 +7,10 @@ from .Tick import *
 from .TickBitmap import *
 from .TickMath import *
 from .UnsafeMath import *
+from .Backend import (
+    clear_tick_cache,
+    get_backend,
+    get_tick_cache_info,
+    set_backend,
+    set_tick_cache,
+)
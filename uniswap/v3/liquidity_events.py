@@ -0,0 +1,232 @@
+import json
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from brownie import web3 as brownie_w3  # type: ignore
+from web3 import Web3
+
+from alex_bot.uniswap.v3.libraries import TickBitmap
+
+MINT_EVENT_TOPIC = Web3.keccak(
+    text="Mint(address,address,int24,int24,uint128,uint256,uint256)"
+)
+BURN_EVENT_TOPIC = Web3.keccak(
+    text="Burn(address,int24,int24,uint128,uint256,uint256)"
+)
+
+
+class LiquidityEvent(NamedTuple):
+    """
+    A decoded Mint or Burn event from a Uniswap V3 pool. `liquidity_delta`
+    is negative for a Burn.
+    """
+
+    address: str
+    block_number: int
+    log_index: int
+    liquidity_delta: int
+    tick_lower: int
+    tick_upper: int
+
+
+def _to_bytes(value) -> bytes:
+    if isinstance(value, str):
+        return bytes(Web3.toBytes(hexstr=value))
+    return bytes(value)
+
+
+def _to_int(value) -> int:
+    if isinstance(value, str):
+        return int(value, 16)
+    return value
+
+
+def is_liquidity_event(log: dict) -> bool:
+    """
+    Check if a raw log is a V3 Mint or Burn event
+    """
+    return bool(log["topics"]) and _to_bytes(log["topics"][0]) in (
+        MINT_EVENT_TOPIC,
+        BURN_EVENT_TOPIC,
+    )
+
+
+def decode_liquidity_event(log: dict) -> LiquidityEvent:
+    """
+    Decode a raw Mint or Burn log, either as returned by `eth.get_logs` or in the
+    hex-encoded JSON-RPC format
+    """
+
+    topic = _to_bytes(log["topics"][0])
+    if topic not in (MINT_EVENT_TOPIC, BURN_EVENT_TOPIC):
+        raise ValueError(f"Log is not a V3 Mint or Burn event: {log}")
+
+    # both events index (owner, tickLower, tickUpper)
+    tick_lower = int.from_bytes(
+        _to_bytes(log["topics"][2]), "big", signed=True
+    )
+    tick_upper = int.from_bytes(
+        _to_bytes(log["topics"][3]), "big", signed=True
+    )
+
+    data = _to_bytes(log["data"])
+    if topic == MINT_EVENT_TOPIC:
+        # data holds (sender, amount, amount0, amount1)
+        liquidity_delta = int.from_bytes(data[32:64], "big")
+    else:
+        # data holds (amount, amount0, amount1)
+        liquidity_delta = -int.from_bytes(data[0:32], "big")
+
+    return LiquidityEvent(
+        address=Web3.toChecksumAddress(log["address"]),
+        block_number=_to_int(log["blockNumber"]),
+        log_index=_to_int(log["logIndex"]),
+        liquidity_delta=liquidity_delta,
+        tick_lower=tick_lower,
+        tick_upper=tick_upper,
+    )
+
+
+def get_liquidity_events(
+    pool_addresses: Iterable[str],
+    from_block: int,
+    to_block: int,
+    chunk_size: int = 5_000,
+    max_addresses: Optional[int] = 1_000,
+) -> Iterator[LiquidityEvent]:
+    """
+    Retrieve the Mint and Burn events for a set of V3 pools between `from_block` and
+    `to_block` (inclusive), in chain order.
+
+    Logs are requested in ranges of `chunk_size` blocks, with up to `max_addresses` pool
+    addresses per request, and yielded as each range completes so a long history can be
+    processed without holding every log in memory.
+    """
+
+    addresses = [Web3.toChecksumAddress(address) for address in pool_addresses]
+    if not addresses:
+        return
+
+    if max_addresses is None:
+        max_addresses = len(addresses)
+
+    for start_block in range(from_block, to_block + 1, chunk_size):
+        end_block = min(start_block + chunk_size - 1, to_block)
+        events = []
+        for i in range(0, len(addresses), max_addresses):
+            events.extend(
+                decode_liquidity_event(log)
+                for log in brownie_w3.eth.get_logs(
+                    {
+                        "address": addresses[i : i + max_addresses],
+                        "fromBlock": start_block,
+                        "toBlock": end_block,
+                        "topics": [
+                            [
+                                Web3.toHex(MINT_EVENT_TOPIC),
+                                Web3.toHex(BURN_EVENT_TOPIC),
+                            ]
+                        ],
+                    }
+                )
+            )
+        # requests split by address must be merged back into chain order
+        events.sort(key=lambda event: (event.block_number, event.log_index))
+        yield from events
+
+
+def read_liquidity_events(path: str) -> Iterator[LiquidityEvent]:
+    """
+    Read the Mint and Burn events from a local log file, holding one raw log per
+    line as a JSON object in the JSON-RPC `eth_getLogs` format. Other logs are
+    skipped. The file is read lazily and must be in chain order.
+    """
+
+    with open(path) as file:
+        for line in file:
+            if not line.strip():
+                continue
+            log = json.loads(line)
+            if is_liquidity_event(log):
+                yield decode_liquidity_event(log)
+
+
+def build_tick_data(
+    events: Iterable[LiquidityEvent],
+    pool_addresses: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[int, dict]]:
+    """
+    Reconstruct the complete `tick_data` of many pools in a single pass over their
+    Mint and Burn events, which must include each pool's full history. Events for
+    pools outside `pool_addresses` (default: any pool) are ignored.
+
+    Each tick is tagged with the block of the last event that changed it, and ticks
+    without remaining liquidity are dropped. Returns a dictionary of `tick_data`
+    dictionaries keyed by pool address.
+    """
+
+    if pool_addresses is not None:
+        pool_addresses = set(pool_addresses)
+
+    # tick -> [liquidityNet, liquidityGross, block]
+    ticks_by_pool: Dict[str, Dict[int, List[int]]] = {}
+
+    for event in events:
+        if pool_addresses is not None and event.address not in pool_addresses:
+            continue
+
+        try:
+            ticks = ticks_by_pool[event.address]
+        except KeyError:
+            ticks = ticks_by_pool[event.address] = {}
+
+        for tick, liquidity_net_delta in (
+            (event.tick_lower, event.liquidity_delta),
+            (event.tick_upper, -event.liquidity_delta),
+        ):
+            try:
+                values = ticks[tick]
+            except KeyError:
+                values = ticks[tick] = [0, 0, 0]
+            values[0] += liquidity_net_delta
+            values[1] += event.liquidity_delta
+            values[2] = event.block_number
+
+    tick_data_by_pool: Dict[str, Dict[int, dict]] = {}
+    for pool_address, ticks in ticks_by_pool.items():
+        tick_data = tick_data_by_pool[pool_address] = {}
+        for tick, (liquidity_net, liquidity_gross, block) in ticks.items():
+            if liquidity_gross < 0:
+                raise ValueError(
+                    f"Negative liquidity at tick {tick} of pool {pool_address}, the event history is incomplete"
+                )
+            if liquidity_gross:
+                tick_data[tick] = {
+                    "liquidityNet": liquidity_net,
+                    "liquidityGross": liquidity_gross,
+                    "block": block,
+                }
+
+    return tick_data_by_pool
+
+
+def build_tick_bitmap(
+    tick_data: Dict[int, dict],
+    tick_spacing: int,
+    block_number: Optional[int] = None,
+) -> Dict[int, dict]:
+    """
+    Build the bitmap words (word -> {"bitmap", "block"}) holding the initialized
+    ticks in `tick_data`
+    """
+
+    tick_bitmap: Dict[int, dict] = {}
+    for tick in tick_data:
+        word_position, bit_position = TickBitmap.position(tick // tick_spacing)
+        try:
+            tick_bitmap[word_position]["bitmap"] |= 1 << bit_position
+        except KeyError:
+            tick_bitmap[word_position] = {
+                "bitmap": 1 << bit_position,
+                "block": block_number,
+            }
+    return tick_bitmap
@@ -0,0 +1,443 @@
+import mmap
+import os
+import struct
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from web3 import Web3
+
+from alex_bot.exceptions import LiquidityPoolError
+from alex_bot.uniswap.v3.libraries import TickBitmap
+from alex_bot.uniswap.v3.liquidity_events import LiquidityEvent
+
+_MAGIC = b"V3TC\x02"
+
+# record header: pool address, block number, payload length
+_RECORD_HEADER = struct.Struct(">20sQI")
+
+# payload header: fee, token0, token1, tick spacing, liquidity, sqrtPriceX96,
+# tick, sparse flag, word count, tick count
+_POOL_DETAILS = struct.Struct(">I20s20si16s20si?II")
+# bitmap word: word position, block, bitmap
+_WORD = struct.Struct(">iQ32s")
+# tick: tick, block, liquidityNet, liquidityGross
+_TICK = struct.Struct(">iQ16s16s")
+
+# stored in place of a missing block tag
+_NO_BLOCK = 0
+
+
+class V3TickCache:
+    """
+    An append-only on-disk store of V3 pool state (tokens, tick spacing, liquidity, price,
+    tick, tick bitmap and tick data), keyed by pool address and tagged with the block the
+    liquidity, price and tick were recorded at. Each bitmap word and tick keeps its own
+    block tag, since the tick data of a pool that is not updated from liquidity events
+    is only current at the block each word was fetched.
+
+    Records use a fixed binary layout, so reading a file never executes code from it.
+    Each save appends a record to the file, and the latest record for an address wins.
+    The file is scanned once to build an index of the record offsets, and records are
+    read through a memory map. Call `compact` to drop superseded records.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = Lock()
+        # address -> (payload offset, payload length, block number)
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self._mmap: Optional[mmap.mmap] = None
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "wb") as file:
+                file.write(_MAGIC)
+
+        self._file = open(path, "r+b")
+        self._scan()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, address: str) -> bool:
+        return Web3.toChecksumAddress(address) in self._index
+
+    def _scan(self) -> None:
+        """
+        Build the record index. A partial record at the end of the file (e.g. from an
+        interrupted write) is discarded.
+        """
+
+        self._file.seek(0)
+        magic = self._file.read(len(_MAGIC))
+        if magic != _MAGIC:
+            if magic[:-1] == _MAGIC[:-1]:
+                raise LiquidityPoolError(
+                    f"{self.path} was written in an older format, delete it to rebuild the cache"
+                )
+            raise LiquidityPoolError(
+                f"{self.path} is not a V3 tick cache file"
+            )
+
+        size = os.path.getsize(self.path)
+        offset = len(_MAGIC)
+        while offset + _RECORD_HEADER.size <= size:
+            self._file.seek(offset)
+            address, block, length = _RECORD_HEADER.unpack(
+                self._file.read(_RECORD_HEADER.size)
+            )
+            payload_offset = offset + _RECORD_HEADER.size
+            if payload_offset + length > size:
+                break
+            address = Web3.toChecksumAddress("0x" + address.hex())
+            self._index[address] = (payload_offset, length, block)
+            offset = payload_offset + length
+
+        if offset != size:
+            self._file.truncate(offset)
+
+    def _get_mmap(self) -> mmap.mmap:
+        if self._mmap is None:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        return self._mmap
+
+    def _close_mmap(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def addresses(self) -> List[str]:
+        """
+        Return the addresses of all pools held in the cache
+        """
+        return list(self._index)
+
+    def get_block(self, address: str) -> Optional[int]:
+        """
+        Return the block number of the record held for the pool, or None if absent
+        """
+        try:
+            return self._index[Web3.toChecksumAddress(address)][2]
+        except KeyError:
+            return None
+
+    def save(self, pool, block_number: Optional[int] = None) -> None:
+        """
+        Append a record of the pool's current state. The block number of the liquidity,
+        price and tick defaults to the pool's `update_block`.
+        """
+        self.save_pools([pool], block_number=block_number)
+
+    def save_pools(
+        self,
+        pools: Iterable,
+        block_number: Optional[int] = None,
+    ) -> None:
+        """
+        Append a record for each pool with a single write and flush.
+
+        Placeholder words added to a sparse bitmap without fetching (and the ticks in
+        them) are not saved, so they are fetched from the chain after loading.
+        """
+
+        records = []
+        for pool in pools:
+            with pool.update_lock, pool.tick_lock:
+                block = (
+                    block_number
+                    if block_number is not None
+                    else pool.update_block
+                )
+                sparse = pool.tick_bitmap["sparse"]
+                words = {
+                    word: value
+                    for word, value in pool.tick_bitmap.items()
+                    if word != "sparse"
+                    and not (sparse and value["block"] is None)
+                }
+                ticks = [
+                    (tick, value)
+                    for tick, value in pool.tick_data.items()
+                    if not sparse
+                    or TickBitmap.position(tick // pool.tick_spacing)[0]
+                    in words
+                ]
+                chunks = [
+                    _POOL_DETAILS.pack(
+                        pool.fee,
+                        bytes.fromhex(pool.token0.address[2:]),
+                        bytes.fromhex(pool.token1.address[2:]),
+                        pool.tick_spacing,
+                        pool.liquidity.to_bytes(16, "big"),
+                        pool.sqrt_price_x96.to_bytes(20, "big"),
+                        pool.tick,
+                        sparse,
+                        len(words),
+                        len(ticks),
+                    )
+                ]
+                chunks.extend(
+                    _WORD.pack(
+                        word,
+                        value["block"] or _NO_BLOCK,
+                        value["bitmap"].to_bytes(32, "big"),
+                    )
+                    for word, value in words.items()
+                )
+                chunks.extend(
+                    _TICK.pack(
+                        tick,
+                        value["block"] or _NO_BLOCK,
+                        value["liquidityNet"].to_bytes(
+                            16, "big", signed=True
+                        ),
+                        value["liquidityGross"].to_bytes(16, "big"),
+                    )
+                    for tick, value in ticks
+                )
+            records.append((pool.address, block, b"".join(chunks)))
+
+        with self._lock:
+            self._close_mmap()
+            offset = self._file.seek(0, os.SEEK_END)
+            chunks = []
+            for address, block, payload in records:
+                chunks.append(
+                    _RECORD_HEADER.pack(
+                        bytes.fromhex(address[2:]), block, len(payload)
+                    )
+                )
+                chunks.append(payload)
+                offset += _RECORD_HEADER.size
+                self._index[address] = (offset, len(payload), block)
+                offset += len(payload)
+            self._file.write(b"".join(chunks))
+            self._file.flush()
+
+    def load(self, address: str) -> Optional[dict]:
+        """
+        Return the latest record for the pool, or None if absent. The record holds
+        `block`, `fee`, `token0`, `token1` (addresses), `tick_spacing`, `liquidity`,
+        `sqrt_price_x96`, `tick`, `sparse`, and `tick_bitmap` and `tick_data`
+        dictionaries in the format accepted by `V3LiquidityPool`. Each word and tick
+        holds its saved block tag, or the record block if it had none.
+
+        Use `replay_liquidity_events` to apply the events emitted since the tick data
+        was saved.
+        """
+
+        address = Web3.toChecksumAddress(address)
+
+        with self._lock:
+            try:
+                offset, length, block = self._index[address]
+            except KeyError:
+                return None
+            payload = self._get_mmap()[offset : offset + length]
+
+        (
+            fee,
+            token0,
+            token1,
+            tick_spacing,
+            liquidity,
+            sqrt_price_x96,
+            current_tick,
+            sparse,
+            word_count,
+            tick_count,
+        ) = _POOL_DETAILS.unpack_from(payload)
+        words_end = _POOL_DETAILS.size + word_count * _WORD.size
+
+        return {
+            "block": block,
+            "fee": fee,
+            "token0": Web3.toChecksumAddress("0x" + token0.hex()),
+            "token1": Web3.toChecksumAddress("0x" + token1.hex()),
+            "tick_spacing": tick_spacing,
+            "liquidity": int.from_bytes(liquidity, "big"),
+            "sqrt_price_x96": int.from_bytes(sqrt_price_x96, "big"),
+            "tick": current_tick,
+            "sparse": sparse,
+            "tick_bitmap": {
+                word: {
+                    "bitmap": int.from_bytes(bitmap, "big"),
+                    "block": word_block or block,
+                }
+                for word, word_block, bitmap in _WORD.iter_unpack(
+                    payload[_POOL_DETAILS.size : words_end]
+                )
+            },
+            "tick_data": {
+                tick: {
+                    "liquidityNet": int.from_bytes(
+                        liquidity_net, "big", signed=True
+                    ),
+                    "liquidityGross": int.from_bytes(liquidity_gross, "big"),
+                    "block": tick_block or block,
+                }
+                for (
+                    tick,
+                    tick_block,
+                    liquidity_net,
+                    liquidity_gross,
+                ) in _TICK.iter_unpack(
+                    payload[words_end : words_end + tick_count * _TICK.size]
+                )
+            },
+        }
+
+    def compact(self) -> None:
+        """
+        Rewrite the file with only the latest record for each pool
+        """
+
+        with self._lock:
+            temp_path = f"{self.path}.tmp"
+            mapped = self._get_mmap()
+            index = {}
+            with open(temp_path, "wb") as file:
+                file.write(_MAGIC)
+                offset = len(_MAGIC)
+                for address, (
+                    payload_offset,
+                    length,
+                    block,
+                ) in self._index.items():
+                    file.write(
+                        _RECORD_HEADER.pack(
+                            bytes.fromhex(address[2:]), block, length
+                        )
+                    )
+                    file.write(
+                        mapped[payload_offset : payload_offset + length]
+                    )
+                    offset += _RECORD_HEADER.size
+                    index[address] = (offset, length, block)
+                    offset += length
+            self._close_mmap()
+            self._file.close()
+            os.replace(temp_path, self.path)
+            self._file = open(self.path, "r+b")
+            self._index = index
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_mmap()
+            self._file.close()
+
+
+def get_tick_data_block(record: dict) -> int:
+    """
+    Return the earliest block tag held in a record's tick data and bitmap, after
+    which liquidity events may be missing from it
+    """
+    return min(
+        (
+            value["block"]
+            for values in (record["tick_bitmap"], record["tick_data"])
+            for value in values.values()
+        ),
+        default=record["block"],
+    )
+
+
+def replay_liquidity_events(
+    record: dict,
+    events: Iterable[LiquidityEvent],
+) -> int:
+    """
+    Apply the Mint and Burn events for a pool to the `tick_bitmap` and `tick_data` of a
+    record loaded by `V3TickCache.load`, in place. `events` must be in chain order.
+
+    Each tick is changed only by events after the block it is known to be current at:
+    its own block tag, or that of its bitmap word if it has no data. Ticks in words
+    missing from a sparse record are skipped, since the word will be fetched from the
+    chain when needed. Words missing from a complete record are empty, and current
+    from the earliest word block tag in the record.
+
+    The liquidity, price and tick of the record are not changed. Returns the number of
+    events applied to at least one tick.
+    """
+
+    tick_data = record["tick_data"]
+    tick_bitmap = record["tick_bitmap"]
+    tick_spacing = record["tick_spacing"]
+    # the words are replaced as events flip their bits, so keep their blocks
+    # as loaded
+    word_blocks = {
+        word: value["block"] for word, value in tick_bitmap.items()
+    }
+    complete_block = min(word_blocks.values(), default=record["block"])
+
+    # tick -> block the tick was current at when loaded, fixed before any
+    # change so that several events in one block all apply
+    known_blocks: Dict[int, Optional[int]] = {}
+
+    def known_block(tick: int) -> Optional[int]:
+        try:
+            return known_blocks[tick]
+        except KeyError:
+            pass
+        word, _ = TickBitmap.position(tick // tick_spacing)
+        if tick in tick_data:
+            block = tick_data[tick]["block"]
+        elif word in word_blocks:
+            block = word_blocks[word]
+        elif record["sparse"]:
+            block = None
+        else:
+            block = complete_block
+        known_blocks[tick] = block
+        return block
+
+    applied = 0
+    for event in events:
+        changed = False
+        for tick, liquidity_net_delta in (
+            (event.tick_lower, event.liquidity_delta),
+            (event.tick_upper, -event.liquidity_delta),
+        ):
+            block = known_block(tick)
+            if block is None or event.block_number <= block:
+                continue
+            changed = True
+
+            try:
+                values = tick_data[tick]
+            except KeyError:
+                liquidity_net, liquidity_gross = 0, 0
+            else:
+                liquidity_net = values["liquidityNet"]
+                liquidity_gross = values["liquidityGross"]
+            liquidity_net += liquidity_net_delta
+            liquidity_gross += event.liquidity_delta
+
+            if liquidity_gross:
+                tick_data[tick] = {
+                    "liquidityNet": liquidity_net,
+                    "liquidityGross": liquidity_gross,
+                    "block": event.block_number,
+                }
+            else:
+                tick_data.pop(tick, None)
+
+            word, bit = TickBitmap.position(tick // tick_spacing)
+            value = tick_bitmap.setdefault(
+                word, {"bitmap": 0, "block": event.block_number}
+            )
+            if bool(value["bitmap"] & (1 << bit)) != bool(liquidity_gross):
+                tick_bitmap[word] = {
+                    "bitmap": value["bitmap"] ^ (1 << bit),
+                    "block": event.block_number,
+                }
+        applied += changed
+
+    return applied
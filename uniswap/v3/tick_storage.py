@@ -0,0 +1,147 @@
+import sys
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class _CompactRecord:
+    """
+    Base class for slotted records that stand in for the small fixed-key dicts
+    used by the V3 pool helpers. Item access (`record["key"]`) is supported so
+    existing code can read and write records and dicts interchangeably.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (dict, _CompactRecord)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())})"
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, key) for key in self.__slots__)
+
+    def __setstate__(self, state: tuple) -> None:
+        for key, value in zip(self.__slots__, state):
+            setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def keys(self) -> Iterable[str]:
+        return self.__slots__
+
+    def items(self) -> Iterable[Tuple[str, Any]]:
+        return ((key, getattr(self, key)) for key in self.__slots__)
+
+    def copy(self):
+        return self.__class__(*(getattr(self, key) for key in self.__slots__))
+
+
+class TickRecord(_CompactRecord):
+    """
+    Compact replacement for a `tick_data` value:
+    `{"liquidityNet": ..., "liquidityGross": ..., "block": ...}`
+    """
+
+    __slots__ = ("liquidityNet", "liquidityGross", "block")
+
+    def __init__(
+        self,
+        liquidityNet: int,
+        liquidityGross: int,
+        block: Optional[int],
+    ):
+        self.liquidityNet = liquidityNet
+        self.liquidityGross = liquidityGross
+        self.block = block
+
+
+class BitmapWord(_CompactRecord):
+    """
+    Compact replacement for a `tick_bitmap` word value:
+    `{"bitmap": ..., "block": ...}`
+    """
+
+    __slots__ = ("bitmap", "block")
+
+    def __init__(
+        self,
+        bitmap: int,
+        block: Optional[int],
+    ):
+        self.bitmap = bitmap
+        self.block = block
+
+
+def compact_tick_data(tick_data: Dict[int, Any]) -> Dict[int, TickRecord]:
+    """
+    Convert a `tick_data` dictionary to use `TickRecord` values
+    """
+    return {
+        tick: TickRecord(
+            data["liquidityNet"],
+            data["liquidityGross"],
+            data.get("block"),
+        )
+        for tick, data in tick_data.items()
+    }
+
+
+def compact_tick_bitmap(tick_bitmap: Dict[Any, Any]) -> Dict[Any, Any]:
+    """
+    Convert a `tick_bitmap` dictionary to use `BitmapWord` values. The
+    "sparse" flag is preserved.
+    """
+    return {
+        key: (
+            value
+            if key == "sparse"
+            else BitmapWord(value["bitmap"], value.get("block"))
+        )
+        for key, value in tick_bitmap.items()
+    }
+
+
+def get_tick_storage_size(*objects: Any) -> int:
+    """
+    Return the approximate number of bytes held by the given objects, e.g. a
+    pool's `tick_data` and `tick_bitmap`, following the contents of dicts,
+    lists and records. Objects referenced more than once (e.g. a shared block
+    number) are counted once.
+    """
+
+    seen = set()
+    size = 0
+    pending = list(objects)
+
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            pending.extend(obj)
+        elif isinstance(obj, _CompactRecord):
+            pending.extend(value for _, value in obj.items())
+
+    return size
@@ -1,7 +1,22 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from collections import ChainMap
 from decimal import Decimal
+from math import ceil
 from threading import Lock
-from typing import Any, Dict, List, Optional, Tuple, Union
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from warnings import warn
 
 import eth_abi
@@ -23,13 +38,38 @@ from alex_bot.token import Erc20Token
 from alex_bot.uniswap.v3.abi import UNISWAP_V3_POOL_ABI
 from alex_bot.uniswap.v3.functions import generate_v3_pool_address
 from alex_bot.uniswap.v3.libraries import (
+    FullMath,
     LiquidityMath,
     SwapMath,
     TickBitmap,
     TickMath,
+    UncheckedMath,
 )
 from alex_bot.uniswap.v3.libraries.Helpers import *
 from alex_bot.uniswap.v3.tick_lens import TickLens
+from alex_bot.uniswap.v3.tick_storage import (
+    BitmapWord,
+    TickRecord,
+    compact_tick_bitmap,
+    compact_tick_data,
+    get_tick_storage_size,
+)
+
+
+# marks a journal entry for a key that did not exist before the change
+_MISSING = object()
+
+# adaptive prefetch window: smoothing factor for the average distance travelled
+# by swaps, decay factor applied to the peak distance at each swap, and the
+# largest window (in words on each side of the requested word)
+_WORD_TRAVEL_SMOOTHING = 0.1
+_WORD_TRAVEL_DECAY = 0.95
+_MAX_PREFETCH_WORDS = 100
+
+# float64 constants for the screening estimates: 2**96, and the sqrt price
+# ratio between adjacent ticks (sqrt(1.0001))
+_Q96_FLOAT = float(2**96)
+_SQRT_TICK_BASE = 1.0001**0.5
 
 
 class BaseV3LiquidityPool(ABC):
@@ -58,10 +98,42 @@ class BaseV3LiquidityPool(ABC):
         silent: bool = False,
         tick_data: Optional[dict] = None,
         tick_bitmap: Optional[dict] = None,
+        compact_tick_storage: bool = False,
+        adaptive_extra_words: bool = False,
+        concurrent_readers: bool = False,
+        tick_spacing: Optional[int] = None,
+        state: Optional[dict] = None,
     ):
         self.tick_data: dict
         self.tick_bitmap: dict
 
+        # sorted list of initialized ticks, kept consistent with `self.tick_bitmap`
+        self._initialized_ticks: List[int] = []
+
+        # liquidityNet for each tick in `self.tick_data`, read by the swap loop
+        self._liquidity_net: Dict[int, int] = {}
+
+        # cumulative swap amounts at each swap step boundary from the current
+        # price, keyed by direction (zeroForOne). Built lazily by quotes and
+        # cleared whenever the pool state changes
+        self._swap_segments: Dict[bool, dict] = {}
+
+        # incremented whenever the swap state changes (including a restore), so
+        # consumers can detect changes by comparing a single integer
+        self.state_version = 0
+
+        # undo journal for speculative changes, active while a snapshot is held
+        self._journal: Optional[List[tuple]] = None
+        # (token, journal length) for each snapshot held, oldest first
+        self._snapshots: List[Tuple[int, int]] = []
+        self._snapshot_counter = 0
+
+        # immutable copy of the pool state published for readers after each
+        # update (see `get_reader`), and the live pool held by such a copy
+        self.concurrent_readers = concurrent_readers
+        self._reader_view: Optional["BaseV3LiquidityPool"] = None
+        self._live_pool: Optional["BaseV3LiquidityPool"] = None
+
         # held by the _get_tick_data_at_word method, which will retrieve
         # and store liquidity and bitmap data
         self.tick_lock = Lock()
@@ -70,7 +142,11 @@ class BaseV3LiquidityPool(ABC):
         # retrieve and store mutable state data (liquidity, tick, sqrtPrice, etc)
         self.update_lock = Lock()
 
-        self.update_block = chain.height
+        # a known state (`block`, `liquidity`, `sqrt_price_x96` and `tick`, e.g. from
+        # a tick cache record) replaces the block, liquidity and slot0 lookups
+        self.update_block = (
+            state["block"] if state is not None else chain.height
+        )
         self.liquidity_update_block = self.update_block
 
         self.uniswap_version = 3
@@ -100,7 +176,9 @@ class BaseV3LiquidityPool(ABC):
         if tokens:
             self.token0 = min(tokens)
             self.token1 = max(tokens)
-            if not (
+            # with a known state, the deterministic address check below is
+            # relied on to match the tokens and fee to the pool
+            if state is None and not (
                 self.token0.address == self._brownie_contract.token0()
                 and self.token1.address == self._brownie_contract.token1()
             ):
@@ -144,29 +222,55 @@ class BaseV3LiquidityPool(ABC):
                 f"Pool address {self.address} does not match deterministic address {computed_pool_address} from factory"
             )
 
-        self.liquidity = self._brownie_contract.liquidity(
-            block_identifier=self.update_block
-        )
-        self.tick_spacing = self._brownie_contract.tickSpacing()  # immutable
-        slot0 = self._brownie_contract.slot0(
-            block_identifier=self.update_block
-        )
-        self.sqrt_price_x96 = slot0[0]
-        self.tick = slot0[1]
+        if tick_spacing is None:
+            tick_spacing = self._brownie_contract.tickSpacing()  # immutable
+        self.tick_spacing = tick_spacing
+
+        if state is not None:
+            self.liquidity = state["liquidity"]
+            self.sqrt_price_x96 = state["sqrt_price_x96"]
+            self.tick = state["tick"]
+        else:
+            self.liquidity = self._brownie_contract.liquidity(
+                block_identifier=self.update_block
+            )
+            slot0 = self._brownie_contract.slot0(
+                block_identifier=self.update_block
+            )
+            self.sqrt_price_x96 = slot0[0]
+            self.tick = slot0[1]
 
         self._update_method = update_method
         self.extra_words = extra_words
 
+        # size the prefetch window in each direction from the distance that
+        # simulated and observed swaps travel, instead of `extra_words`. Each
+        # reader view records into its own copy of the statistics
+        self.adaptive_extra_words = adaptive_extra_words
+        self._word_travel: Dict[bool, dict] = {
+            zeroForOne: self._new_word_travel_stats()
+            for zeroForOne in (True, False)
+        }
+
+        # store ticks and bitmap words as slotted records instead of dicts
+        self.compact_tick_storage = compact_tick_storage
+
         # default to a sparse bitmap
         self.tick_bitmap = {"sparse": True}
 
         if tick_bitmap is not None:
+            if compact_tick_storage:
+                tick_bitmap = compact_tick_bitmap(tick_bitmap)
             self.tick_bitmap.update(tick_bitmap)
             # if a snapshot was provided, assume it is complete (sparse=False)
             self.tick_bitmap["sparse"] = False
+            self._rebuild_initialized_ticks()
 
         if tick_data is not None:
+            if compact_tick_storage:
+                tick_data = compact_tick_data(tick_data)
             self.tick_data = tick_data
+            self._rebuild_liquidity_net()
         else:
             word_position, _ = self._get_tick_bitmap_position(self.tick)
             self.tick_data = {}
@@ -179,6 +283,10 @@ class BaseV3LiquidityPool(ABC):
         self.state: dict = {}
         self._update_pool_state()
 
+        if self.concurrent_readers:
+            with self.update_lock:
+                self._publish_reader_view()
+
         if not silent:
             logger.info(self.name)
             logger.info(f"• Token 0: {self.token0}")
@@ -194,10 +302,40 @@ class BaseV3LiquidityPool(ABC):
         state["tick_lock"] = None
         state["update_lock"] = None
         state["lens"] = None
+        state["_swap_segments"] = {}
+        state["_journal"] = None
+        state["_snapshots"] = []
+        state["_reader_view"] = None
+        state["_live_pool"] = None
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
+        # objects pickled before the initialized tick index was added
+        if "_initialized_ticks" not in state:
+            self._rebuild_initialized_ticks()
+        if "_liquidity_net" not in state:
+            self._rebuild_liquidity_net()
+        if "compact_tick_storage" not in state:
+            self.compact_tick_storage = False
+        if "_swap_segments" not in state:
+            self._swap_segments = {}
+        if "state_version" not in state:
+            self.state_version = 0
+        if "_journal" not in state:
+            self._journal = None
+            self._snapshots = []
+            self._snapshot_counter = 0
+        if "_word_travel" not in state:
+            self.adaptive_extra_words = False
+            self._word_travel = {
+                zeroForOne: self._new_word_travel_stats()
+                for zeroForOne in (True, False)
+            }
+        if "concurrent_readers" not in state:
+            self.concurrent_readers = False
+            self._reader_view = None
+            self._live_pool = None
 
     def __str__(self):
         """
@@ -205,6 +343,349 @@ class BaseV3LiquidityPool(ABC):
         """
         return self.name
 
+    def _new_bitmap_word(
+        self,
+        bitmap: int,
+        block: Optional[int],
+    ) -> Union[dict, BitmapWord]:
+        """
+        Create a `tick_bitmap` word value in the storage layout used by this pool
+        """
+        if self.compact_tick_storage:
+            return BitmapWord(bitmap, block)
+        return {"bitmap": bitmap, "block": block}
+
+    def _new_tick_record(
+        self,
+        liquidity_net: int,
+        liquidity_gross: int,
+        block: Optional[int],
+    ) -> Union[dict, TickRecord]:
+        """
+        Create a `tick_data` value in the storage layout used by this pool
+        """
+        if self.compact_tick_storage:
+            return TickRecord(liquidity_net, liquidity_gross, block)
+        return {
+            "liquidityNet": liquidity_net,
+            "liquidityGross": liquidity_gross,
+            "block": block,
+        }
+
+    def get_tick_storage_size(self) -> int:
+        """
+        Return the approximate memory (bytes) held by the tick data, tick bitmap
+        and the indexes derived from them
+        """
+        return get_tick_storage_size(
+            self.tick_data,
+            self.tick_bitmap,
+            self._initialized_ticks,
+            self._liquidity_net,
+        )
+
+    def _journal_attributes(self) -> None:
+        """
+        Record the mutable pool attributes in the undo journal, if a snapshot is held
+        """
+        if self._journal is None:
+            return
+        for name in (
+            "liquidity",
+            "sqrt_price_x96",
+            "tick",
+            "update_block",
+            "liquidity_update_block",
+        ):
+            self._journal.append(("attr", name, getattr(self, name)))
+        # the state dict may be updated in place, so record a copy
+        self._journal.append(("attr", "state", self.state.copy()))
+
+    def _journal_item(self, mapping: dict, key: Any) -> None:
+        """
+        Record the current value for `key` in `mapping` in the undo journal, if a
+        snapshot is held. Values mutated in place must be copied by the caller first.
+        """
+        if self._journal is not None:
+            self._journal.append(
+                ("item", mapping, key, mapping.get(key, _MISSING))
+            )
+
+    def snapshot(self) -> int:
+        """
+        Begin (or nest) a speculative section, and return a token for `restore`.
+
+        While a snapshot is held, changes made by `external_update` and `auto_update` are
+        recorded in an undo journal, so `restore` can revert them without copying `tick_data`
+        or `tick_bitmap`. Every snapshot should eventually be restored; the journal is
+        released when the outermost snapshot is restored.
+        """
+        with self.update_lock:
+            if self._journal is None:
+                self._journal = []
+            self._snapshot_counter += 1
+            self._snapshots.append(
+                (self._snapshot_counter, len(self._journal))
+            )
+            return self._snapshot_counter
+
+    def restore(self, token: int) -> None:
+        """
+        Revert all changes made since the snapshot identified by `token`. Snapshots
+        taken after it are released.
+
+        Bitmap words and tick data fetched from the chain in the meantime are
+        kept, since they hold real (not speculative) data. Empty placeholder
+        words added by updates made without fetching are removed.
+        """
+        with self.update_lock:
+            for i, (snapshot_token, journal_length) in enumerate(
+                self._snapshots
+            ):
+                if snapshot_token == token:
+                    break
+            else:
+                raise LiquidityPoolError(f"Invalid snapshot token {token}")
+
+            del self._snapshots[i:]
+
+            with self.tick_lock:
+                if len(self._journal) > journal_length:
+                    # the version is not journaled, so it never repeats
+                    self.state_version += 1
+                while len(self._journal) > journal_length:
+                    entry = self._journal.pop()
+                    if entry[0] == "attr":
+                        _, name, value = entry
+                        setattr(self, name, value)
+                    elif entry[0] == "item":
+                        _, mapping, key, value = entry
+                        if value is _MISSING:
+                            mapping.pop(key, None)
+                        else:
+                            mapping[key] = value
+                    elif entry[0] == "index":
+                        _, tick, was_initialized = entry
+                        index = bisect_left(self._initialized_ticks, tick)
+                        is_initialized = (
+                            index < len(self._initialized_ticks)
+                            and self._initialized_ticks[index] == tick
+                        )
+                        if was_initialized and not is_initialized:
+                            self._initialized_ticks.insert(index, tick)
+                        elif is_initialized and not was_initialized:
+                            del self._initialized_ticks[index]
+
+            if not self._snapshots:
+                self._journal = None
+
+            if self.concurrent_readers:
+                self._publish_reader_view()
+
+    def _publish_reader_view(self) -> None:
+        """
+        Replace the reader view with a copy of the current pool state. The caller
+        must hold `self.update_lock`.
+
+        The containers are copied shallowly. Tick records are replaced rather than
+        modified by updates, and bitmap words are copied by `_flip_tick` before
+        flipping a bit, so the copy is never changed by later updates.
+        """
+
+        with self.tick_lock:
+            # copy the attributes directly, since copy.copy would use
+            # __getstate__ and discard the contract and locks
+            view = object.__new__(self.__class__)
+            view.__dict__.update(self.__dict__)
+            view.tick_data = self.tick_data.copy()
+            view.tick_bitmap = self.tick_bitmap.copy()
+            view._initialized_ticks = self._initialized_ticks.copy()
+            view._liquidity_net = self._liquidity_net.copy()
+            view.state = self.state.copy()
+            view._swap_segments = {}
+            # quotes through the view record their travel in its own copy
+            view._word_travel = {
+                zeroForOne: stats.copy()
+                for zeroForOne, stats in self._word_travel.items()
+            }
+            view._journal = None
+            view._snapshots = []
+            view.concurrent_readers = False
+            view._reader_view = None
+            view._live_pool = self
+            self._reader_view = view
+
+    def get_reader(self) -> "BaseV3LiquidityPool":
+        """
+        Return a read-only view of the pool for calculating swaps without locks.
+
+        If `concurrent_readers` is set, each update made by
+        `external_update`, `auto_update` or `restore` is applied to the live pool and
+        then published as a new copy of the pool state. Readers holding the previous
+        view are unaffected, so a calculation never sees a partly applied update and
+        never waits for a writer. Use a single view for a series of calculations that
+        must see the same state (e.g. an arbitrage optimization).
+
+        The swap calculation methods of the pool delegate to the current view, so
+        existing callers get the same guarantee for each calculation.
+
+        Bitmap words missing from a sparse view are still fetched from the chain, and
+        are stored in the view and the live pool.
+
+        Returns the pool itself if concurrent readers are not enabled.
+        """
+        return self._reader_view or self
+
+    def _flip_tick(self, tick: int, update_block: Optional[int]) -> None:
+        """
+        Flip the initialized state of a tick in `self.tick_bitmap`, and add
+        or remove it from the sorted index of initialized ticks to match
+        """
+        word_position, bit_position = self._get_tick_bitmap_position(tick)
+
+        if (
+            self._reader_view is not None
+            and word_position in self.tick_bitmap
+        ):
+            # flipTick modifies the word in place, so replace the word shared
+            # with the reader view by a copy first
+            self.tick_bitmap[word_position] = self.tick_bitmap[
+                word_position
+            ].copy()
+
+        if self._journal is not None and word_position in self.tick_bitmap:
+            # flipTick modifies the word in place, so record a copy
+            word = self.tick_bitmap[word_position]
+            self._journal.append(
+                ("item", self.tick_bitmap, word_position, word.copy())
+            )
+            self._journal.append(
+                ("index", tick, bool(word["bitmap"] & (1 << bit_position)))
+            )
+
+        TickBitmap.flipTick(
+            self.tick_bitmap,
+            tick,
+            self.tick_spacing,
+            update_block=update_block,
+        )
+        if self.tick_bitmap[word_position]["bitmap"] & (1 << bit_position):
+            insort(self._initialized_ticks, tick)
+        else:
+            index = bisect_left(self._initialized_ticks, tick)
+            if (
+                index < len(self._initialized_ticks)
+                and self._initialized_ticks[index] == tick
+            ):
+                del self._initialized_ticks[index]
+
+    def _index_tick_bitmap_words(self, words: Dict[int, dict]) -> None:
+        """
+        Add the initialized ticks found in newly-retrieved bitmap words to
+        the sorted index of initialized ticks
+        """
+        new_ticks = []
+        for word_position, word in words.items():
+            bitmap = word["bitmap"]
+            while bitmap:
+                # isolate and clear the lowest set bit
+                lowest_bit = bitmap & -bitmap
+                bitmap ^= lowest_bit
+                new_ticks.append(
+                    ((word_position << 8) + lowest_bit.bit_length() - 1)
+                    * self.tick_spacing
+                )
+
+        if new_ticks:
+            # a word may be fetched twice by competing threads, so discard duplicates
+            self._initialized_ticks = sorted(
+                set(self._initialized_ticks).union(new_ticks)
+            )
+
+    def _rebuild_initialized_ticks(self) -> None:
+        """
+        Rebuild the sorted index of initialized ticks from `self.tick_bitmap`
+        """
+        self._initialized_ticks = []
+        self._index_tick_bitmap_words(
+            {
+                word_position: word
+                for word_position, word in self.tick_bitmap.items()
+                if word_position != "sparse"
+            }
+        )
+
+    def _rebuild_liquidity_net(self) -> None:
+        """
+        Rebuild the flat tick -> liquidityNet mapping from `self.tick_data`
+        """
+        self._liquidity_net = {
+            tick: data["liquidityNet"] for tick, data in self.tick_data.items()
+        }
+
+    def _next_initialized_tick_within_one_word(
+        self,
+        tick: int,
+        lte: bool,
+        override_tick_bitmap: Optional[dict] = None,
+    ) -> Tuple[int, bool]:
+        """
+        Equivalent to `TickBitmap.nextInitializedTickWithinOneWord`, but finds the
+        next initialized tick by bisecting the sorted index instead of decoding
+        the bitmap word.
+
+        The search is still limited to the word holding the starting tick, so the
+        swap steps (and their rounding) are identical to the on-chain contract.
+
+        Raises `BitmapWordUnavailableError` if a sparse bitmap does not hold the word,
+        since the index cannot be trusted for a word that has not been retrieved.
+
+        A word found in `override_tick_bitmap` is decoded directly, since the index
+        only covers the live bitmap.
+        """
+
+        compressed = tick // self.tick_spacing
+        if not lte:
+            compressed += 1
+
+        word_position = compressed >> 8
+
+        if override_tick_bitmap and word_position in override_tick_bitmap:
+            return TickBitmap.nextInitializedTickWithinOneWord(
+                override_tick_bitmap,
+                tick,
+                self.tick_spacing,
+                lte,
+            )
+
+        if (
+            self.tick_bitmap["sparse"]
+            and word_position not in self.tick_bitmap
+        ):
+            raise BitmapWordUnavailableError(word_position)
+
+        initialized_ticks = self._initialized_ticks
+
+        if lte:
+            word_boundary = (word_position << 8) * self.tick_spacing
+            index = bisect_right(
+                initialized_ticks, compressed * self.tick_spacing
+            )
+            if index and initialized_ticks[index - 1] >= word_boundary:
+                return initialized_ticks[index - 1], True
+        else:
+            word_boundary = ((word_position << 8) + 255) * self.tick_spacing
+            index = bisect_left(
+                initialized_ticks, compressed * self.tick_spacing
+            )
+            if (
+                index < len(initialized_ticks)
+                and initialized_ticks[index] <= word_boundary
+            ):
+                return initialized_ticks[index], True
+
+        return word_boundary, False
+
     def _get_tick_bitmap_position(self, tick) -> Tuple[int, int]:
         """
         Retrieves the wordPosition and bitPosition for the input tick
@@ -228,6 +709,161 @@ class BaseV3LiquidityPool(ABC):
             "tick": self.tick,
         }
 
+    def _new_word_travel_stats(self) -> dict:
+        return {
+            "swaps": 0,
+            # exponential moving average of the words travelled per swap
+            "average_words": 0.0,
+            # largest distance seen, decayed at each swap so that the window
+            # shrinks again once a pool settles down
+            "peak_words": float(max(0, self.extra_words // 2 - 1)),
+        }
+
+    def _record_word_travel(
+        self,
+        zeroForOne: bool,
+        start_tick: int,
+        end_tick: int,
+    ) -> None:
+        """
+        Record the number of bitmap words between the start and end tick of a swap,
+        if `adaptive_extra_words` is set
+        """
+
+        if not self.adaptive_extra_words:
+            return
+
+        words = abs(
+            (end_tick // self.tick_spacing >> 8)
+            - (start_tick // self.tick_spacing >> 8)
+        )
+        stats = self._word_travel[zeroForOne]
+        stats["swaps"] += 1
+        stats["average_words"] += _WORD_TRAVEL_SMOOTHING * (
+            words - stats["average_words"]
+        )
+        stats["peak_words"] = max(
+            float(words), stats["peak_words"] * _WORD_TRAVEL_DECAY
+        )
+
+    def _get_prefetch_window(self, zeroForOne: bool) -> int:
+        """
+        Return the number of words to prefetch beyond the requested word in the
+        direction of the swap (zeroForOne moves towards lower words)
+        """
+
+        if not self.adaptive_extra_words:
+            return (
+                self.extra_words // 2
+                if zeroForOne
+                else self.extra_words // 2 - 1
+            )
+
+        return min(
+            _MAX_PREFETCH_WORDS,
+            ceil(self._word_travel[zeroForOne]["peak_words"]) + 1,
+        )
+
+    def get_prefetch_stats(self) -> Dict[str, dict]:
+        """
+        Return the swap travel statistics and the current prefetch window (in words)
+        for each direction
+        """
+
+        return {
+            direction: {
+                **self._word_travel[zeroForOne],
+                "window": self._get_prefetch_window(zeroForOne),
+            }
+            for direction, zeroForOne in (
+                ("zeroForOne", True),
+                ("oneForZero", False),
+            )
+        }
+
+    def _get_missing_tick_words(
+        self,
+        word_position: Optional[int] = None,
+    ) -> Set[int]:
+        """
+        Return the bitmap words within the prefetch window around `word_position`
+        (default: the word holding the current tick) that are not yet known.
+
+        The window spans `extra_words`, or is sized separately for each direction
+        if `adaptive_extra_words` is set.
+        """
+
+        if word_position is None:
+            word_position, _ = self._get_tick_bitmap_position(self.tick)
+
+        # limit word values to int16 range
+        return set(
+            range(
+                max(
+                    MIN_INT16,
+                    word_position - self._get_prefetch_window(True),
+                ),
+                min(
+                    MAX_INT16,
+                    word_position + self._get_prefetch_window(False) + 1,
+                ),
+            )
+        ) - set(self.tick_bitmap)
+
+    def _store_tick_words(
+        self,
+        tick_bitmaps: Dict[int, dict],
+        tick_data: Dict[int, dict],
+        block_number: int,
+    ) -> None:
+        """
+        Store retrieved bitmap words (word -> {"bitmap", "block"}) and the populated
+        ticks inside them (tick -> {"liquidityNet", "liquidityGross", "block"}), and
+        update the derived indexes. The caller must hold `self.tick_lock`.
+
+        The words are stored last, so a concurrent reader never finds a word
+        without its ticks. Words missing from the live pool or the reader view
+        are stored there too, since they hold chain data.
+        """
+
+        if self.compact_tick_storage:
+            stored_tick_bitmaps = compact_tick_bitmap(tick_bitmaps)
+            stored_tick_data = compact_tick_data(tick_data)
+        else:
+            stored_tick_bitmaps, stored_tick_data = tick_bitmaps, tick_data
+        # update the liquidity data
+        self.tick_data.update(stored_tick_data)
+        self._liquidity_net.update(
+            {
+                tick: data["liquidityNet"]
+                for tick, data in stored_tick_data.items()
+            }
+        )
+        # update the bitmaps
+        self._index_tick_bitmap_words(stored_tick_bitmaps)
+        self.tick_bitmap.update(stored_tick_bitmaps)
+        # update the block
+        self.liquidity_update_block = block_number
+
+        for pool in (self._live_pool, self._reader_view):
+            if pool is None:
+                continue
+            missing_words = {
+                word: tick_bitmaps[word]
+                for word in tick_bitmaps
+                if word not in pool.tick_bitmap
+            }
+            if missing_words:
+                pool._store_tick_words(
+                    missing_words,
+                    {
+                        tick: data
+                        for tick, data in tick_data.items()
+                        if (tick // self.tick_spacing) >> 8 in missing_words
+                    },
+                    block_number,
+                )
+
     def _update_tick_data_at_word(
         self,
         word_position: int,
@@ -274,13 +910,7 @@ class BaseV3LiquidityPool(ABC):
                 network.main.CONFIG.active_network.get("multicall2")
                 and not single_word
             ):
-                # limit word values to int16 range
-                words = set(
-                    range(
-                        max(MIN_INT16, word_position - self.extra_words // 2),
-                        min(MAX_INT16, word_position + self.extra_words // 2),
-                    )
-                ) - set(self.tick_bitmap)
+                words = self._get_missing_tick_words(word_position)
 
                 logger.debug(f"fetching words: {words}")
 
@@ -317,319 +947,960 @@ class BaseV3LiquidityPool(ABC):
                     print(type(e))
                     raise
                 else:
-                    # update the bitmaps
-                    self.tick_bitmap.update(multicall_tick_bitmaps)
-                    # update the liquidity data
-                    self.tick_data.update(multicall_tick_data)
-                    # update the block
-                    self.liquidity_update_block = block_number
+                    self._store_tick_words(
+                        multicall_tick_bitmaps,
+                        multicall_tick_data,
+                        block_number,
+                    )
 
             # fetch words one by one (single_tick = True)
             else:
-                try:
-                    if single_tick_bitmap := self._brownie_contract.tickBitmap(
-                        word_position,
-                        block_identifier=block_number,
-                    ):
-                        single_tick_data = self.lens._brownie_contract.getPopulatedTicksInWord(
-                            self.address,
-                            word_position,
-                            block_identifier=block_number,
-                        )
-                except Exception as e:
-                    print(
-                        f"(V3LiquidityPool) (_update_tick_data_at_word) (single tick): {e}"
-                    )
-                    print(type(e))
-                    raise
-                else:
-                    self.tick_bitmap[word_position] = {
-                        "bitmap": single_tick_bitmap,
-                        "block": block_number,
-                    }
-                    if single_tick_bitmap:
-                        for (
-                            tick,
-                            liquidity_net,
-                            liquidity_gross,
-                        ) in single_tick_data:
-                            self.tick_data[tick] = {
-                                "liquidityNet": liquidity_net,
-                                "liquidityGross": liquidity_gross,
-                                "block": block_number,
-                            }
-                    self.liquidity_update_block = block_number
+                self._store_tick_words(
+                    *self._fetch_tick_word(word_position, block_number),
+                    block_number,
+                )
 
-    def __UniswapV3Pool_swap(
+    def _fetch_tick_word(
         self,
-        zeroForOne: bool,
-        amount_specified: int,
-        sqrt_price_limit_x96: int,
-        override_start_liquidity: Optional[int] = None,
-        override_start_sqrt_price_x96: Optional[int] = None,
-        override_start_tick: Optional[int] = None,
-        # TODO: support tick data overrides
-        override_tick_data: Optional[dict] = None,
-        # TODO: support tick bitmap overrides
-        override_tick_bitmap: Optional[dict] = None,
-    ) -> Tuple[int, int, int, int, int]:
+        word_position: int,
+        block_number: int,
+    ) -> Tuple[Dict[int, dict], Dict[int, dict]]:
+        """
+        Retrieve a single bitmap word and the populated ticks inside it at
+        `block_number`, without storing them. Returns the word and tick dictionaries
+        in the format accepted by `_store_tick_words`.
         """
-        This function is ported and adapted from the UniswapV3Pool.sol contract
-        at https://github.com/Uniswap/v3-core/blob/main/contracts/UniswapV3Pool.sol
 
-        It is called by the `calculate_tokens_in_from_tokens_out` and `calculate_tokens_out_from_tokens_in` methods to calculate
-        swap amounts, ticks crossed, liquidity changes at various ticks, etc.
+        try:
+            if single_tick_bitmap := self._brownie_contract.tickBitmap(
+                word_position,
+                block_identifier=block_number,
+            ):
+                single_tick_data = self.lens._brownie_contract.getPopulatedTicksInWord(
+                    self.address,
+                    word_position,
+                    block_identifier=block_number,
+                )
+        except Exception as e:
+            print(f"(V3LiquidityPool) (_fetch_tick_word): {e}")
+            print(type(e))
+            raise
 
-        It is a double-underscore method and is thus obscured from external access (but still accessible if you know how).
+        return (
+            {
+                word_position: {
+                    "bitmap": single_tick_bitmap,
+                    "block": block_number,
+                }
+            },
+            {
+                tick: {
+                    "liquidityNet": liquidity_net,
+                    "liquidityGross": liquidity_gross,
+                    "block": block_number,
+                }
+                for (
+                    tick,
+                    liquidity_net,
+                    liquidity_gross,
+                ) in (single_tick_data if single_tick_bitmap else [])
+            },
+        )
+
+    def _get_swap_tick_next(
+        self,
+        tick: int,
+        zeroForOne: bool,
+        override_tick_bitmap: Optional[dict] = None,
+    ) -> Tuple[int, bool]:
         """
+        Find the next tick (initialized, or the boundary of the current word) in
+        the direction of the swap, fetching any bitmap words that are not yet known
+        to a sparse helper. The result is clamped to the MIN_TICK/MAX_TICK range.
 
-        if amount_specified == 0:
-            raise EVMRevertError("AS")
+        Words in `override_tick_bitmap` take precedence over the live bitmap.
+        """
 
-        if override_start_liquidity is not None:
-            liquidity = override_start_liquidity
-        else:
-            liquidity = self.liquidity
+        while True:
+            try:
+                (
+                    tick_next,
+                    initialized,
+                ) = self._next_initialized_tick_within_one_word(
+                    tick,
+                    zeroForOne,
+                    override_tick_bitmap,
+                )
+            except BitmapWordUnavailableError as e:
+                # only raised for a sparse bitmap, since a word missing from a
+                # complete bitmap is empty
+                missing_word = e.args[-1]
+                # BUG: 'word_position=XXX inside known range' exception is being thrown here
+                # when the helper is being updated by multiple threads
+                logger.debug(
+                    f"(swap) {self.name} fetching word {missing_word}"
+                )
+                self._update_tick_data_at_word(
+                    missing_word,
+                    # single_word=True,
+                )
+            else:
+                # nextInitializedTickWithinOneWord will search up to 256 ticks away, which may
+                # return a tick in an adjacent word if there are no initialized ticks in the current word.
+                # This word may not be known to the helper, so check and fetch the containing word for this tick
 
-        if override_start_sqrt_price_x96 is not None:
-            sqrt_price_x96 = override_start_sqrt_price_x96
-        else:
-            sqrt_price_x96 = self.sqrt_price_x96
+                # BUGFIX: previously called position directly, which implies tickSpacing=1,
+                # so the call returned an inaccurate word and short-circuited the optimization
+                # (the word position is only needed, and calculated, for sparse bitmaps)
+                if (
+                    self.tick_bitmap["sparse"]
+                    and (
+                        tick_next_word := (tick_next // self.tick_spacing)
+                        >> 8
+                    )
+                    not in self.tick_bitmap
+                    and not (
+                        override_tick_bitmap
+                        and tick_next_word in override_tick_bitmap
+                    )
+                ):
+                    logger.debug(
+                        f"tickNext={tick_next} out of range! Fetching word={tick_next_word}"
+                        f"\n{self.name}"
+                    )
+                    self._update_tick_data_at_word(
+                        tick_next_word,
+                        single_word=True,
+                    )
+                break
 
-        if override_start_tick is not None:
-            tick = override_start_tick
-        else:
-            tick = self.tick
+        # ensure that we do not overshoot the min/max tick, as the tick bitmap is not aware of these bounds
+        if tick_next < TickMath.MIN_TICK:
+            tick_next = TickMath.MIN_TICK
+        elif tick_next > TickMath.MAX_TICK:
+            tick_next = TickMath.MAX_TICK
 
-        if not (
-            sqrt_price_limit_x96 < sqrt_price_x96
-            and sqrt_price_limit_x96 > TickMath.MIN_SQRT_RATIO
-            if zeroForOne
-            else sqrt_price_limit_x96 > sqrt_price_x96
-            and sqrt_price_limit_x96 < TickMath.MAX_SQRT_RATIO
-        ):
-            raise EVMRevertError(f"SPL")
+        return tick_next, initialized
 
-        cache = {
-            "liquidityStart": liquidity,
-            "tickCumulative": 0,
-            # ignored attributes:
-            #   - blockTimestamp
-            #   - feeProtocol
-            #   - secondsPerLiquidityCumulativeX128
-            #   - computedLatestObservation
-        }
+    def _cross_tick(
+        self,
+        tick: int,
+        liquidity: int,
+        zeroForOne: bool,
+        override_tick_data: Optional[dict] = None,
+    ) -> int:
+        """
+        Apply the liquidityNet of an initialized tick to the in-range liquidity
+        when the swap crosses it, and return the new liquidity
+        """
 
-        exactInput: bool = amount_specified > 0
+        try:
+            if override_tick_data and tick in override_tick_data:
+                liquidity_net = override_tick_data[tick]["liquidityNet"]
+            else:
+                liquidity_net = self._liquidity_net[tick]
+        except KeyError:
+            raise ArbitrageError(
+                "Tick bitmap or liquidity data is out of date"
+            ) from None
 
-        state = {
-            "amountSpecifiedRemaining": amount_specified,
-            "amountCalculated": 0,
-            "sqrtPriceX96": sqrt_price_x96,
-            "tick": tick,
-            "liquidity": cache["liquidityStart"],
-            # ignored attributes:
-            #   - feeGrowthGlobalX128
-            #   - protocolFee
-        }
+        if zeroForOne:
+            liquidity_net = -liquidity_net
 
-        while (
-            state["amountSpecifiedRemaining"] != 0
-            and state["sqrtPriceX96"] != sqrt_price_limit_x96
-        ):
-            step = {}
+        return LiquidityMath.addDelta(liquidity, liquidity_net)
 
-            step["sqrtPriceStartX96"] = state["sqrtPriceX96"]
+    def _instrument_swap_functions(
+        self,
+        telemetry: dict,
+        get_swap_tick_next: Callable,
+        get_sqrt_ratio_at_tick: Callable,
+        get_tick_at_sqrt_ratio: Callable,
+        compute_swap_step: Callable,
+        add_delta: Callable,
+    ) -> Tuple[Callable, Callable, Callable, Callable, Callable]:
+        """
+        Reset the `telemetry` dictionary, and return wrappers for the functions called by the
+        swap loop that record into it:
+            - 'steps': the number of swap steps
+            - 'ticks_crossed': the number of initialized ticks crossed
+            - 'words_touched': the bitmap words searched for the next tick, in order
+            - 'words_fetched': the number of bitmap words fetched from the chain mid-swap
+            - 'calls' and 'time': the number of calls to, and the time (in seconds) spent
+              in, each function
+        """
+
+        telemetry.clear()
+        telemetry.update(
+            {
+                "steps": 0,
+                "ticks_crossed": 0,
+                "words_touched": [],
+                "words_fetched": 0,
+                "calls": {},
+                "time": {},
+            }
+        )
+        calls = telemetry["calls"]
+        times = telemetry["time"]
 
-            while True:
+        def instrument(name: str, function: Callable) -> Callable:
+            calls[name] = 0
+            times[name] = 0.0
+
+            def wrapper(*args):
+                start = perf_counter()
                 try:
-                    (
-                        step["tickNext"],
-                        step["initialized"],
-                    ) = TickBitmap.nextInitializedTickWithinOneWord(
-                        self.tick_bitmap,
-                        state["tick"],
-                        self.tick_spacing,
-                        zeroForOne,
-                    )
-                except BitmapWordUnavailableError as e:
-                    missing_word = e.args[-1]
-                    if self.tick_bitmap["sparse"]:
-                        # BUG: 'word_position=XXX inside known range' exception is being thrown here
-                        # when the helper is being updated by multiple threads
-                        logger.debug(
-                            f"(swap) {self.name} fetching word {missing_word}"
-                        )
-                        self._update_tick_data_at_word(
-                            missing_word,
-                            # single_word=True,
-                        )
-                    else:
-                        self.tick_bitmap[missing_word] = {
-                            "bitmap": 0,
-                            "block": None,
-                        }
-                else:
-                    # nextInitializedTickWithinOneWord will search up to 256 ticks away, which may
-                    # return a tick in an adjacent word if there are no initialized ticks in the current word.
-                    # This word may not be known to the helper, so check and fetch the containing word for this tick
-
-                    # BUGFIX: previously called position directly, which implies tickSpacing=1,
-                    # so the call returned an inaccurate word and short-circuited the optimization
-                    tick_next_word, _ = self._get_tick_bitmap_position(
-                        step["tickNext"]
-                    )
+                    return function(*args)
+                finally:
+                    times[name] += perf_counter() - start
+                    calls[name] += 1
+
+            return wrapper
+
+        tick_spacing = self.tick_spacing
+        tick_bitmap = self.tick_bitmap
+        words_touched = telemetry["words_touched"]
+        timed_get_swap_tick_next = instrument(
+            "_get_swap_tick_next", get_swap_tick_next
+        )
 
-                    if (
-                        self.tick_bitmap["sparse"]
-                        and tick_next_word not in self.tick_bitmap
-                    ):
-                        logger.debug(
-                            f'tickNext={step["tickNext"]} out of range! Fetching word={tick_next_word}'
-                            f"\n{self.name}"
-                        )
-                        self._update_tick_data_at_word(
-                            tick_next_word,
-                            single_word=True,
-                        )
-                    break
+        def instrumented_get_swap_tick_next(tick, zeroForOne, *args):
+            # the word searched by nextInitializedTickWithinOneWord
+            words_touched.append(
+                (tick // tick_spacing + (0 if zeroForOne else 1)) >> 8
+            )
+            words_known = len(tick_bitmap)
+            try:
+                return timed_get_swap_tick_next(tick, zeroForOne, *args)
+            finally:
+                telemetry["words_fetched"] += len(tick_bitmap) - words_known
+
+        timed_compute_swap_step = instrument(
+            "computeSwapStep", compute_swap_step
+        )
 
-            # ensure that we do not overshoot the min/max tick, as the tick bitmap is not aware of these bounds
-            if step["tickNext"] < TickMath.MIN_TICK:
-                step["tickNext"] = TickMath.MIN_TICK
-            elif step["tickNext"] > TickMath.MAX_TICK:
-                step["tickNext"] = TickMath.MAX_TICK
+        def instrumented_compute_swap_step(*args):
+            telemetry["steps"] += 1
+            return timed_compute_swap_step(*args)
 
-            # get the price for the next tick
-            step["sqrtPriceNextX96"] = TickMath.getSqrtRatioAtTick(
-                step["tickNext"]
+        timed_add_delta = instrument("addDelta", add_delta)
+
+        def instrumented_add_delta(*args):
+            # only called for an initialized tick transition
+            telemetry["ticks_crossed"] += 1
+            return timed_add_delta(*args)
+
+        return (
+            instrumented_get_swap_tick_next,
+            instrument("getSqrtRatioAtTick", get_sqrt_ratio_at_tick),
+            instrument("getTickAtSqrtRatio", get_tick_at_sqrt_ratio),
+            instrumented_compute_swap_step,
+            instrumented_add_delta,
+        )
+
+    def __UniswapV3Pool_swap(
+        self,
+        zeroForOne: bool,
+        amount_specified: int,
+        sqrt_price_limit_x96: int,
+        override_start_liquidity: Optional[int] = None,
+        override_start_sqrt_price_x96: Optional[int] = None,
+        override_start_tick: Optional[int] = None,
+        override_tick_data: Optional[dict] = None,
+        override_tick_bitmap: Optional[dict] = None,
+        unchecked: bool = False,
+        telemetry: Optional[dict] = None,
+    ) -> Tuple[int, int, int, int, int]:
+        """
+        This function is ported and adapted from the UniswapV3Pool.sol contract
+        at https://github.com/Uniswap/v3-core/blob/main/contracts/UniswapV3Pool.sol
+
+        It is called by the `calculate_tokens_in_from_tokens_out` and `calculate_tokens_out_from_tokens_in` methods to calculate
+        swap amounts, ticks crossed, liquidity changes at various ticks, etc.
+
+        `override_tick_data` (tick -> tick data) and `override_tick_bitmap` (word -> word data)
+        are copy-on-write overlays: their entries replace the matching ticks and words of the
+        live pool data for this calculation only, and the live data is not copied or modified.
+
+        If `unchecked` is set, the amount, starting price, liquidity and fee are validated once,
+        and the swap steps are calculated with the `UncheckedMath` functions, which skip the
+        per-call range checks. The ending liquidity is validated after the loop. Results are
+        identical for a consistent pool state.
+
+        If a `telemetry` dictionary is provided, it is filled with the details of the swap
+        traversal (see `_instrument_swap_functions`). The loop is unchanged, and only the
+        functions it calls are wrapped, so there is no cost when telemetry is not requested.
+
+        It is a double-underscore method and is thus obscured from external access (but still accessible if you know how).
+        """
+
+        if amount_specified == 0:
+            raise EVMRevertError("AS")
+
+        if override_start_liquidity is not None:
+            liquidity = override_start_liquidity
+        else:
+            liquidity = self.liquidity
+
+        if override_start_sqrt_price_x96 is not None:
+            sqrt_price_x96 = override_start_sqrt_price_x96
+        else:
+            sqrt_price_x96 = self.sqrt_price_x96
+
+        if override_start_tick is not None:
+            tick = override_start_tick
+        else:
+            tick = self.tick
+
+        if not (
+            sqrt_price_limit_x96 < sqrt_price_x96
+            and sqrt_price_limit_x96 > TickMath.MIN_SQRT_RATIO
+            if zeroForOne
+            else sqrt_price_limit_x96 > sqrt_price_x96
+            and sqrt_price_limit_x96 < TickMath.MAX_SQRT_RATIO
+        ):
+            raise EVMRevertError(f"SPL")
+
+        exactInput: bool = amount_specified > 0
+        fee = self.fee
+
+        if unchecked:
+            # validate the values that the unchecked library functions rely on
+            if not (MIN_INT256 <= amount_specified <= MAX_INT256):
+                raise EVMRevertError("amount not a valid int256")
+            if not (0 <= liquidity <= MAX_UINT128):
+                raise EVMRevertError("liquidity not a valid uint128")
+            if not (
+                TickMath.MIN_SQRT_RATIO
+                <= sqrt_price_x96
+                < TickMath.MAX_SQRT_RATIO
+            ):
+                raise EVMRevertError("R")
+            if not (0 <= fee < 10**6):
+                raise EVMRevertError("fee out of range")
+
+        # The loop state is held in locals and the library functions are
+        # bound once per call, instead of building `cache`, `state` and `step`
+        # dicts for every step as the contract does. Ignored contract state:
+        #   - blockTimestamp
+        #   - feeProtocol
+        #   - feeGrowthGlobalX128
+        #   - protocolFee
+        #   - secondsPerLiquidityCumulativeX128
+        #   - computedLatestObservation
+        #   - tickCumulative
+        get_swap_tick_next = self._get_swap_tick_next
+        get_sqrt_ratio_at_tick = TickMath.getSqrtRatioAtTick
+        get_tick_at_sqrt_ratio = TickMath.getTickAtSqrtRatio
+        if unchecked:
+            compute_swap_step = UncheckedMath.computeSwapStep
+            add_delta = UncheckedMath.addDelta
+        else:
+            compute_swap_step = SwapMath.computeSwapStep
+            add_delta = LiquidityMath.addDelta
+        liquidity_nets: Mapping[int, int] = self._liquidity_net
+        if override_tick_data:
+            liquidity_nets = ChainMap(
+                {
+                    tick: data["liquidityNet"]
+                    for tick, data in override_tick_data.items()
+                },
+                liquidity_nets,
+            )
+
+        if telemetry is not None:
+            (
+                get_swap_tick_next,
+                get_sqrt_ratio_at_tick,
+                get_tick_at_sqrt_ratio,
+                compute_swap_step,
+                add_delta,
+            ) = self._instrument_swap_functions(
+                telemetry,
+                get_swap_tick_next,
+                get_sqrt_ratio_at_tick,
+                get_tick_at_sqrt_ratio,
+                compute_swap_step,
+                add_delta,
             )
 
+        amount_specified_remaining = amount_specified
+        amount_calculated = 0
+
+        while (
+            amount_specified_remaining != 0
+            and sqrt_price_x96 != sqrt_price_limit_x96
+        ):
+            sqrt_price_start_x96 = sqrt_price_x96
+
+            tick_next, initialized = get_swap_tick_next(
+                tick, zeroForOne, override_tick_bitmap
+            )
+
+            # get the price for the next tick
+            sqrt_price_next_x96 = get_sqrt_ratio_at_tick(tick_next)
+
             # compute values to swap to the target tick, price limit, or point where input/output amount is exhausted
             (
-                state["sqrtPriceX96"],
-                step["amountIn"],
-                step["amountOut"],
-                step["feeAmount"],
-            ) = SwapMath.computeSwapStep(
-                state["sqrtPriceX96"],
+                sqrt_price_x96,
+                step_amount_in,
+                step_amount_out,
+                step_fee_amount,
+            ) = compute_swap_step(
+                sqrt_price_x96,
                 sqrt_price_limit_x96
                 if (
-                    step["sqrtPriceNextX96"] < sqrt_price_limit_x96
+                    sqrt_price_next_x96 < sqrt_price_limit_x96
                     if zeroForOne
-                    else step["sqrtPriceNextX96"] > sqrt_price_limit_x96
+                    else sqrt_price_next_x96 > sqrt_price_limit_x96
                 )
-                else step["sqrtPriceNextX96"],
-                state["liquidity"],
-                state["amountSpecifiedRemaining"],
-                self.fee,
+                else sqrt_price_next_x96,
+                liquidity,
+                amount_specified_remaining,
+                fee,
             )
 
+            # int256 overflow checks are inlined from `to_int256`
             if exactInput:
-                state["amountSpecifiedRemaining"] -= to_int256(
-                    step["amountIn"] + step["feeAmount"]
-                )
-                state["amountCalculated"] = to_int256(
-                    state["amountCalculated"] - step["amountOut"]
-                )
+                step_amount_in += step_fee_amount
+                if step_amount_in > MAX_INT256:
+                    raise EVMRevertError
+                amount_specified_remaining -= step_amount_in
+                amount_calculated -= step_amount_out
             else:
-                state["amountSpecifiedRemaining"] += to_int256(
-                    step["amountOut"]
-                )
-                state["amountCalculated"] = to_int256(
-                    state["amountCalculated"]
-                    + step["amountIn"]
-                    + step["feeAmount"]
-                )
+                if step_amount_out > MAX_INT256:
+                    raise EVMRevertError
+                amount_specified_remaining += step_amount_out
+                amount_calculated += step_amount_in + step_fee_amount
+                if amount_calculated > MAX_INT256:
+                    raise EVMRevertError
 
             # shift tick if we reached the next price
-            if state["sqrtPriceX96"] == step["sqrtPriceNextX96"]:
+            if sqrt_price_x96 == sqrt_price_next_x96:
                 # if the tick is initialized, run the tick transition
-                if step["initialized"]:
-                    # use the default value (0, 0) so the tuple assignment works. Throws exception
-                    # if the default value None is returned from get()
-                    # liquidityNet, liquidityGross = self.tick_data.get(
-                    #     step["tickNext"],
-                    #     (0, 0),
-                    # )
-
+                if initialized:
                     try:
-                        # liquidityNet, liquidityGross = self.tick_data[
-                        #     step["tickNext"]
-                        # ]
-                        liquidityNet = self.tick_data[step["tickNext"]][
-                            "liquidityNet"
-                        ]
-                        liquidityGross = self.tick_data[step["tickNext"]][
-                            "liquidityGross"
-                        ]
+                        liquidity_net = liquidity_nets[tick_next]
                     except KeyError:
-                        # current_tick_word, _ = self._get_tick_bitmap_position(
-                        #     state["tick"]
-                        # )
-                        # next_tick_word, _ = self._get_tick_bitmap_position(
-                        #     step["tickNext"]
-                        # )
                         raise ArbitrageError(
                             "Tick bitmap or liquidity data is out of date"
-                            # f"(UniswapLpCycle) swap function indicated tick={step['tickNext']} was initialized, but tick_data has no data for this tick!"
-                            # f"\nPool address = {self.address}"
-                            # f"\nCurrent: Tick={state['tick']}, Word={current_tick_word}"
-                            # f"\nNext   : Tick={step['tickNext']}, Word={next_tick_word}"
-                            # f"\nBlock  : {chain.height}"
                         ) from None
-
-                    # if (liquidityNet, liquidityGross) == (0, 0):
-                    #     current_tick_word, _ = self._get_tick_bitmap_position(
-                    #         state["tick"]
-                    #     )
-                    #     next_tick_word, _ = self._get_tick_bitmap_position(
-                    #         step["tickNext"]
-                    #     )
-                    #     # WIP: investigate if this error is thrown when the next tick is on a word boundary
-                    #     raise ArbitrageError(
-                    #         f"(UniswapLpCycle) swap function indicated tick={step['tickNext']} was initialized, but tick_data has no data for this tick!"
-                    #         f"\nPool address = {self.address}"
-                    #         f"\nCurrent: Tick={state['tick']}, Word={current_tick_word}"
-                    #         f"\nNext   : Tick={step['tickNext']}, Word={next_tick_word}"
-                    #         f"\nBlock  : {chain.height}"
-                    #     )
-
-                    if zeroForOne:
-                        liquidityNet = -liquidityNet
-
-                    state["liquidity"] = LiquidityMath.addDelta(
-                        state["liquidity"], liquidityNet
+                    liquidity = add_delta(
+                        liquidity,
+                        -liquidity_net if zeroForOne else liquidity_net,
                     )
 
-                state["tick"] = (
-                    step["tickNext"] - 1 if zeroForOne else step["tickNext"]
-                )
+                tick = tick_next - 1 if zeroForOne else tick_next
 
-            elif state["sqrtPriceX96"] != step["sqrtPriceStartX96"]:
+            elif sqrt_price_x96 != sqrt_price_start_x96:
                 # recompute unless we're on a lower tick boundary (i.e. already transitioned ticks), and haven't moved
-                state["tick"] = TickMath.getTickAtSqrtRatio(
-                    state["sqrtPriceX96"]
-                )
+                tick = get_tick_at_sqrt_ratio(sqrt_price_x96)
+
+        # consistent tick data keeps the liquidity in range at every
+        # crossing, so the unchecked crossings are only verified at the end
+        if unchecked and not (0 <= liquidity <= MAX_UINT128):
+            raise EVMRevertError("LS" if liquidity < 0 else "LA")
 
         amount0, amount1 = (
             (
-                amount_specified - state["amountSpecifiedRemaining"],
-                state["amountCalculated"],
+                amount_specified - amount_specified_remaining,
+                amount_calculated,
             )
             if zeroForOne == exactInput
             else (
-                state["amountCalculated"],
-                amount_specified - state["amountSpecifiedRemaining"],
+                amount_calculated,
+                amount_specified - amount_specified_remaining,
+            )
+        )
+
+        return (
+            amount0,
+            amount1,
+            sqrt_price_x96,
+            liquidity,
+            tick,
+        )
+
+    def __UniswapV3Pool_swap_batch(
+        self,
+        zeroForOne: bool,
+        amounts_specified: List[int],
+        sqrt_price_limit_x96: int,
+        override_start_liquidity: Optional[int] = None,
+        override_start_sqrt_price_x96: Optional[int] = None,
+        override_start_tick: Optional[int] = None,
+        override_tick_data: Optional[dict] = None,
+        override_tick_bitmap: Optional[dict] = None,
+    ) -> List[Tuple[int, int, int, int, int]]:
+        """
+        Calculate the result of `__UniswapV3Pool_swap` for several amounts of the same
+        sign (all exact input or all exact output), with a single traversal of the
+        tick ranges. Results are returned in the same order as `amounts_specified`.
+
+        A swap step that reaches its target price consumes the same amounts no matter
+        how much input/output remains, so all pending swaps share the step. At each
+        step, any swap that cannot reach the target is "peeled off" and finished from
+        the shared state by `__UniswapV3Pool_swap`, which usually takes a single
+        step. The results are therefore identical to calling `__UniswapV3Pool_swap`
+        once per amount.
+
+        Any simulated revert is raised for the whole batch.
+        """
+
+        if not amounts_specified:
+            return []
+
+        if 0 in amounts_specified:
+            raise EVMRevertError("AS")
+
+        exactInput: bool = amounts_specified[0] > 0
+
+        if any((amount > 0) != exactInput for amount in amounts_specified):
+            raise ValueError(
+                "Amounts must be all positive (exact input) or all negative (exact output)"
+            )
+
+        if override_start_liquidity is not None:
+            liquidity = override_start_liquidity
+        else:
+            liquidity = self.liquidity
+
+        if override_start_sqrt_price_x96 is not None:
+            sqrt_price_x96 = override_start_sqrt_price_x96
+        else:
+            sqrt_price_x96 = self.sqrt_price_x96
+
+        if override_start_tick is not None:
+            tick = override_start_tick
+        else:
+            tick = self.tick
+
+        if not (
+            sqrt_price_limit_x96 < sqrt_price_x96
+            and sqrt_price_limit_x96 > TickMath.MIN_SQRT_RATIO
+            if zeroForOne
+            else sqrt_price_limit_x96 > sqrt_price_x96
+            and sqrt_price_limit_x96 < TickMath.MAX_SQRT_RATIO
+        ):
+            raise EVMRevertError(f"SPL")
+
+        # indices of the unfinished swaps, ordered by the magnitude of the amount
+        pending = sorted(
+            range(len(amounts_specified)),
+            key=lambda i: abs(amounts_specified[i]),
+        )
+        results: List[Tuple[int, int, int, int, int]] = [
+            (0, 0, 0, 0, 0)
+        ] * len(amounts_specified)
+
+        # running totals for the steps shared by all pending swaps. The amount
+        # remaining for swap i is `amounts_specified[i] - amount_specified_used`
+        amount_specified_used = 0
+        amount_calculated = 0
+
+        def record_result(
+            i: int,
+            amount_specified_used: int,
+            amount_calculated: int,
+            sqrt_price_x96: int,
+            liquidity: int,
+            tick: int,
+        ) -> None:
+            amount0, amount1 = (
+                (amount_specified_used, amount_calculated)
+                if zeroForOne == exactInput
+                else (amount_calculated, amount_specified_used)
+            )
+            results[i] = (amount0, amount1, sqrt_price_x96, liquidity, tick)
+
+        def finish_swap(i: int) -> None:
+            # complete the swap from the current shared state
+            (
+                amount0,
+                amount1,
+                end_sqrt_price_x96,
+                end_liquidity,
+                end_tick,
+            ) = self.__UniswapV3Pool_swap(
+                zeroForOne=zeroForOne,
+                amount_specified=amounts_specified[i] - amount_specified_used,
+                sqrt_price_limit_x96=sqrt_price_limit_x96,
+                override_start_liquidity=liquidity,
+                override_start_sqrt_price_x96=sqrt_price_x96,
+                override_start_tick=tick,
+                override_tick_data=override_tick_data,
+                override_tick_bitmap=override_tick_bitmap,
+            )
+            used, calculated = (
+                (amount0, amount1)
+                if zeroForOne == exactInput
+                else (amount1, amount0)
+            )
+            record_result(
+                i,
+                amount_specified_used + used,
+                amount_calculated + calculated,
+                end_sqrt_price_x96,
+                end_liquidity,
+                end_tick,
+            )
+
+        while pending:
+            if sqrt_price_x96 == sqrt_price_limit_x96:
+                for i in pending:
+                    record_result(
+                        i,
+                        amount_specified_used,
+                        amount_calculated,
+                        sqrt_price_x96,
+                        liquidity,
+                        tick,
+                    )
+                break
+
+            sqrt_price_start_x96 = sqrt_price_x96
+
+            tick_next, initialized = self._get_swap_tick_next(
+                tick, zeroForOne, override_tick_bitmap
+            )
+            sqrt_price_next_x96 = TickMath.getSqrtRatioAtTick(tick_next)
+            sqrt_price_target_x96 = (
+                sqrt_price_limit_x96
+                if (
+                    sqrt_price_next_x96 < sqrt_price_limit_x96
+                    if zeroForOne
+                    else sqrt_price_next_x96 > sqrt_price_limit_x96
+                )
+                else sqrt_price_next_x96
+            )
+
+            # the largest swap determines whether any swap completes the step
+            (
+                sqrt_price_step_x96,
+                step_amount_in,
+                step_amount_out,
+                step_fee_amount,
+            ) = SwapMath.computeSwapStep(
+                sqrt_price_x96,
+                sqrt_price_target_x96,
+                liquidity,
+                amounts_specified[pending[-1]] - amount_specified_used,
+                self.fee,
+            )
+
+            if sqrt_price_step_x96 != sqrt_price_target_x96:
+                # every pending swap will finish inside this step
+                for i in pending:
+                    finish_swap(i)
+                break
+
+            # peel off the swaps that cannot reach the target price
+            while pending:
+                amount_remaining = (
+                    amounts_specified[pending[0]] - amount_specified_used
+                )
+                if exactInput:
+                    reaches_target = (
+                        FullMath.mulDiv(
+                            amount_remaining, 10**6 - self.fee, 10**6
+                        )
+                        >= step_amount_in
+                    )
+                else:
+                    reaches_target = -amount_remaining >= step_amount_out
+                if reaches_target:
+                    break
+                finish_swap(pending.pop(0))
+
+            if not pending:
+                break
+
+            # advance the shared state through the step
+            if exactInput:
+                amount_specified_used += step_amount_in + step_fee_amount
+                amount_calculated -= step_amount_out
+            else:
+                amount_specified_used -= step_amount_out
+                amount_calculated += step_amount_in + step_fee_amount
+                # the int256 overflow check from `to_int256`
+                if amount_calculated > MAX_INT256:
+                    raise EVMRevertError
+
+            sqrt_price_x96 = sqrt_price_step_x96
+
+            if sqrt_price_x96 == sqrt_price_next_x96:
+                if initialized:
+                    liquidity = self._cross_tick(
+                        tick_next,
+                        liquidity,
+                        zeroForOne,
+                        override_tick_data,
+                    )
+                tick = tick_next - 1 if zeroForOne else tick_next
+            elif sqrt_price_x96 != sqrt_price_start_x96:
+                tick = TickMath.getTickAtSqrtRatio(sqrt_price_x96)
+
+            # swaps that were exactly consumed by this step are complete
+            while (
+                pending
+                and amounts_specified[pending[0]] == amount_specified_used
+            ):
+                record_result(
+                    pending.pop(0),
+                    amount_specified_used,
+                    amount_calculated,
+                    sqrt_price_x96,
+                    liquidity,
+                    tick,
+                )
+
+        return results
+
+    def _invalidate_swap_segments(self) -> None:
+        """
+        Discard the cached swap segments, which are only valid for the pool
+        state (price, liquidity and tick data) they were built from, and
+        increment the state version.
+
+        With concurrent readers, the current view keeps the previous version
+        until the new view is published, so read the version from the same
+        view (`get_reader`) that calculates the swaps.
+        """
+        if self._journal is not None:
+            self._journal.append(
+                ("attr", "_swap_segments", self._swap_segments)
+            )
+        self._swap_segments = {}
+        self.state_version += 1
+
+    def _get_swap_segments(self, zeroForOne: bool) -> dict:
+        """
+        Return the swap segment cache for the given direction, creating it
+        from the current pool state if necessary.
+
+        Between liquidity events the swap curve is fixed, and every swap from the
+        current price passes through the same sequence of step boundaries
+        (initialized ticks and bitmap word boundaries) with identical step amounts.
+        The cache holds the boundaries reached so far, each with the cumulative
+        input (including fees) and output required to reach it from the current price.
+
+        Reader views share one cache between threads. The cache is only extended
+        while holding its lock, and `boundaries` is appended last, so the first
+        `len(boundaries)` entries of each list are always complete.
+        """
+
+        segments = self._swap_segments.get(zeroForOne)
+        if segments is None:
+            segments = {
+                # (sqrt_price_x96, liquidity, tick) after reaching each boundary
+                "boundaries": [
+                    (self.sqrt_price_x96, self.liquidity, self.tick)
+                ],
+                "amounts_in": [0],
+                "amounts_out": [0],
+                # set when the price limit is reached, or a step cannot be completed
+                "complete": False,
+                "lock": Lock(),
+            }
+            self._swap_segments[zeroForOne] = segments
+        return segments
+
+    def _extend_swap_segments(self, zeroForOne: bool, segments: dict) -> None:
+        """
+        Add the next boundary to the swap segment cache by running one full swap
+        step from the last cached boundary, mirroring a step of `__UniswapV3Pool_swap`
+        """
+
+        with segments["lock"]:
+            if not segments["complete"]:
+                self._extend_swap_segments_locked(zeroForOne, segments)
+
+    def _extend_swap_segments_locked(
+        self, zeroForOne: bool, segments: dict
+    ) -> None:
+        """
+        Add the next boundary to the swap segment cache. The caller must hold
+        the cache lock.
+        """
+
+        sqrt_price_limit_x96 = (
+            TickMath.MIN_SQRT_RATIO + 1
+            if zeroForOne
+            else TickMath.MAX_SQRT_RATIO - 1
+        )
+
+        index = len(segments["boundaries"]) - 1
+        sqrt_price_x96, liquidity, tick = segments["boundaries"][index]
+
+        if sqrt_price_x96 == sqrt_price_limit_x96:
+            segments["complete"] = True
+            return
+
+        tick_next, initialized = self._get_swap_tick_next(tick, zeroForOne)
+        sqrt_price_next_x96 = TickMath.getSqrtRatioAtTick(tick_next)
+        sqrt_price_target_x96 = (
+            sqrt_price_limit_x96
+            if (
+                sqrt_price_next_x96 < sqrt_price_limit_x96
+                if zeroForOne
+                else sqrt_price_next_x96 > sqrt_price_limit_x96
             )
+            else sqrt_price_next_x96
+        )
+
+        # a full step consumes the same amounts regardless of the amount remaining,
+        # so calculate it with the largest possible exact input
+        (
+            sqrt_price_step_x96,
+            step_amount_in,
+            step_amount_out,
+            step_fee_amount,
+        ) = SwapMath.computeSwapStep(
+            sqrt_price_x96,
+            sqrt_price_target_x96,
+            liquidity,
+            MAX_INT256,
+            self.fee,
+        )
+
+        if (
+            sqrt_price_step_x96 != sqrt_price_target_x96
+            or step_amount_in + step_fee_amount > MAX_INT256
+        ):
+            # no valid swap can complete this step
+            segments["complete"] = True
+            return
+
+        if sqrt_price_step_x96 == sqrt_price_next_x96:
+            if initialized:
+                try:
+                    liquidity = self._cross_tick(
+                        tick_next, liquidity, zeroForOne
+                    )
+                except (ArbitrageError, EVMRevertError):
+                    # only swaps that cross the tick fail, so leave this step
+                    # to the full calculation, which raises when it is taken
+                    segments["complete"] = True
+                    return
+            tick = tick_next - 1 if zeroForOne else tick_next
+        elif sqrt_price_step_x96 != sqrt_price_x96:
+            tick = TickMath.getTickAtSqrtRatio(sqrt_price_step_x96)
+
+        segments["amounts_in"].append(
+            segments["amounts_in"][index] + step_amount_in + step_fee_amount
+        )
+        segments["amounts_out"].append(
+            segments["amounts_out"][index] + step_amount_out
+        )
+        # appended last, which publishes the new boundary to other threads
+        segments["boundaries"].append((sqrt_price_step_x96, liquidity, tick))
+
+    def _swap_from_segments(
+        self,
+        zeroForOne: bool,
+        amount_specified: int,
+        unchecked: bool = False,
+    ) -> Tuple[int, int, int, int, int]:
+        """
+        Calculate the result of `__UniswapV3Pool_swap` from the current pool state with
+        no price limit, using the swap segment cache.
+
+        The last boundary that the swap is certain to reach is found by bisecting the
+        cumulative amounts, and the swap is completed from there by `__UniswapV3Pool_swap`,
+        which usually takes a single step. The results are identical to the full
+        calculation. `unchecked` is passed to `__UniswapV3Pool_swap` for that step.
+        """
+
+        if amount_specified == 0:
+            raise EVMRevertError("AS")
+
+        sqrt_price_limit_x96 = (
+            TickMath.MIN_SQRT_RATIO + 1
+            if zeroForOne
+            else TickMath.MAX_SQRT_RATIO - 1
+        )
+
+        if sqrt_price_limit_x96 == self.sqrt_price_x96:
+            raise EVMRevertError(f"SPL")
+
+        exactInput = amount_specified > 0
+        segments = self._get_swap_segments(zeroForOne)
+
+        amount = amount_specified if exactInput else -amount_specified
+        amounts = (
+            segments["amounts_in"] if exactInput else segments["amounts_out"]
+        )
+
+        # only the first `count` entries are read, since another thread may be
+        # extending the cache
+        count = len(segments["boundaries"])
+        while amounts[count - 1] < amount and not segments["complete"]:
+            self._extend_swap_segments(zeroForOne, segments)
+            count = len(segments["boundaries"])
+
+        # a swap that exactly reaches a boundary stops at the first boundary with
+        # that amount. Otherwise, it passes through any later boundaries reached
+        # by zero-amount steps (ranges with no liquidity)
+        index = bisect_left(amounts, amount, 0, count)
+        if index == count or amounts[index] != amount:
+            index -= 1
+
+        amount_used = amounts[index]
+        amount_calculated = (
+            -segments["amounts_out"][index]
+            if exactInput
+            else segments["amounts_in"][index]
+        )
+        if not exactInput:
+            amount_used = -amount_used
+        sqrt_price_x96, liquidity, tick = segments["boundaries"][index]
+
+        if (
+            amount_used == amount_specified
+            or sqrt_price_x96 == sqrt_price_limit_x96
+        ):
+            # the swap ends at this boundary
+            end_sqrt_price_x96, end_liquidity, end_tick = (
+                sqrt_price_x96,
+                liquidity,
+                tick,
+            )
+        else:
+            (
+                amount0,
+                amount1,
+                end_sqrt_price_x96,
+                end_liquidity,
+                end_tick,
+            ) = self.__UniswapV3Pool_swap(
+                zeroForOne=zeroForOne,
+                amount_specified=amount_specified - amount_used,
+                sqrt_price_limit_x96=sqrt_price_limit_x96,
+                override_start_liquidity=liquidity,
+                override_start_sqrt_price_x96=sqrt_price_x96,
+                override_start_tick=tick,
+                unchecked=unchecked,
+            )
+            used, calculated = (
+                (amount0, amount1)
+                if zeroForOne == exactInput
+                else (amount1, amount0)
+            )
+            amount_used += used
+            amount_calculated += calculated
+
+        amount0, amount1 = (
+            (amount_used, amount_calculated)
+            if zeroForOne == exactInput
+            else (amount_calculated, amount_used)
         )
 
         return (
             amount0,
             amount1,
-            state["sqrtPriceX96"],
-            state["liquidity"],
-            state["tick"],
+            end_sqrt_price_x96,
+            end_liquidity,
+            end_tick,
         )
 
     def auto_update(
@@ -650,8 +1921,6 @@ class BaseV3LiquidityPool(ABC):
         """
 
         with self.update_lock:
-            updated = False
-
             # use the block_number if provided, otherwise pull from Brownie
             if block_number is None:
                 block_number = chain.height
@@ -671,31 +1940,64 @@ class BaseV3LiquidityPool(ABC):
                 block_identifier=block_number
             )
 
-            if self.sqrt_price_x96 != _sqrt_price_x96:
-                updated = True
-                self.sqrt_price_x96 = _sqrt_price_x96
+            updated = self._apply_slot0_and_liquidity(
+                block_number, _sqrt_price_x96, _tick, _liquidity, silent
+            )
 
-            if self.tick != _tick:
-                updated = True
-                self.tick = _tick
+        return updated, self.state
 
-            if self.liquidity != _liquidity:
-                updated = True
-                self.liquidity = _liquidity
+    def _apply_slot0_and_liquidity(
+        self,
+        block_number: int,
+        sqrt_price_x96: int,
+        tick: int,
+        liquidity: int,
+        silent: bool = True,
+    ) -> bool:
+        """
+        Store the slot0 and liquidity values retrieved at `block_number` for
+        `auto_update`, or for a batched retrieval covering many pools. The caller
+        must hold `self.update_lock` and check that the block is not stale.
 
-            if updated:
-                self._update_pool_state()
+        Returns a bool indicating whether any value changed.
+        """
 
-            if not silent:
-                logger.info(f"Liquidity: {self.liquidity}")
-                logger.info(f"SqrtPriceX96: {self.sqrt_price_x96}")
-                logger.info(f"Tick: {self.tick}")
+        self._journal_attributes()
+        updated = False
 
-            # WORKAROUND: update the block even if there are no state changes
-            # pools were being repeatedly caught by "stale pool" checks
-            self.update_block = block_number
+        if self.sqrt_price_x96 != sqrt_price_x96:
+            updated = True
+            self.sqrt_price_x96 = sqrt_price_x96
 
-        return updated, self.state
+        if self.tick != tick:
+            updated = True
+            self._record_word_travel(tick < self.tick, self.tick, tick)
+            self.tick = tick
+
+        if self.liquidity != liquidity:
+            updated = True
+            self.liquidity = liquidity
+
+        if updated:
+            self._update_pool_state()
+            self._invalidate_swap_segments()
+
+        if not silent:
+            logger.info(f"Liquidity: {self.liquidity}")
+            logger.info(f"SqrtPriceX96: {self.sqrt_price_x96}")
+            logger.info(f"Tick: {self.tick}")
+
+        # WORKAROUND: update the block even if there are no state changes
+        # pools were being repeatedly caught by "stale pool" checks
+        self.update_block = block_number
+
+        if self.concurrent_readers:
+            if updated or self._reader_view is None:
+                self._publish_reader_view()
+            else:
+                self._reader_view.update_block = block_number
+
+        return updated
 
     def calculate_tokens_out_from_tokens_in(
         self,
@@ -703,6 +2005,8 @@ class BaseV3LiquidityPool(ABC):
         token_in_quantity: int,
         override_state: Optional[dict] = None,
         with_remainder: bool = False,
+        unchecked: bool = False,
+        telemetry: Optional[dict] = None,
     ) -> Union[int, Tuple[int, int]]:
         """
         This function implements the common alex_bot interface `calculate_tokens_out_from_tokens_in`
@@ -721,18 +2025,142 @@ class BaseV3LiquidityPool(ABC):
         thus the swap calculation will continue until the target amount is satisfied, regardless of
         price impact
 
-        Some swaps will not consume the entire input amount, so call this function using `with_remainder=True`
-        to include that leftover value with the return and offset the input
+        Some swaps will not consume the entire input amount, so call this function using `with_remainder=True`
+        to include that leftover value with the return and offset the input
+
+        Accepts a dictionary of state values (`override_state`) to allow calculations beginning from an
+        arbitrary starting point. This dictionary must have one or more of the following keys:
+            - 'liquidity'
+            - 'sqrt_price_x96'
+            - 'tick'
+            - 'tick_data'
+            - 'tick_bitmap'
+
+        The 'tick_data' and 'tick_bitmap' values are overlays, holding only the ticks and bitmap
+        words that differ from the live pool data (see `get_liquidity_change_override_state`)
+
+        Set `unchecked=True` to skip the redundant range checks inside the swap loop, e.g. when
+        an optimizer repeatedly quotes the same valid pool state. The input amount and starting
+        state are still validated once, and the result is identical to the checked calculation.
+
+        Pass an empty dictionary as `telemetry` to receive the ticks crossed, bitmap words
+        touched and fetched, and time spent in each library function by the swap calculation.
+        The swap segment cache is bypassed so that the full traversal is reported.
+        """
+
+        # calculate from the published state if concurrent readers are enabled
+        if self._reader_view is not None:
+            return self._reader_view.calculate_tokens_out_from_tokens_in(
+                token_in,
+                token_in_quantity,
+                override_state,
+                with_remainder,
+                unchecked,
+                telemetry,
+            )
+
+        if token_in not in (self.token0, self.token1):
+            raise ValueError("token_in not found!")
+
+        # determine whether the swap is token0 -> token1
+        zeroForOne = True if token_in == self.token0 else False
+
+        if override_state is None:
+            override_state = {}
+
+        try:
+            if not override_state and telemetry is None:
+                # quotes from the current state can reuse the swap segment cache
+                (
+                    amount0_delta,
+                    amount1_delta,
+                    *_,
+                    end_tick,
+                ) = self._swap_from_segments(
+                    zeroForOne=zeroForOne,
+                    amount_specified=token_in_quantity,
+                    unchecked=unchecked,
+                )
+            else:
+                # delegate calculations to the ported `swap` function
+                (
+                    amount0_delta,
+                    amount1_delta,
+                    *_,
+                    end_tick,
+                ) = self.__UniswapV3Pool_swap(
+                    zeroForOne=zeroForOne,
+                    amount_specified=token_in_quantity,
+                    sqrt_price_limit_x96=(
+                        TickMath.MIN_SQRT_RATIO + 1
+                        if zeroForOne
+                        else TickMath.MAX_SQRT_RATIO - 1
+                    ),
+                    override_start_liquidity=override_state.get("liquidity"),
+                    override_start_sqrt_price_x96=override_state.get(
+                        "sqrt_price_x96"
+                    ),
+                    override_start_tick=override_state.get("tick"),
+                    override_tick_bitmap=override_state.get("tick_bitmap"),
+                    override_tick_data=override_state.get("tick_data"),
+                    unchecked=unchecked,
+                    telemetry=telemetry,
+                )
+        except EVMRevertError as e:
+            raise LiquidityPoolError(
+                f"Simulated execution reverted: {e}"
+            ) from e
+        else:
+            self._record_word_travel(
+                zeroForOne, override_state.get("tick", self.tick), end_tick
+            )
+
+            # if zeroForOne:
+            #     if token_in_quantity != amount0_delta:
+            #         print(f"input not completely consumed!")
+            #         print(f"{token_in_quantity=}")
+            #         print(f"{amount0_delta=}")
+            # else:
+            #     if token_in_quantity != amount1_delta:
+            #         print(f"input not completely consumed!")
+            #         print(f"{token_in_quantity=}")
+            #         print(f"{amount1_delta=}")
+
+            if with_remainder:
+                return (
+                    (-amount1_delta, token_in_quantity - amount0_delta)
+                    if zeroForOne
+                    else (-amount0_delta, token_in_quantity - amount1_delta)
+                )
+            else:
+                return -amount1_delta if zeroForOne else -amount0_delta
+
+    def calculate_tokens_out_from_tokens_in_batch(
+        self,
+        token_in: Erc20Token,
+        token_in_quantities: Iterable[int],
+        override_state: Optional[dict] = None,
+        with_remainder: bool = False,
+    ) -> List[Union[int, Tuple[int, int]]]:
+        """
+        Calculate the outputs for several input quantities of the same token, with a single
+        traversal of the tick ranges. Each result is identical to the value returned by
+        `calculate_tokens_out_from_tokens_in` with the same arguments, and results are returned
+        in the same order as `token_in_quantities`.
+
+        Intended for optimizers that evaluate many candidate swap sizes against the same pool
+        state. The cost is roughly that of the largest single quote, plus one swap step for
+        each quantity.
 
-        Accepts a dictionary of state values (`override_state`) to allow calculations beginning from an
-        arbitrary starting point. This dictionary must have one or more of the following keys:
-            - 'liquidity'
-            - 'sqrt_price_x96'
-            - 'tick'
-            - 'tick_data'  (not yet implemented)
-            - 'tick_bitmap'  (not yet implemented)
+        Accepts the same `override_state` dictionary as `calculate_tokens_out_from_tokens_in`
         """
 
+        # calculate from the published state if concurrent readers are enabled
+        if self._reader_view is not None:
+            return self._reader_view.calculate_tokens_out_from_tokens_in_batch(
+                token_in, token_in_quantities, override_state, with_remainder
+            )
+
         if token_in not in (self.token0, self.token1):
             raise ValueError("token_in not found!")
 
@@ -742,11 +2170,13 @@ class BaseV3LiquidityPool(ABC):
         if override_state is None:
             override_state = {}
 
+        token_in_quantities = list(token_in_quantities)
+
         try:
             # delegate calculations to the ported `swap` function
-            amount0_delta, amount1_delta, *_ = self.__UniswapV3Pool_swap(
+            swap_results = self.__UniswapV3Pool_swap_batch(
                 zeroForOne=zeroForOne,
-                amount_specified=token_in_quantity,
+                amounts_specified=token_in_quantities,
                 sqrt_price_limit_x96=(
                     TickMath.MIN_SQRT_RATIO + 1
                     if zeroForOne
@@ -757,39 +2187,49 @@ class BaseV3LiquidityPool(ABC):
                     "sqrt_price_x96"
                 ),
                 override_start_tick=override_state.get("tick"),
-                override_tick_bitmap=override_state.get("tick_bitmap"),
                 override_tick_data=override_state.get("tick_data"),
+                override_tick_bitmap=override_state.get("tick_bitmap"),
             )
         except EVMRevertError as e:
             raise LiquidityPoolError(
                 f"Simulated execution reverted: {e}"
             ) from e
-        else:
-            # if zeroForOne:
-            #     if token_in_quantity != amount0_delta:
-            #         print(f"input not completely consumed!")
-            #         print(f"{token_in_quantity=}")
-            #         print(f"{amount0_delta=}")
-            # else:
-            #     if token_in_quantity != amount1_delta:
-            #         print(f"input not completely consumed!")
-            #         print(f"{token_in_quantity=}")
-            #         print(f"{amount1_delta=}")
 
+        if swap_results:
+            # the swap travelling furthest determines the words needed
+            end_ticks = [end_tick for *_, end_tick in swap_results]
+            self._record_word_travel(
+                zeroForOne,
+                override_state.get("tick", self.tick),
+                min(end_ticks) if zeroForOne else max(end_ticks),
+            )
+
+        results: List[Union[int, Tuple[int, int]]] = []
+        for token_in_quantity, (
+            amount0_delta,
+            amount1_delta,
+            *_,
+        ) in zip(token_in_quantities, swap_results):
             if with_remainder:
-                return (
+                results.append(
                     (-amount1_delta, token_in_quantity - amount0_delta)
                     if zeroForOne
                     else (-amount0_delta, token_in_quantity - amount1_delta)
                 )
             else:
-                return -amount1_delta if zeroForOne else -amount0_delta
+                results.append(
+                    -amount1_delta if zeroForOne else -amount0_delta
+                )
+
+        return results
 
     def calculate_tokens_in_from_tokens_out(
         self,
         token_out: Erc20Token,
         token_out_quantity: int,
         override_state: Optional[dict] = None,
+        unchecked: bool = False,
+        telemetry: Optional[dict] = None,
     ) -> int:
         """
         This function implements the common alex_bot interface `calculate_tokens_in_from_tokens_out`
@@ -812,10 +2252,114 @@ class BaseV3LiquidityPool(ABC):
             - 'liquidity'
             - 'sqrt_price_x96'
             - 'tick'
-            - 'tick_data'  (not yet implemented)
-            - 'tick_bitmap'  (not yet implemented)
+            - 'tick_data'
+            - 'tick_bitmap'
+
+        The 'tick_data' and 'tick_bitmap' values are overlays, holding only the ticks and bitmap
+        words that differ from the live pool data (see `get_liquidity_change_override_state`)
+
+        Accepts the same `unchecked` and `telemetry` arguments as
+        `calculate_tokens_out_from_tokens_in`
+        """
+
+        # calculate from the published state if concurrent readers are enabled
+        if self._reader_view is not None:
+            return self._reader_view.calculate_tokens_in_from_tokens_out(
+                token_out,
+                token_out_quantity,
+                override_state,
+                unchecked,
+                telemetry,
+            )
+
+        if token_out not in (self.token0, self.token1):
+            raise ValueError("token_in not found!")
+
+        # determine whether the swap is token0 -> token1
+        zeroForOne = True if token_out == self.token1 else False
+
+        if override_state is None:
+            override_state = {}
+
+        try:
+            if not override_state and telemetry is None:
+                # quotes from the current state can reuse the swap segment cache
+                (
+                    amount0_delta,
+                    amount1_delta,
+                    *_,
+                    end_tick,
+                ) = self._swap_from_segments(
+                    zeroForOne=zeroForOne,
+                    amount_specified=-token_out_quantity,
+                    unchecked=unchecked,
+                )
+            else:
+                # delegate calculations to the ported `swap` function
+                (
+                    amount0_delta,
+                    amount1_delta,
+                    *_,
+                    end_tick,
+                ) = self.__UniswapV3Pool_swap(
+                    zeroForOne=zeroForOne,
+                    amount_specified=-token_out_quantity,
+                    sqrt_price_limit_x96=(
+                        TickMath.MIN_SQRT_RATIO + 1
+                        if zeroForOne
+                        else TickMath.MAX_SQRT_RATIO - 1
+                    ),
+                    override_start_liquidity=override_state.get("liquidity"),
+                    override_start_sqrt_price_x96=override_state.get(
+                        "sqrt_price_x96"
+                    ),
+                    override_start_tick=override_state.get("tick"),
+                    override_tick_bitmap=override_state.get("tick_bitmap"),
+                    override_tick_data=override_state.get("tick_data"),
+                    unchecked=unchecked,
+                    telemetry=telemetry,
+                )
+        except EVMRevertError as e:
+            raise LiquidityPoolError(
+                f"Simulated execution reverted: {e}"
+            ) from e
+        else:
+            self._record_word_travel(
+                zeroForOne, override_state.get("tick", self.tick), end_tick
+            )
+
+            amountIn, amountOutReceived = (
+                (amount0_delta, -amount1_delta)
+                if zeroForOne
+                else (amount1_delta, -amount0_delta)
+            )
+
+            return amountIn
+
+    def calculate_tokens_in_from_tokens_out_batch(
+        self,
+        token_out: Erc20Token,
+        token_out_quantities: Iterable[int],
+        override_state: Optional[dict] = None,
+    ) -> List[int]:
+        """
+        Calculate the inputs required for several output quantities of the same token, with a
+        single traversal of the tick ranges. Each result is identical to the value returned by
+        `calculate_tokens_in_from_tokens_out` with the same arguments, and results are returned
+        in the same order as `token_out_quantities`.
+
+        Intended for sizing swaps against several target outputs from the same pool state. The
+        cost is roughly that of the largest single quote, plus one swap step for each quantity.
+
+        Accepts the same `override_state` dictionary as `calculate_tokens_in_from_tokens_out`
         """
 
+        # calculate from the published state if concurrent readers are enabled
+        if self._reader_view is not None:
+            return self._reader_view.calculate_tokens_in_from_tokens_out_batch(
+                token_out, token_out_quantities, override_state
+            )
+
         if token_out not in (self.token0, self.token1):
             raise ValueError("token_in not found!")
 
@@ -825,11 +2369,16 @@ class BaseV3LiquidityPool(ABC):
         if override_state is None:
             override_state = {}
 
+        token_out_quantities = list(token_out_quantities)
+
         try:
             # delegate calculations to the ported `swap` function
-            amount0_delta, amount1_delta, *_ = self.__UniswapV3Pool_swap(
+            swap_results = self.__UniswapV3Pool_swap_batch(
                 zeroForOne=zeroForOne,
-                amount_specified=-token_out_quantity,
+                amounts_specified=[
+                    -token_out_quantity
+                    for token_out_quantity in token_out_quantities
+                ],
                 sqrt_price_limit_x96=(
                     TickMath.MIN_SQRT_RATIO + 1
                     if zeroForOne
@@ -840,21 +2389,167 @@ class BaseV3LiquidityPool(ABC):
                     "sqrt_price_x96"
                 ),
                 override_start_tick=override_state.get("tick"),
-                override_tick_bitmap=override_state.get("tick_bitmap"),
                 override_tick_data=override_state.get("tick_data"),
+                override_tick_bitmap=override_state.get("tick_bitmap"),
             )
         except EVMRevertError as e:
             raise LiquidityPoolError(
                 f"Simulated execution reverted: {e}"
             ) from e
-        else:
-            amountIn, amountOutReceived = (
-                (amount0_delta, -amount1_delta)
-                if zeroForOne
-                else (amount1_delta, -amount0_delta)
+
+        if swap_results:
+            # the swap travelling furthest determines the words needed
+            end_ticks = [end_tick for *_, end_tick in swap_results]
+            self._record_word_travel(
+                zeroForOne,
+                override_state.get("tick", self.tick),
+                min(end_ticks) if zeroForOne else max(end_ticks),
             )
 
-            return amountIn
+        return [
+            amount0_delta if zeroForOne else amount1_delta
+            for amount0_delta, amount1_delta, *_ in swap_results
+        ]
+
+    def estimate_tokens_out_from_tokens_in(
+        self,
+        token_in: Erc20Token,
+        token_in_quantity: Union[int, float],
+        override_state: Optional[dict] = None,
+    ) -> float:
+        """
+        Estimate the output of `calculate_tokens_out_from_tokens_in` with float64 arithmetic.
+
+        The swap loop is mirrored with float values for the sqrt price and amounts, using the
+        same tick bitmap and liquidity data as the exact calculation (and fetching missing words
+        for a sparse bitmap). Steps are taken between initialized ticks (and bitmap word
+        boundaries, for a sparse bitmap or override), and the fee is taken from the input up front. The estimate is typically within ~1e-8 (relative) of the
+        exact output, and is intended for screening many candidate swaps or paths cheaply, before
+        confirming the promising ones with the exact integer calculation.
+
+        Accepts the same `override_state` dictionary as `calculate_tokens_out_from_tokens_in`
+        """
+
+        # calculate from the published state if concurrent readers are enabled
+        if self._reader_view is not None:
+            return self._reader_view.estimate_tokens_out_from_tokens_in(
+                token_in, token_in_quantity, override_state
+            )
+
+        if token_in not in (self.token0, self.token1):
+            raise ValueError("token_in not found!")
+
+        if token_in_quantity <= 0:
+            raise LiquidityPoolError("token_in_quantity must be positive")
+
+        # determine whether the swap is token0 -> token1
+        zeroForOne = True if token_in == self.token0 else False
+
+        if override_state is None:
+            override_state = {}
+
+        liquidity = override_state.get("liquidity", self.liquidity)
+        sqrt_price = (
+            override_state.get("sqrt_price_x96", self.sqrt_price_x96)
+            / _Q96_FLOAT
+        )
+        start_tick = tick = override_state.get("tick", self.tick)
+        override_tick_bitmap = override_state.get("tick_bitmap")
+        liquidity_nets: Mapping[int, int] = self._liquidity_net
+        if override_state.get("tick_data"):
+            liquidity_nets = ChainMap(
+                {
+                    tick: data["liquidityNet"]
+                    for tick, data in override_state["tick_data"].items()
+                },
+                liquidity_nets,
+            )
+
+        get_swap_tick_next = self._get_swap_tick_next
+        limit_tick = TickMath.MIN_TICK if zeroForOne else TickMath.MAX_TICK
+
+        # the index of initialized ticks is complete for a full bitmap, so the
+        # next initialized tick can be found directly
+        initialized_ticks = (
+            self._initialized_ticks
+            if not self.tick_bitmap["sparse"] and not override_tick_bitmap
+            else None
+        )
+
+        amount_remaining = float(token_in_quantity) * (1 - self.fee / 10**6)
+        amount_out = 0.0
+
+        while True:
+            if initialized_ticks is not None:
+                index = bisect_right(initialized_ticks, tick)
+                if zeroForOne:
+                    initialized = index > 0
+                    tick_next = (
+                        initialized_ticks[index - 1]
+                        if initialized
+                        else limit_tick
+                    )
+                else:
+                    initialized = index < len(initialized_ticks)
+                    tick_next = (
+                        initialized_ticks[index] if initialized else limit_tick
+                    )
+            else:
+                # step to each bitmap word boundary, as the exact calculation
+                # does, so the input is checked before the next word is searched
+                # (which may fetch it for a sparse bitmap)
+                tick_next, initialized = get_swap_tick_next(
+                    tick, zeroForOne, override_tick_bitmap
+                )
+
+            sqrt_price_next = _SQRT_TICK_BASE**tick_next
+
+            # the input needed to reach the next tick, or the price reached by
+            # the remaining input if it is not enough
+            if zeroForOne:
+                step_amount_in = liquidity * (
+                    1 / sqrt_price_next - 1 / sqrt_price
+                )
+                if amount_remaining < step_amount_in:
+                    amount_out += liquidity * (
+                        sqrt_price
+                        - liquidity
+                        / (liquidity / sqrt_price + amount_remaining)
+                    )
+                    break
+                amount_out += liquidity * (sqrt_price - sqrt_price_next)
+            else:
+                step_amount_in = liquidity * (sqrt_price_next - sqrt_price)
+                if amount_remaining < step_amount_in:
+                    amount_out += liquidity * (
+                        1 / sqrt_price
+                        - 1 / (sqrt_price + amount_remaining / liquidity)
+                    )
+                    break
+                amount_out += liquidity * (
+                    1 / sqrt_price - 1 / sqrt_price_next
+                )
+
+            amount_remaining -= step_amount_in
+            sqrt_price = sqrt_price_next
+
+            if tick_next == limit_tick:
+                break
+
+            if initialized:
+                try:
+                    liquidity_net = liquidity_nets[tick_next]
+                except KeyError:
+                    raise ArbitrageError(
+                        "Tick bitmap or liquidity data is out of date"
+                    ) from None
+                liquidity += -liquidity_net if zeroForOne else liquidity_net
+
+            tick = tick_next - 1 if zeroForOne else tick_next
+
+        self._record_word_travel(zeroForOne, start_tick, tick)
+
+        return amount_out
 
     def external_update(
         self,
@@ -923,9 +2618,16 @@ class BaseV3LiquidityPool(ABC):
                 warn(f"Ignoring unknown key-value ({key}:{updates[key]})")
 
         with self.update_lock:
+            self._journal_attributes()
             updated_state = False
 
             if check_update_block(block_number) or force:
+                if "tick" in updates and updates["tick"] != self.tick:
+                    self._record_word_travel(
+                        updates["tick"] < self.tick,
+                        self.tick,
+                        updates["tick"],
+                    )
                 for key in ["tick", "liquidity", "sqrt_price_x96"]:
                     if key in updates and updates[key] != self.__dict__[key]:
                         # the self.tick attribute is stored internally as
@@ -941,6 +2643,31 @@ class BaseV3LiquidityPool(ABC):
                     "liquidity_change"
                 ]
 
+                # the tick bitmap must be available for the word prior to flipping
+                # the initialized status of any tick. Missing words are fetched
+                # before taking the tick lock, which `_update_tick_data_at_word`
+                # acquires itself
+                if fetch_missing:
+                    for tick in (lower_tick, upper_tick):
+                        tick_word, _ = self._get_tick_bitmap_position(tick)
+                        if tick_word in self.tick_bitmap:
+                            continue
+                        logger.debug(
+                            f"(external_update) {tick_word=} not found in tick_bitmap {self.tick_bitmap.keys()=}"
+                        )
+                        try:
+                            # fetch the single word
+                            self._update_tick_data_at_word(
+                                word_position=tick_word,
+                                single_word=True,
+                                # Fetch the word using the previous block as a known "good" state snapshot
+                                block_number=block_number - 1,
+                            )
+                        except ValueError as e:
+                            raise BlockUnavailableError(
+                                f"Could not query chain at block {block_number - 1}"
+                            )
+
                 with self.tick_lock:
                     # Mint/Burn events may affect the current liquidity if the current tick is
                     # in the tick range associated with this event, so check and adjust
@@ -951,30 +2678,11 @@ class BaseV3LiquidityPool(ABC):
                         tick_word, _ = self._get_tick_bitmap_position(tick)
 
                         if tick_word not in self.tick_bitmap:
-                            # the tick bitmap must be available for the word prior to flipping
-                            # the initialized status of any tick
-
-                            if fetch_missing:
-                                logger.debug(
-                                    f"(external_update) {tick_word=} not found in tick_bitmap {self.tick_bitmap.keys()=}"
-                                )
-                                try:
-                                    # fetch the single word
-                                    self._update_tick_data_at_word(
-                                        word_position=tick_word,
-                                        single_word=True,
-                                        # Fetch the word using the previous block as a known "good" state snapshot
-                                        block_number=block_number - 1,
-                                    )
-                                except ValueError as e:
-                                    raise BlockUnavailableError(
-                                        f"Could not query chain at block {block_number - 1}"
-                                    )
-                            else:
-                                self.tick_bitmap[tick_word] = {
-                                    "bitmap": 0,
-                                    "block": None,
-                                }
+                            # a placeholder, not chain data, so journal it
+                            self._journal_item(self.tick_bitmap, tick_word)
+                            self.tick_bitmap[
+                                tick_word
+                            ] = self._new_bitmap_word(0, None)
 
                         # Get the liquidity info for this tick
                         try:
@@ -985,12 +2693,7 @@ class BaseV3LiquidityPool(ABC):
                                 "liquidityGross"
                             ]
                         except KeyError:
-                            TickBitmap.flipTick(
-                                self.tick_bitmap,
-                                tick,
-                                self.tick_spacing,
-                                update_block=block_number,
-                            )
+                            self._flip_tick(tick, update_block=block_number)
                             tick_liquidity_net = 0
                             tick_liquidity_gross = 0
 
@@ -1007,21 +2710,20 @@ class BaseV3LiquidityPool(ABC):
                         )
 
                         # Delete entirely if there is no liquidity referencing this tick
+                        self._journal_item(self.tick_data, tick)
+                        self._journal_item(self._liquidity_net, tick)
                         if new_liquidity_gross == 0:
                             del self.tick_data[tick]
-                            TickBitmap.flipTick(
-                                self.tick_bitmap,
-                                tick,
-                                self.tick_spacing,
-                                update_block=block_number,
-                            )
+                            self._liquidity_net.pop(tick, None)
+                            self._flip_tick(tick, update_block=block_number)
                         # otherwise record the new values
                         else:
-                            self.tick_data[tick] = {
-                                "liquidityNet": new_liquidity_net,
-                                "liquidityGross": new_liquidity_gross,
-                                "block": block_number,
-                            }
+                            self.tick_data[tick] = self._new_tick_record(
+                                new_liquidity_net,
+                                new_liquidity_gross,
+                                block_number,
+                            )
+                            self._liquidity_net[tick] = new_liquidity_net
 
                 self.liquidity_update_block = block_number
                 updated_state = True
@@ -1035,6 +2737,7 @@ class BaseV3LiquidityPool(ABC):
                 )
 
             if updated_state:
+                self._invalidate_swap_segments()
                 self.update_block = block_number
                 self.state.update(
                     {
@@ -1044,9 +2747,324 @@ class BaseV3LiquidityPool(ABC):
                         "tick": self.tick,
                     }
                 )
+                if self.concurrent_readers:
+                    self._publish_reader_view()
+
+            return updated_state
+
+    def external_update_bulk(
+        self,
+        updates: Iterable[Tuple[int, dict]],
+        silent: bool = True,
+        fetch_missing: bool = True,
+        force: bool = False,
+    ) -> bool:
+        """
+        Process a sequence of `(block_number, updates)` pairs in chain order, e.g. all of the
+        Mint, Burn and Swap updates for a block or a range of blocks. Each `updates` dict has
+        the format accepted by `external_update`.
+
+        The result is the same as calling `external_update` for each pair in turn, but the
+        lock is taken once, the liquidity deltas are netted per tick, each tick's data and
+        bitmap bit are written at most once, and only the final slot0 values are stored.
+
+        Returns a bool indicating whether any updated state value was found and processed
+        """
+
+        # if we have supplied a full snapshot during loading, disable the fetching mechanism
+        if not self.tick_bitmap["sparse"]:
+            fetch_missing = False
+
+        updates = list(updates)
+
+        for _, update in updates:
+            if not (
+                {"liquidity", "sqrt_price_x96", "tick", "liquidity_change"}
+                & set(update)
+            ):
+                raise ValueError(
+                    "At least one of (liquidity, sqrt_price_x96, tick, liquidity_change) must be provided"
+                )
+            for key in update:
+                if key not in [
+                    "tick",
+                    "liquidity",
+                    "sqrt_price_x96",
+                    "liquidity_change",
+                ]:
+                    warn(f"Ignoring unknown key-value ({key}:{update[key]})")
+
+        with self.update_lock:
+            self._journal_attributes()
+
+            # replay the slot0 values and block checks of `external_update` on local
+            # copies, collecting the net liquidity changes for each tick
+            state = {
+                "tick": self.tick,
+                "liquidity": self.liquidity,
+                "sqrt_price_x96": self.sqrt_price_x96,
+            }
+            update_block = self.update_block
+            liquidity_update_block = self.liquidity_update_block
+            updated_state = False
+
+            # tick -> [liquidityNet delta, liquidityGross delta, last block]
+            tick_changes: Dict[int, List[int]] = {}
+            # word -> block of the first change to one of its ticks
+            word_blocks: Dict[int, int] = {}
+
+            for block_number, update in updates:
+                if update_block <= block_number or force:
+                    if "tick" in update and update["tick"] != state["tick"]:
+                        self._record_word_travel(
+                            update["tick"] < state["tick"],
+                            state["tick"],
+                            update["tick"],
+                        )
+                    for key in ["tick", "liquidity", "sqrt_price_x96"]:
+                        if key in update and update[key] != state[key]:
+                            state[key] = update[key]
+                            updated_state = True
+                            update_block = block_number
+
+                if "liquidity_change" in update and (
+                    liquidity_update_block <= block_number or force
+                ):
+                    liquidity_delta, lower_tick, upper_tick = update[
+                        "liquidity_change"
+                    ]
+
+                    # Mint/Burn events may affect the current liquidity if the current tick is
+                    # in the tick range associated with this event, so check and adjust
+                    if lower_tick <= state["tick"] <= upper_tick:
+                        state["liquidity"] += liquidity_delta
+
+                    # MINT: add liquidity at lower tick, subtract at upper tick
+                    # BURN: subtract liquidity at lower tick, add at upper tick
+                    for tick, liquidity_net_delta in (
+                        (lower_tick, liquidity_delta),
+                        (upper_tick, -liquidity_delta),
+                    ):
+                        try:
+                            changes = tick_changes[tick]
+                        except KeyError:
+                            changes = tick_changes[tick] = [0, 0, 0]
+                            word_blocks.setdefault(
+                                self._get_tick_bitmap_position(tick)[0],
+                                block_number,
+                            )
+                        changes[0] += liquidity_net_delta
+                        changes[1] += liquidity_delta
+                        changes[2] = block_number
+
+                    liquidity_update_block = block_number
+                    update_block = block_number
+                    updated_state = True
+
+            if tick_changes:
+                # the tick bitmap must be available for the word prior to flipping the
+                # initialized status of any tick. Fetch each word at the block before
+                # its first change, so the netted deltas apply to a known "good" state
+                if fetch_missing:
+                    for tick_word, block_number in word_blocks.items():
+                        if tick_word in self.tick_bitmap:
+                            continue
+                        try:
+                            self._update_tick_data_at_word(
+                                word_position=tick_word,
+                                single_word=True,
+                                block_number=block_number - 1,
+                            )
+                        except ValueError as e:
+                            raise BlockUnavailableError(
+                                f"Could not query chain at block {block_number - 1}"
+                            )
+
+                with self.tick_lock:
+                    for tick_word in word_blocks:
+                        if tick_word not in self.tick_bitmap:
+                            # a placeholder, not chain data, so journal it
+                            self._journal_item(self.tick_bitmap, tick_word)
+                            self.tick_bitmap[
+                                tick_word
+                            ] = self._new_bitmap_word(0, None)
+
+                    for tick, (
+                        liquidity_net_delta,
+                        liquidity_gross_delta,
+                        block_number,
+                    ) in tick_changes.items():
+                        try:
+                            tick_liquidity_net = self.tick_data[tick][
+                                "liquidityNet"
+                            ]
+                            tick_liquidity_gross = self.tick_data[tick][
+                                "liquidityGross"
+                            ]
+                            initialized = True
+                        except KeyError:
+                            tick_liquidity_net = 0
+                            tick_liquidity_gross = 0
+                            initialized = False
+
+                        new_liquidity_gross = (
+                            tick_liquidity_gross + liquidity_gross_delta
+                        )
+
+                        if new_liquidity_gross == 0:
+                            # Delete entirely if there is no liquidity referencing this tick
+                            if initialized:
+                                self._journal_item(self.tick_data, tick)
+                                self._journal_item(self._liquidity_net, tick)
+                                del self.tick_data[tick]
+                                self._liquidity_net.pop(tick, None)
+                                self._flip_tick(
+                                    tick, update_block=block_number
+                                )
+                            continue
+
+                        if not initialized:
+                            self._flip_tick(tick, update_block=block_number)
+
+                        new_liquidity_net = (
+                            tick_liquidity_net + liquidity_net_delta
+                        )
+                        self._journal_item(self.tick_data, tick)
+                        self._journal_item(self._liquidity_net, tick)
+                        self.tick_data[tick] = self._new_tick_record(
+                            new_liquidity_net,
+                            new_liquidity_gross,
+                            block_number,
+                        )
+                        self._liquidity_net[tick] = new_liquidity_net
+
+                self.liquidity_update_block = liquidity_update_block
+
+            if updated_state:
+                self.__dict__.update(state)
+                self._invalidate_swap_segments()
+                self.update_block = update_block
+                self.state.update(
+                    {
+                        "last_liquidity_update": self.liquidity_update_block,
+                        "liquidity": self.liquidity,
+                        "sqrt_price_x96": self.sqrt_price_x96,
+                        "tick": self.tick,
+                    }
+                )
+                if self.concurrent_readers:
+                    self._publish_reader_view()
+
+            if not silent:
+                logger.info(f"Liquidity: {self.liquidity}")
+                logger.info(f"SqrtPriceX96: {self.sqrt_price_x96}")
+                logger.info(f"Tick: {self.tick}")
+                logger.info(
+                    f"{len(updates)} updates, {len(tick_changes)} ticks changed, pool: {self.name}"
+                )
 
             return updated_state
 
+    def get_liquidity_change_override_state(
+        self,
+        liquidity_delta: int,
+        lower_tick: int,
+        upper_tick: int,
+        override_state: Optional[dict] = None,
+    ) -> dict:
+        """
+        Return an `override_state` dictionary that simulates a liquidity change (Mint for a
+        positive `liquidity_delta`, Burn for a negative one) in the range [lower_tick, upper_tick],
+        applied the same way as `external_update` but without modifying the pool.
+
+        Only the two affected ticks and their bitmap words are copied into the 'tick_data' and
+        'tick_bitmap' overlays. A word missing from a sparse bitmap is fetched into the
+        overlays (with its populated ticks) instead of being stored in the pool. Pass a
+        previous result as `override_state` to layer several changes.
+        """
+
+        # calculate from the published state if concurrent readers are enabled
+        if self._reader_view is not None:
+            return self._reader_view.get_liquidity_change_override_state(
+                liquidity_delta, lower_tick, upper_tick, override_state
+            )
+
+        if override_state is None:
+            override_state = {}
+
+        override_tick_data = dict(override_state.get("tick_data") or {})
+        override_tick_bitmap = dict(override_state.get("tick_bitmap") or {})
+
+        liquidity = override_state.get("liquidity", self.liquidity)
+        if lower_tick <= override_state.get("tick", self.tick) <= upper_tick:
+            liquidity += liquidity_delta
+
+        for i, tick in enumerate([lower_tick, upper_tick]):
+            word_position, bit_position = self._get_tick_bitmap_position(tick)
+
+            if word_position in override_tick_bitmap:
+                word = override_tick_bitmap[word_position]
+            elif word_position in self.tick_bitmap:
+                word = self.tick_bitmap[word_position]
+            else:
+                # the pool is not modified, so a missing word is read into the
+                # overlays: fetched for a sparse bitmap, otherwise empty
+                if self.tick_bitmap["sparse"]:
+                    fetched_tick_bitmap, fetched_tick_data = (
+                        self._fetch_tick_word(word_position, chain.height)
+                    )
+                    override_tick_bitmap.update(fetched_tick_bitmap)
+                    for fetched_tick, values in fetched_tick_data.items():
+                        override_tick_data.setdefault(fetched_tick, values)
+                else:
+                    override_tick_bitmap[word_position] = {
+                        "bitmap": 0,
+                        "block": None,
+                    }
+                word = override_tick_bitmap[word_position]
+
+            if tick in override_tick_data:
+                tick_liquidity_net = override_tick_data[tick]["liquidityNet"]
+                tick_liquidity_gross = override_tick_data[tick][
+                    "liquidityGross"
+                ]
+            elif tick in self.tick_data:
+                tick_liquidity_net = self.tick_data[tick]["liquidityNet"]
+                tick_liquidity_gross = self.tick_data[tick]["liquidityGross"]
+            else:
+                tick_liquidity_net = 0
+                tick_liquidity_gross = 0
+
+            # MINT: add liquidity at lower tick (i==0), subtract at upper tick (i==1)
+            # BURN: subtract liquidity at lower tick (i==0), add at upper tick (i==1)
+            new_liquidity_net = (
+                tick_liquidity_net + liquidity_delta
+                if i == 0
+                else tick_liquidity_net - liquidity_delta
+            )
+            new_liquidity_gross = tick_liquidity_gross + liquidity_delta
+
+            override_tick_data[tick] = {
+                "liquidityNet": new_liquidity_net,
+                "liquidityGross": new_liquidity_gross,
+                "block": None,
+            }
+
+            # flip the tick if its initialized state changes
+            initialized = bool(word["bitmap"] & (1 << bit_position))
+            if initialized != (new_liquidity_gross != 0):
+                override_tick_bitmap[word_position] = {
+                    "bitmap": word["bitmap"] ^ (1 << bit_position),
+                    "block": None,
+                }
+
+        return {
+            **override_state,
+            "liquidity": liquidity,
+            "tick_data": override_tick_data,
+            "tick_bitmap": override_tick_bitmap,
+        }
+
     def simulate_swap(
         self,
         token_in: Optional[Erc20Token] = None,
@@ -1055,11 +3073,26 @@ class BaseV3LiquidityPool(ABC):
         token_out_quantity: Optional[int] = None,
         sqrt_price_limit: Optional[int] = None,
         override_state: Optional[dict] = None,
+        telemetry: Optional[dict] = None,
     ) -> Dict[str, Any]:
         """
         [TBD]
+
+        Accepts the same `telemetry` argument as `calculate_tokens_out_from_tokens_in`
         """
 
+        # calculate from the published state if concurrent readers are enabled
+        if self._reader_view is not None:
+            return self._reader_view.simulate_swap(
+                token_in,
+                token_in_quantity,
+                token_out,
+                token_out_quantity,
+                sqrt_price_limit,
+                override_state,
+                telemetry,
+            )
+
         if token_in is None and token_out is None:
             raise ValueError("token_in or token_out not provided")
 
@@ -1126,12 +3159,17 @@ class BaseV3LiquidityPool(ABC):
                 override_start_tick=override_state.get("tick"),
                 override_tick_bitmap=override_state.get("tick_bitmap"),
                 override_tick_data=override_state.get("tick_data"),
+                telemetry=telemetry,
             )
         except EVMRevertError as e:
             raise LiquidityPoolError(
                 f"Simulated execution reverted: {e}"
             ) from e
         else:
+            self._record_word_travel(
+                zeroForOne, override_state.get("tick", self.tick), end_tick
+            )
+
             return {
                 "amount0_delta": amount0_delta,
                 "amount1_delta": amount1_delta,